@@ -0,0 +1,83 @@
+"""Archive upload processing benchmark on a generated zip.
+
+Compares the previous ``FileHandler._process_archive`` (extract every member
+to a temp directory, then walk it for the tree and code files) with the
+current one, which lists members and reads five capped samples in place.
+
+Usage:
+    poetry run python benchmarks/archive_processing.py [--files 5000] [--size 20000]
+"""
+
+import argparse
+import asyncio
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.bot.features.file_handler import FileHandler  # noqa: E402
+
+
+def make_archive(path: Path, files: int, size: int) -> None:
+    """Write a zip with files spread over 50 directories."""
+    line = "def handler(event):  # TODO\n"
+    content = (line * (size // len(line) + 1))[:size]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for i in range(files):
+            archive.writestr(f"project/pkg{i % 50:02d}/module{i:05d}.py", content)
+
+
+def extract_all(archive_path: Path) -> int:
+    """Previous behaviour: extract, then walk the extracted tree."""
+    extract_dir = Path(tempfile.mkdtemp())
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.filelist:
+                target = extract_dir / info.filename
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with archive.open(info) as source, open(target, "wb") as out:
+                    shutil.copyfileobj(source, out)
+        code_files = sorted(
+            p for p in extract_dir.rglob("*") if p.is_file() and p.suffix == ".py"
+        )
+        tree = [str(p.relative_to(extract_dir)) for p in sorted(extract_dir.rglob("*"))]
+        prompt = "\n".join(tree)
+        for path in code_files[:5]:
+            prompt += path.read_text(encoding="utf-8", errors="ignore")[:1000]
+        return len(prompt)
+    finally:
+        shutil.rmtree(extract_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=20000)
+    args = parser.parse_args()
+
+    handler = FileHandler(config=None, security=None)
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = Path(tmp) / "upload.zip"
+        make_archive(archive_path, args.files, args.size)
+        uncompressed = args.files * args.size / 1024 / 1024
+
+        start = time.perf_counter()
+        extract_all(archive_path)
+        before = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        asyncio.run(handler._process_archive(archive_path, ""))
+        after = (time.perf_counter() - start) * 1000
+
+    print(f"archive:  {args.files} files, {uncompressed:.0f} MB uncompressed")
+    print(f"extract:  {before:8.1f} ms")
+    print(f"in place: {after:8.1f} ms")
+    print(f"speedup:  {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
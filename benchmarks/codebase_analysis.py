@@ -0,0 +1,139 @@
+"""Codebase analysis benchmark on a generated repository.
+
+Compares the previous ``FileHandler.analyze_codebase`` (an ``rglob`` pass
+per statistic, one per entry-point name and test pattern, reading every
+code file including ``node_modules`` and ``.git``) with ``CodebaseAnalyzer``:
+a cold single walk, a warm call on the unchanged tree and a call after one
+file changed.
+
+Usage:
+    poetry run python benchmarks/codebase_analysis.py [--modules 300] [--packages 1000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.bot.features.codebase_analyzer import (  # noqa: E402
+    ENTRY_POINT_NAMES,
+    FRAMEWORK_FILES,
+    FRAMEWORK_INDICATORS,
+    TEST_DIRECTORIES,
+    TEST_FILE_PATTERNS,
+    CodebaseAnalyzer,
+)
+
+CODE_EXTENSIONS = {".py", ".js", ".ts", ".json", ".md"}
+LANGUAGE_MAP = {".py": "Python", ".js": "JavaScript", ".ts": "TypeScript"}
+
+SOURCE = "import os\n\n\ndef handler(event):\n    # TODO: validate\n    return event\n"
+
+
+def make_repository(root: Path, modules: int, packages: int) -> None:
+    """Write a repository with source, tests, dependencies and git objects."""
+    (root / ".gitignore").write_text("*.log\ncoverage/\n")
+    (root / "requirements.txt").write_text("fastapi\n")
+    (root / "package.json").write_text('{"dependencies": {"react": "18"}}\n')
+    for i in range(modules):
+        module = root / "src" / f"module{i:03d}"
+        module.mkdir(parents=True)
+        for j in range(10):
+            (module / f"file{j}.py").write_text(SOURCE * 5)
+        (module / "main.py").write_text(SOURCE)
+        (module / "run.log").write_text("x" * 1024)
+    (root / "tests").mkdir()
+    for i in range(modules):
+        (root / "tests" / f"test_module{i:03d}.py").write_text(SOURCE)
+    for i in range(packages):
+        package = root / "node_modules" / f"pkg{i:04d}"
+        package.mkdir(parents=True)
+        for j in range(8):
+            (package / f"lib{j}.js").write_text("// TODO upstream\n" * 40)
+        (package / "index.js").write_text("module.exports = {}\n")
+    objects = root / ".git" / "objects"
+    for i in range(256):
+        (objects / f"{i:02x}").mkdir(parents=True)
+        for j in range(8):
+            (objects / f"{i:02x}" / f"{j:038x}").write_bytes(b"\0" * 256)
+
+
+def previous(directory: Path) -> Tuple[Dict[str, int], int]:
+    """Previous behaviour: separate rglob passes for each statistic."""
+    languages: Dict[str, int] = defaultdict(int)
+    extensions: Dict[str, int] = defaultdict(int)
+    for path in directory.rglob("*"):
+        if path.is_file():
+            ext = path.suffix.lower()
+            extensions[ext] += 1
+            if LANGUAGE_MAP.get(ext):
+                languages[LANGUAGE_MAP[ext]] += 1
+
+    entry_points = []
+    for name in ENTRY_POINT_NAMES:
+        for path in directory.rglob(name):
+            if path.is_file():
+                entry_points.append(str(path.relative_to(directory)))
+
+    frameworks = set()
+    for indicator, candidates in FRAMEWORK_INDICATORS.items():
+        if (directory / indicator).exists():
+            content = (directory / indicator).read_text(errors="ignore").lower()
+            frameworks.update(c for c in candidates if c.lower() in content)
+    frameworks.update(n for f, n in FRAMEWORK_FILES.items() if (directory / f).exists())
+
+    todos = 0
+    for path in directory.rglob("*"):
+        if path.is_file() and path.suffix.lower() in CODE_EXTENSIONS:
+            content = path.read_text(encoding="utf-8", errors="ignore").upper()
+            todos += content.count("TODO") + content.count("FIXME")
+
+    tests = []
+    for pattern in TEST_FILE_PATTERNS:
+        tests.extend(directory.rglob(pattern))
+    for name in TEST_DIRECTORIES:
+        if (directory / name).is_dir():
+            tests.extend((directory / name).rglob("*"))
+    return dict(languages), todos
+
+
+def measure(func: Callable[[], object]) -> float:
+    """Return milliseconds for one call."""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=300)
+    parser.add_argument("--packages", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_repository(root, args.modules, args.packages)
+        files = sum(1 for path in root.rglob("*") if path.is_file())
+        analyzer = CodebaseAnalyzer(CODE_EXTENSIONS, LANGUAGE_MAP)
+
+        before = measure(lambda: previous(root))
+        cold = measure(lambda: analyzer.analyze(root))
+        warm = measure(lambda: analyzer.analyze(root))
+        changed = root / "src" / "module000" / "file0.py"
+        changed.write_text(SOURCE * 6)
+        incremental = measure(lambda: analyzer.analyze(root))
+
+        print(f"files:        {files} ({args.packages} packages in node_modules)")
+        print(f"rglob passes: {before:8.1f} ms")
+        print(f"single walk:  {cold:8.1f} ms  ({before / cold:.1f}x)")
+        print(f"unchanged:    {warm:8.1f} ms  ({before / warm:.1f}x)")
+        print(f"one edit:     {incremental:8.1f} ms  ({before / incremental:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
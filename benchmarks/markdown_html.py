@@ -0,0 +1,116 @@
+"""Markdown to Telegram HTML conversion benchmark on 50KB responses.
+
+Compares the previous converter (one regex pass per construct, then a
+``str.replace`` per placeholder) with the per-delimiter scans in
+``markdown_to_telegram_html`` on long responses with hundreds of inline
+code spans.
+
+Usage:
+    poetry run python benchmarks/markdown_html.py [--iterations 20]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.bot.utils.html_format import (  # noqa: E402
+    escape_html,
+    markdown_to_telegram_html,
+)
+
+RESPONSE_SIZE = 50_000
+
+FRAGMENTS = [
+    "Call `parse_line(buf)` before `flush()` and check `len(out) > 0`.",
+    "The **parser** keeps *one* buffer per _stream_ and ~~two~~ queues.",
+    "See [the docs](https://example.com/docs?page=2&lang=en) for details.",
+    "Plain prose where x < y and a & b hold for every value of z > 0.",
+    "\n## Notes\n",
+    "\n```python\nfor line in lines:\n    if line < limit:\n        emit(line)\n```\n",
+]
+
+
+def make_response(seed: int) -> str:
+    """Build a ~50KB Claude-style markdown response."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    size = 0
+    while size < RESPONSE_SIZE:
+        fragment = rng.choice(FRAGMENTS)
+        parts.append(fragment)
+        size += len(fragment) + 1
+    return " ".join(parts)
+
+
+def multipass(text: str) -> str:
+    """Previous behaviour: one regex pass per construct, then restore."""
+    placeholders: List[Tuple[str, str]] = []
+
+    def placeholder(html: str) -> str:
+        key = f"\x00PH{len(placeholders)}\x00"
+        placeholders.append((key, html))
+        return key
+
+    def fenced(m: "re.Match[str]") -> str:
+        lang, code = m.group(1) or "", escape_html(m.group(2))
+        if lang:
+            return placeholder(
+                f'<pre><code class="language-{escape_html(lang)}">{code}</code></pre>'
+            )
+        return placeholder(f"<pre><code>{code}</code></pre>")
+
+    text = re.sub(r"```(\w+)?\n(.*?)```", fenced, text, flags=re.DOTALL)
+    text = re.sub(
+        r"`([^`\n]+)`",
+        lambda m: placeholder(f"<code>{escape_html(m.group(1))}</code>"),
+        text,
+    )
+    text = escape_html(text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+    text = re.sub(r"__(.+?)__", r"<b>\1</b>", text)
+    text = re.sub(r"\*(\S.*?\S|\S)\*", r"<i>\1</i>", text)
+    text = re.sub(r"(?<!\w)_(\S.*?\S|\S)_(?!\w)", r"<i>\1</i>", text)
+    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
+    text = re.sub(r"^#{1,6}\s+(.+)$", r"<b>\1</b>", text, flags=re.MULTILINE)
+    text = re.sub(r"~~(.+?)~~", r"<s>\1</s>", text)
+    for key, html in placeholders:
+        text = text.replace(key, html)
+    return text
+
+
+def measure(func: Callable[[str], str], responses: List[str]) -> float:
+    """Return mean milliseconds per response."""
+    start = time.perf_counter()
+    for text in responses:
+        func(text)
+    return (time.perf_counter() - start) / len(responses) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    responses = [make_response(seed) for seed in range(args.iterations)]
+    for text in responses:
+        assert multipass(text) == markdown_to_telegram_html(text)
+
+    spans = len(re.findall(r"`[^`\n]+`", responses[0]))
+    before = measure(multipass, responses)
+    after = measure(markdown_to_telegram_html, responses)
+    print(
+        f"responses:   {len(responses)} x ~{RESPONSE_SIZE} chars, ~{spans} code spans"
+    )
+    print(f"multi-pass:  {before:8.2f} ms/response")
+    print(f"scans:       {after:8.2f} ms/response")
+    print(f"speedup:     {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+"""End-to-end pipeline throughput benchmark.
+
+Drives synthetic text-message updates from many concurrent users through
+the bot's update processor, middleware chain and ``MessageOrchestrator``.
+Storage is the real ``Storage`` on a temporary SQLite file. The Telegram
+Bot API is answered locally by ``StubBotApi``. Claude is replaced by one
+of three fake backends:
+
+- ``stub``: an in-process backend that sleeps for the configured latency
+- ``cli``: ``ClaudeProcessManager`` running the fake CLI
+  (``src/claude/fake_cli.py``)
+- ``sdk``: ``ClaudeSDKManager`` running the fake CLI
+
+Reported metrics: handler latency (p50/p95/p99), updates/s, database write
+statements per update, Bot API calls per update and peak RSS. Results can
+be written as JSON and compared against an earlier run; the script exits
+with status 1 when a metric regressed by more than the tolerance.
+
+Usage:
+    poetry run python benchmarks/pipeline.py [--users 20] [--messages 10]
+        [--backend stub|cli|sdk] [--claude-latency 0.05]
+        [--output results.json] [--baseline baseline.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import resource
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import aiosqlite  # noqa: E402
+import structlog  # noqa: E402
+from telegram import Update  # noqa: E402
+from telegram.ext import Application, ContextTypes, ExtBot  # noqa: E402
+from telegram.request import BaseRequest, RequestData  # noqa: E402
+
+from src.bot.core import ClaudeCodeBot  # noqa: E402
+from src.bot.update_processor import UserOrderedUpdateProcessor  # noqa: E402
+from src.claude import (  # noqa: E402
+    ClaudeIntegration,
+    ClaudeProcessManager,
+    SessionManager,
+    ToolMonitor,
+)
+from src.claude.fake_cli import (  # noqa: E402
+    FakeCliScenario,
+    default_transcript,
+    write_fake_cli,
+)
+from src.claude.integration import ClaudeResponse  # noqa: E402
+from src.claude.sdk_integration import ClaudeSDKManager  # noqa: E402
+from src.config.loader import create_test_config  # noqa: E402
+from src.config.settings import Settings  # noqa: E402
+from src.security.audit import AuditLogger, InMemoryAuditStorage  # noqa: E402
+from src.security.auth import (  # noqa: E402
+    AuthenticationManager,
+    WhitelistAuthProvider,
+)
+from src.security.rate_limiter import RateLimiter  # noqa: E402
+from src.security.validators import SecurityValidator  # noqa: E402
+from src.storage.facade import Storage  # noqa: E402
+from src.storage.session_storage import SQLiteSessionStorage  # noqa: E402
+
+TOKEN = "123456:benchmark"
+FIRST_USER_ID = 10_000
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "bench", "username": "bench"}
+PROMPT = "please summarise what the parser module does and list its tests"
+RESPONSE = "The parser module turns stream-json lines into updates. " * 4
+
+# Metric name -> whether a larger value is better
+METRICS = {
+    "latency_p50_ms": False,
+    "latency_p95_ms": False,
+    "latency_p99_ms": False,
+    "updates_per_second": True,
+    "db_writes_per_update": False,
+    "bot_api_calls_per_update": False,
+    "peak_rss_mb": False,
+}
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+class StubBotApi(BaseRequest):
+    """Answers Bot API requests locally, after an optional round-trip delay."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self._message_ids = itertools.count(1_000_000)
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+
+    async def initialize(self) -> None:
+        return None
+
+    async def shutdown(self) -> None:
+        return None
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        **timeouts: Any,
+    ) -> Tuple[int, bytes]:
+        api_method = url.rsplit("/", 1)[-1]
+        self.calls[api_method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        params = request_data.parameters if request_data else {}
+        body = {"ok": True, "result": self._result(api_method, params)}
+        return 200, json.dumps(body).encode()
+
+    def _result(self, api_method: str, params: Dict[str, Any]) -> Any:
+        """Minimal valid result for a Bot API method."""
+        if api_method == "getMe":
+            return BOT_USER
+        if api_method.startswith(("send", "edit")) and api_method != "sendChatAction":
+            return {
+                "message_id": params.get("message_id") or next(self._message_ids),
+                "date": int(time.time()),
+                "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+                "from": BOT_USER,
+                "text": params.get("text", ""),
+            }
+        return True
+
+
+class StubClaudeBackend(ClaudeProcessManager):
+    """In-process Claude backend that answers after a fixed latency."""
+
+    def __init__(self, config: Settings, latency: float):
+        super().__init__(config)
+        self.latency = latency
+
+    async def execute_command(
+        self,
+        prompt: str,
+        working_directory: Path,
+        session_id: Optional[str] = None,
+        continue_session: bool = False,
+        stream_callback: Optional[Any] = None,
+    ) -> ClaudeResponse:
+        await asyncio.sleep(self.latency)
+        return ClaudeResponse(
+            content=RESPONSE,
+            session_id=session_id or str(uuid.uuid4()),
+            cost=0.001,
+            duration_ms=int(self.latency * 1000),
+            num_turns=1,
+        )
+
+
+class WriteCounter:
+    """Counts SQL write statements executed on any SQLite connection."""
+
+    def __init__(self) -> None:
+        self.writes = 0
+
+    def observe(self, statement: str) -> None:
+        if statement.lstrip().upper().startswith(WRITE_STATEMENTS):
+            self.writes += 1
+
+    @contextmanager
+    def installed(self) -> Iterator[None]:
+        """Trace every connection opened through aiosqlite meanwhile."""
+        counter = self
+
+        class CountingConnection(sqlite3.Connection):
+            def __init__(self, *args: Any, **kwargs: Any):
+                super().__init__(*args, **kwargs)
+                self.set_trace_callback(counter.observe)
+
+        real_connect = aiosqlite.connect
+
+        def connect(*args: Any, **kwargs: Any) -> aiosqlite.Connection:
+            return real_connect(*args, factory=CountingConnection, **kwargs)
+
+        aiosqlite.connect = connect
+        try:
+            yield
+        finally:
+            aiosqlite.connect = real_connect
+
+
+def make_update(update_id: int, user_id: int, text: str, bot: ExtBot) -> Update:
+    """Build a private-chat text message update."""
+    payload = {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Bench"},
+            "text": text,
+        },
+    }
+    return Update.de_json(payload, bot)
+
+
+def build_claude_backend(
+    args: argparse.Namespace, settings: Settings, workdir: Path
+) -> Tuple[Optional[ClaudeProcessManager], Optional[ClaudeSDKManager]]:
+    """Create the fake Claude backend selected on the command line."""
+    if args.backend == "stub":
+        return StubClaudeBackend(settings, args.claude_latency), None
+
+    cli = write_fake_cli(
+        workdir / "claude",
+        FakeCliScenario(
+            transcript=default_transcript(text=RESPONSE),
+            first_message_delay=args.claude_latency,
+            token_delay=args.token_delay,
+        ),
+    )
+    fake_settings = settings.model_copy(
+        update={"claude_binary_path": str(cli), "claude_cli_path": str(cli)}
+    )
+    if args.backend == "sdk":
+        return None, ClaudeSDKManager(fake_settings)
+    return ClaudeProcessManager(fake_settings), None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the benchmark and return its metrics."""
+    user_ids = [FIRST_USER_ID + i for i in range(args.users + 1)]
+    warmup_user, bench_users = user_ids[0], user_ids[1:]
+    total = args.users * args.messages
+    write_counter = WriteCounter()
+
+    with tempfile.TemporaryDirectory() as tmp, write_counter.installed():
+        workdir = Path(tmp)
+        approved_dir = workdir / "projects"
+        settings = create_test_config(
+            approved_directory=str(approved_dir),
+            database_url=f"sqlite:///{workdir / 'bench.db'}",
+            allowed_users=user_ids,
+            use_sdk=args.backend == "sdk",
+            agentic_mode=True,
+            max_concurrent_updates=args.max_concurrent_updates,
+            rate_limit_requests=total * 10,
+            rate_limit_burst=total * 10,
+            claude_max_cost_per_user=float(total * 10),
+        )
+
+        storage = Storage(settings.database_url)
+        await storage.initialize()
+        security_validator = SecurityValidator(settings.approved_directory)
+        process_manager, sdk_manager = build_claude_backend(args, settings, workdir)
+        claude_integration = ClaudeIntegration(
+            config=settings,
+            process_manager=process_manager,
+            sdk_manager=sdk_manager,
+            session_manager=SessionManager(
+                settings, SQLiteSessionStorage(storage.db_manager)
+            ),
+            tool_monitor=ToolMonitor(settings, security_validator),
+        )
+        deps = {
+            "auth_manager": AuthenticationManager([WhitelistAuthProvider(user_ids)]),
+            "security_validator": security_validator,
+            "rate_limiter": RateLimiter(settings),
+            "audit_logger": AuditLogger(InMemoryAuditStorage()),
+            "claude_integration": claude_integration,
+            "storage": storage,
+        }
+
+        bot_api = StubBotApi(args.bot_api_latency)
+        bot = ClaudeCodeBot(settings, deps)
+        processor = UserOrderedUpdateProcessor(settings.max_concurrent_updates)
+        bot.update_processor = processor
+        bot.app = (
+            Application.builder()
+            .bot(ExtBot(TOKEN, request=bot_api, get_updates_request=StubBotApi()))
+            .concurrent_updates(processor)
+            .updater(None)
+            .build()
+        )
+        bot._inject_dependencies()
+        bot._register_handlers()
+        bot._add_middleware()
+
+        errors: List[str] = []
+
+        async def on_error(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
+            errors.append(repr(context.error))
+
+        bot.app.add_error_handler(on_error)
+        await bot.app.initialize()
+
+        update_ids = itertools.count(1)
+        latencies: List[float] = []
+
+        async def send(user_id: int, record: bool) -> None:
+            update = make_update(next(update_ids), user_id, PROMPT, bot.app.bot)
+            start = time.perf_counter()
+            await processor.process_update(update, bot.app.process_update(update))
+            if record:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        async def user_session(user_id: int) -> None:
+            for _ in range(args.messages):
+                await send(user_id, record=True)
+
+        try:
+            for _ in range(args.warmup):
+                await send(warmup_user, record=False)
+
+            write_counter.writes = 0
+            bot_api.calls.clear()
+            errors.clear()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(user_session(uid) for uid in bench_users))
+            wall = time.perf_counter() - start
+        finally:
+            await bot.app.shutdown()
+            await claude_integration.shutdown()
+            await storage.close()
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux and bytes on macOS
+    peak_rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+    pct = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "updates": len(latencies),
+        "errors": len(errors),
+        "latency_mean_ms": round(statistics.fmean(latencies), 3),
+        "latency_p50_ms": round(pct[49], 3),
+        "latency_p95_ms": round(pct[94], 3),
+        "latency_p99_ms": round(pct[98], 3),
+        "latency_max_ms": round(max(latencies), 3),
+        "updates_per_second": round(len(latencies) / wall, 2),
+        "db_writes_per_update": round(write_counter.writes / total, 2),
+        "bot_api_calls_per_update": round(sum(bot_api.calls.values()) / total, 2),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+    }
+
+
+def compare(
+    metrics: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Print each metric against the baseline and return the regressions."""
+    regressions = []
+    print(f"\n{'metric':<26}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, higher_is_better in METRICS.items():
+        old, new = baseline.get(name), metrics.get(name)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old if old else 0.0
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<26}{old:>12}{new:>12}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="concurrent users")
+    parser.add_argument("--messages", type=int, default=10, help="messages per user")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--backend", choices=["stub", "cli", "sdk"], default="stub")
+    parser.add_argument(
+        "--claude-latency", type=float, default=0.05, help="seconds per Claude run"
+    )
+    parser.add_argument(
+        "--token-delay", type=float, default=0.0, help="fake CLI seconds per token"
+    )
+    parser.add_argument(
+        "--bot-api-latency", type=float, default=0.0, help="seconds per Bot API call"
+    )
+    parser.add_argument("--max-concurrent-updates", type=int, default=32)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with a results file")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.10, help="allowed regression (0.10=10%%)"
+    )
+    args = parser.parse_args()
+
+    # Per-update debug/info logging would dominate the measurement
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    logging.getLogger("telegram").setLevel(logging.WARNING)
+
+    metrics = asyncio.run(run(args))
+    results = {
+        "benchmark": "pipeline",
+        "config": {
+            key: vars(args)[key]
+            for key in (
+                "users",
+                "messages",
+                "backend",
+                "claude_latency",
+                "token_delay",
+                "bot_api_latency",
+                "max_concurrent_updates",
+            )
+        },
+        "metrics": metrics,
+    }
+
+    for name, value in metrics.items():
+        print(f"{name + ':':<26}{value}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("config") != results["config"]:
+            print("\nwarning: baseline was run with a different configuration")
+        regressions = compare(metrics, baseline["metrics"], args.tolerance)
+        if regressions:
+            print(f"\nregressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Security scanner benchmark on 4KB messages.
+
+Compares the previous approach (one ``re.search(..., re.IGNORECASE)`` per
+pattern) with the precompiled ``PatternScanner`` for the message rules and
+reconnaissance rules checked on every incoming message.
+
+Usage:
+    poetry run python benchmarks/security_scanner.py [--iterations 500]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.bot.middleware.security import (  # noqa: E402
+    MESSAGE_RULES,
+    MESSAGE_SCANNER,
+    RECON_PATTERNS,
+    RECON_SCANNER,
+)
+
+MESSAGE_SIZE = 4096
+
+WORDS = (
+    "please refactor the parser module and add tests for every function in "
+    "the config loader then run the suite and explain any failures found"
+).split()
+
+
+def make_message(seed: int) -> str:
+    """Build a benign ~4KB prose message."""
+    rng = random.Random(seed)
+    words: List[str] = []
+    size = 0
+    while size < MESSAGE_SIZE:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:MESSAGE_SIZE]
+
+
+def naive(text: str) -> int:
+    """Previous behaviour: search every pattern separately."""
+    hits = 0
+    for rule in MESSAGE_RULES:
+        flags = re.IGNORECASE if rule.ignore_case else 0
+        if re.search(rule.pattern, text, flags):
+            hits += 1
+    for pattern in RECON_PATTERNS:
+        if re.search(pattern, text, re.IGNORECASE):
+            hits += 1
+    return hits
+
+
+def scanner(text: str) -> int:
+    """Precompiled single-pass scanner."""
+    return len(MESSAGE_SCANNER.scan(text)) + len(RECON_SCANNER.scan(text))
+
+
+def measure(func: Callable[[str], int], messages: List[str]) -> float:
+    """Return mean microseconds per message."""
+    start = time.perf_counter()
+    for text in messages:
+        func(text)
+    return (time.perf_counter() - start) / len(messages) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    messages = [make_message(seed) for seed in range(args.iterations)]
+    # A message with hits in every category exercises the slow path
+    messages[0] = messages[0][:-64] + " ; rm x ../etc javascript: ls / whoami"
+
+    for text in messages[:50]:
+        assert naive(text) == scanner(text)
+
+    before = measure(naive, messages)
+    after = measure(scanner, messages)
+    print(f"messages:  {len(messages)} x {MESSAGE_SIZE} chars")
+    print(f"re.search: {before:8.1f} us/message")
+    print(f"scanner:   {after:8.1f} us/message")
+    print(f"speedup:   {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Per-update dispatch overhead benchmark.
+
+Pushes synthetic text-message updates through ``Application.process_update``
+with the bot's real middleware chain (security, auth, rate limit) and a
+no-op final handler, so the numbers reflect framework and middleware cost
+only. No network access is needed.
+
+Usage:
+    poetry run python benchmarks/update_overhead.py [--updates 5000]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import structlog  # noqa: E402
+from telegram import Update, User  # noqa: E402
+from telegram.ext import (  # noqa: E402
+    Application,
+    ContextTypes,
+    ExtBot,
+    MessageHandler,
+    filters,
+)
+
+from src.bot.core import ClaudeCodeBot  # noqa: E402
+from src.config.loader import create_test_config  # noqa: E402
+from src.security.auth import (  # noqa: E402
+    AuthenticationManager,
+    WhitelistAuthProvider,
+)
+from src.security.rate_limiter import RateLimiter  # noqa: E402
+from src.security.validators import SecurityValidator  # noqa: E402
+
+USER_ID = 4242
+TOKEN = "123456:benchmark"
+
+
+class OfflineBot(ExtBot):  # type: ignore[type-arg]
+    """ExtBot that never talks to Telegram."""
+
+    async def get_me(self, *args: Any, **kwargs: Any) -> User:
+        self._bot_user = User(id=1, is_bot=True, first_name="bench", username="bench")
+        return self._bot_user
+
+    async def shutdown(self) -> None:
+        return None
+
+
+def make_update(update_id: int, text: str) -> Update:
+    """Build a private-chat text message update."""
+    payload = {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": USER_ID, "type": "private"},
+            "from": {"id": USER_ID, "is_bot": False, "first_name": "Bench"},
+            "text": text,
+        },
+    }
+    return Update.de_json(payload, None)
+
+
+async def run(updates: int, warmup: int) -> List[float]:
+    """Dispatch updates and return per-update latencies in microseconds."""
+    with tempfile.TemporaryDirectory() as approved_dir:
+        settings = create_test_config(
+            approved_directory=approved_dir,
+            allowed_users=[USER_ID],
+            rate_limit_requests=updates * 10,
+            rate_limit_burst=updates * 10,
+            claude_max_cost_per_user=float(updates * 10),
+        )
+        auth_manager = AuthenticationManager([WhitelistAuthProvider([USER_ID])])
+        # Pre-authenticate so the welcome reply (a network call) is skipped
+        await auth_manager.authenticate_user(USER_ID)
+        deps = {
+            "auth_manager": auth_manager,
+            "security_validator": SecurityValidator(Path(approved_dir)),
+            "rate_limiter": RateLimiter(settings),
+            "audit_logger": None,
+        }
+
+        bot = ClaudeCodeBot(settings, deps)
+        bot.app = Application.builder().bot(OfflineBot(TOKEN)).updater(None).build()
+        bot._inject_dependencies()
+        bot._add_middleware()
+
+        async def final_handler(
+            update: Update, context: ContextTypes.DEFAULT_TYPE
+        ) -> None:
+            return None
+
+        bot.app.add_handler(
+            MessageHandler(filters.TEXT & ~filters.COMMAND, final_handler), group=10
+        )
+        await bot.app.initialize()
+
+        text = "please refactor the parser module and add tests " * 4
+        samples: List[float] = []
+        try:
+            for i in range(warmup + updates):
+                update = make_update(i + 1, text)
+                start = time.perf_counter()
+                await bot.app.process_update(update)
+                elapsed = (time.perf_counter() - start) * 1_000_000
+                if i >= warmup:
+                    samples.append(elapsed)
+        finally:
+            await bot.app.shutdown()
+
+        return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    args = parser.parse_args()
+
+    # Per-update debug/info logging would dominate the measurement
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    samples = sorted(asyncio.run(run(args.updates, args.warmup)))
+    pct = statistics.quantiles(samples, n=100)
+    print(f"updates: {len(samples)}")
+    print(f"mean:    {statistics.fmean(samples):8.1f} us")
+    print(f"p50:     {pct[49]:8.1f} us")
+    print(f"p95:     {pct[94]:8.1f} us")
+    print(f"p99:     {pct[98]:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
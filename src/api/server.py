@@ -14,6 +14,7 @@ from ..config.settings import Settings
 from ..events.bus import EventBus
 from ..events.types import WebhookEvent
 from ..storage.database import DatabaseManager
+from ..storage.repositories import NotificationOutboxRepository
 from .auth import verify_github_signature, verify_shared_secret
 
 logger = structlog.get_logger()
@@ -130,6 +131,27 @@ def create_api_app(
 
         return {"status": "accepted", "event_id": event.id}
 
+    @app.get("/notifications/failed")
+    async def failed_notifications(
+        limit: int = 50,
+        authorization: Optional[str] = Header(None),
+    ) -> Dict[str, Any]:
+        """List notifications that could not be delivered (admin view)."""
+        secret = settings.webhook_api_secret
+        if not secret:
+            raise HTTPException(
+                status_code=500,
+                detail="Webhook API secret not configured",
+            )
+        if not verify_shared_secret(authorization, secret):
+            raise HTTPException(status_code=401, detail="Invalid authorization")
+        if not db_manager:
+            return {"failed": []}
+
+        outbox = NotificationOutboxRepository(db_manager)
+        failed = await outbox.get_failed(limit=max(1, min(limit, 500)))
+        return {"failed": [item.to_dict() for item in failed]}
+
     return app
 
 
@@ -23,6 +23,7 @@ from ..config.settings import Settings
 from ..exceptions import ClaudeCodeTelegramError
 from .features.registry import FeatureRegistry
 from .orchestrator import MessageOrchestrator
+from .update_processor import UserOrderedUpdateProcessor
 
 logger = structlog.get_logger()
 
@@ -37,6 +38,7 @@ class ClaudeCodeBot:
         self.app: Optional[Application] = None
         self.is_running = False
         self.feature_registry: Optional[FeatureRegistry] = None
+        self.update_processor: Optional[UserOrderedUpdateProcessor] = None
         self.orchestrator = MessageOrchestrator(settings, dependencies)
 
     async def initialize(self) -> None:
@@ -56,6 +58,14 @@ class ClaudeCodeBot:
         builder.write_timeout(30)
         builder.pool_timeout(30)
 
+        # Process different users' updates concurrently, each user in order
+        self.update_processor = UserOrderedUpdateProcessor(
+            self.settings.max_concurrent_updates,
+            # Debounced text is ordered by the orchestrator's merged turns
+            bypass_text_messages=self.orchestrator.debouncer is not None,
+        )
+        builder.concurrent_updates(self.update_processor)
+
         self.app = builder.build()
 
         # Initialize feature registry
@@ -68,6 +78,9 @@ class ClaudeCodeBot:
         # Add feature registry to dependencies
         self.deps["features"] = self.feature_registry
 
+        # Make dependencies available to all handlers via context.bot_data
+        self._inject_dependencies()
+
         # Set bot commands for menu
         await self._set_bot_commands()
 
@@ -92,6 +105,15 @@ class ClaudeCodeBot:
         """Register handlers via orchestrator (mode-aware)."""
         self.orchestrator.register_handlers(self.app)
 
+    def _inject_dependencies(self) -> None:
+        """Attach dependencies to the application's bot_data once at startup.
+
+        bot_data is shared by every update's context, so handlers and
+        middleware read from it without any per-update copying.
+        """
+        self.app.bot_data.update(self.deps)
+        self.app.bot_data["settings"] = self.settings
+
     def _add_middleware(self) -> None:
         """Add middleware to application."""
         from .middleware.auth import auth_middleware
@@ -126,16 +148,11 @@ class ClaudeCodeBot:
         logger.info("Middleware added to bot")
 
     def _create_middleware_handler(self, middleware_func: Callable) -> Callable:
-        """Create middleware handler that injects dependencies."""
+        """Adapt a middleware function to a Telegram handler callback."""
 
         async def middleware_wrapper(
             update: Update, context: ContextTypes.DEFAULT_TYPE
         ):
-            # Inject dependencies into context
-            for key, value in self.deps.items():
-                context.bot_data[key] = value
-            context.bot_data["settings"] = self.settings
-
             # Create a dummy handler that does nothing (middleware will handle everything)
             async def dummy_handler(event, data):
                 return None
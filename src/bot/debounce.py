@@ -0,0 +1,104 @@
+"""Merge rapid consecutive messages from a user into one Claude turn.
+
+Users often split one thought across several quick messages. Without
+merging, each message starts its own Claude run and resumes the same
+session again. ``MessageDebouncer`` collects messages per key, such as
+``(chat_id, user_id)``, so users sharing a group chat are never merged:
+
+- The first message makes its handler the key's *leader*. The leader waits
+  until no new message has arrived for the debounce window, then takes the
+  whole batch and runs a single turn.
+- Messages arriving while a leader is gathering or running are queued for
+  it; their handlers return at once.
+- After each turn the leader collects whatever arrived during the run and
+  runs again, until nothing is pending for the key.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, Generic, Hashable, List, Optional, TypeVar
+
+import structlog
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# Messages merged into one turn at most
+MAX_BATCH_MESSAGES = 10
+
+
+@dataclass
+class _Queue(Generic[T]):
+    """Messages waiting for a key's leader."""
+
+    pending: List[T] = field(default_factory=list)
+    arrived: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class MessageDebouncer(Generic[T]):
+    """Per-key debounce window with leader/follower batching."""
+
+    def __init__(
+        self, window_seconds: float, max_batch_messages: int = MAX_BATCH_MESSAGES
+    ):
+        self.window_seconds = window_seconds
+        self.max_batch_messages = max_batch_messages
+        self._queues: Dict[Hashable, _Queue[T]] = {}
+
+        # Metrics
+        self.messages = 0
+        self.turns = 0
+
+    async def submit(self, key: Hashable, message: T) -> Optional[List[T]]:
+        """Queue a message.
+
+        Returns the first batch when the caller becomes the key's leader, or
+        None when the message was handed to the current leader.
+        """
+        self.messages += 1
+        queue = self._queues.get(key)
+        if queue is not None:
+            queue.pending.append(message)
+            queue.arrived.set()
+            return None
+
+        queue = _Queue(pending=[message])
+        self._queues[key] = queue
+        return await self._take_batch(queue)
+
+    async def next_batch(self, key: Hashable) -> Optional[List[T]]:
+        """Return messages that arrived during the leader's turn.
+
+        Returns None, and gives up leadership, when nothing is pending.
+        """
+        queue = self._queues[key]
+        if not queue.pending:
+            del self._queues[key]
+            return None
+        return await self._take_batch(queue)
+
+    def release(self, key: Hashable) -> List[T]:
+        """Give up leadership, returning messages that were not processed."""
+        queue = self._queues.pop(key, None)
+        return queue.pending if queue else []
+
+    def is_active(self, key: Hashable) -> bool:
+        """Whether a leader is gathering or running for the key."""
+        return key in self._queues
+
+    async def _take_batch(self, queue: _Queue[T]) -> List[T]:
+        """Wait for a quiet window, then remove and return the batch."""
+        while len(queue.pending) < self.max_batch_messages:
+            queue.arrived.clear()
+            try:
+                await asyncio.wait_for(queue.arrived.wait(), self.window_seconds)
+            except asyncio.TimeoutError:
+                break
+
+        batch = queue.pending[: self.max_batch_messages]
+        del queue.pending[: self.max_batch_messages]
+        self.turns += 1
+        if len(batch) > 1:
+            logger.debug("Merged messages into one turn", count=len(batch))
+        return batch
@@ -0,0 +1,140 @@
+"""Read uploaded archives in place, without extracting them.
+
+``FileHandler._process_archive`` only needs the tree of an archive and the
+first characters of a few code files. ``ArchiveReader`` lists members from
+the zip central directory or tar headers and reads selected members
+straight from the archive:
+
+- nothing is written to disk
+- each read is capped at a number of actual (decompressed) bytes, so a
+  member that lies about its size cannot inflate memory
+- absolute paths, ``..`` components, links and special files are left out
+- archives declaring more than ``max_total_size`` bytes or
+  ``max_members`` entries are rejected before anything is read
+"""
+
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Union
+
+# Limits on what an archive may declare
+MAX_ARCHIVE_SIZE = 100 * 1024 * 1024
+MAX_ARCHIVE_MEMBERS = 10_000
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """A file or directory in an archive, with a normalized relative path."""
+
+    path: str
+    size: int
+    is_dir: bool
+
+
+def _normalize(name: str) -> Optional[str]:
+    """Relative POSIX path of a member name, or None if it is unsafe."""
+    path = PurePosixPath(name.replace("\\", "/"))
+    if path.is_absolute() or ".." in path.parts:
+        return None
+    parts = [part for part in path.parts if part != "."]
+    return "/".join(parts) or None
+
+
+class ArchiveReader:
+    """Zip or tar archive opened for listing and capped member reads."""
+
+    def __init__(
+        self,
+        archive_path: Path,
+        max_total_size: int = MAX_ARCHIVE_SIZE,
+        max_members: int = MAX_ARCHIVE_MEMBERS,
+    ):
+        self.archive_path = archive_path
+        self.max_total_size = max_total_size
+        self.max_members = max_members
+        self._archive: Union[zipfile.ZipFile, tarfile.TarFile, None] = None
+        # Normalized path -> ZipInfo or TarInfo, in archive order
+        self._infos: Dict[str, Union[zipfile.ZipInfo, tarfile.TarInfo]] = {}
+        self.members: List[ArchiveMember] = []
+        self._entries = 0
+
+    def __enter__(self) -> "ArchiveReader":
+        try:
+            if zipfile.is_zipfile(self.archive_path):
+                self._archive = zipfile.ZipFile(self.archive_path)
+                self._list_zip(self._archive)
+            else:
+                self._archive = tarfile.open(self.archive_path, "r:*")
+                self._list_tar(self._archive)
+        except (tarfile.TarError, zipfile.BadZipFile) as e:
+            self.close()
+            raise ValueError(f"Unsupported or corrupt archive: {e}") from e
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying archive."""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def _add(
+        self,
+        name: str,
+        size: int,
+        is_dir: bool,
+        info: Union[zipfile.ZipInfo, tarfile.TarInfo],
+    ) -> None:
+        """Record a member, enforcing the declared limits."""
+        self._entries += 1
+        if self._entries > self.max_members:
+            raise ValueError("Archive has too many entries")
+        path = _normalize(name)
+        if path is None or path in self._infos:
+            return
+        self._infos[path] = info
+        self.members.append(ArchiveMember(path, size, is_dir))
+
+    def _check_total(self, total_size: int) -> None:
+        """Reject archives whose declared sizes exceed the limit."""
+        if total_size > self.max_total_size:
+            raise ValueError("Archive too large")
+
+    def _list_zip(self, archive: zipfile.ZipFile) -> None:
+        """List members from the central directory."""
+        infos = archive.infolist()
+        self._check_total(sum(info.file_size for info in infos))
+        for info in infos:
+            self._add(info.filename, info.file_size, info.is_dir(), info)
+
+    def _list_tar(self, archive: tarfile.TarFile) -> None:
+        """List regular files and directories from the tar headers."""
+        total_size = 0
+        for info in archive:
+            if not (info.isfile() or info.isdir()):
+                continue
+            total_size += info.size
+            self._check_total(total_size)
+            self._add(info.name, info.size, info.isdir(), info)
+
+    def read(self, paths: Iterable[str], max_bytes: int) -> Dict[str, bytes]:
+        """Up to max_bytes of each file member, read in archive order."""
+        wanted = set(paths)
+        contents: Dict[str, bytes] = {}
+        for path, info in self._infos.items():
+            if path not in wanted:
+                continue
+            if isinstance(self._archive, zipfile.ZipFile):
+                with self._archive.open(info) as source:
+                    contents[path] = source.read(max_bytes)
+            elif isinstance(self._archive, tarfile.TarFile):
+                source = self._archive.extractfile(info)
+                contents[path] = source.read(max_bytes) if source else b""
+        return contents
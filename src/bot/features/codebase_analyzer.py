@@ -0,0 +1,392 @@
+"""Single-pass codebase analysis with ignore rules and a fingerprint cache.
+
+``CodebaseAnalyzer.analyze`` walks a tree once with ``os.scandir`` and
+gathers every statistic of a ``CodebaseAnalysis`` on the way: languages,
+extension counts, entry points, tests and TODO/FIXME counts. It is
+blocking; ``FileHandler.analyze_codebase`` runs it in a worker thread.
+
+- Directories in ``DEFAULT_EXCLUDES`` and paths matched by ``.gitignore``
+  files (the root's and nested ones) are skipped without descending.
+- The walk hashes every visited path with its size and mtime into a tree
+  fingerprint. An unchanged fingerprint returns the cached analysis
+  without reading any file.
+- On a change, only files whose size or mtime changed are read again for
+  TODO/FIXME counts.
+"""
+
+import fnmatch
+import hashlib
+import os
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Directories never analyzed: VCS data, dependencies, caches and build output
+DEFAULT_EXCLUDES = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "venv",
+        ".venv",
+        "env",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".tox",
+        ".idea",
+        ".uploads",
+        "dist",
+        "build",
+        "target",
+    }
+)
+
+# Files larger than this are not scanned for TODOs (bundles, generated code)
+MAX_TODO_SCAN_BYTES = 1024 * 1024
+
+# Directories whose analyses are kept at most
+MAX_CACHED_DIRECTORIES = 32
+
+ENTRY_POINT_NAMES = [
+    "main.py",
+    "app.py",
+    "server.py",
+    "__main__.py",
+    "index.js",
+    "app.js",
+    "server.js",
+    "main.js",
+    "main.go",
+    "main.rs",
+    "main.cpp",
+    "main.c",
+    "Main.java",
+    "App.java",
+    "index.php",
+    "index.html",
+]
+
+TEST_FILE_PATTERNS = [
+    "test_*.py",
+    "*_test.py",
+    "*_test.go",
+    "*.test.js",
+    "*.spec.js",
+    "*.test.ts",
+    "*.spec.ts",
+]
+TEST_DIRECTORIES = {"test", "tests", "__tests__", "spec"}
+
+# Indicator files at the top level and the frameworks they may mention
+FRAMEWORK_INDICATORS = {
+    "package.json": ["React", "Vue", "Angular", "Express", "Next.js"],
+    "requirements.txt": ["Django", "Flask", "FastAPI", "PyTorch", "TensorFlow"],
+    "Cargo.toml": ["Tokio", "Actix", "Rocket"],
+    "go.mod": ["Gin", "Echo", "Fiber"],
+    "pom.xml": ["Spring", "Maven"],
+    "build.gradle": ["Spring", "Gradle"],
+    "composer.json": ["Laravel", "Symfony"],
+    "Gemfile": ["Rails", "Sinatra"],
+}
+FRAMEWORK_FILES = {
+    "manage.py": "Django",
+    "artisan": "Laravel",
+    "next.config.js": "Next.js",
+}
+
+_TEST_FILE_RE = re.compile("|".join(fnmatch.translate(p) for p in TEST_FILE_PATTERNS))
+
+
+@dataclass
+class CodebaseAnalysis:
+    """Codebase analysis result"""
+
+    languages: Dict[str, int]
+    frameworks: List[str]
+    entry_points: List[str]
+    todo_count: int
+    test_coverage: bool
+    file_stats: Dict[str, int]
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob into a regex matching a relative path."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class _IgnoreRule:
+    """One .gitignore line, relative to the directory of its file."""
+
+    regex: "re.Pattern[str]"
+    negate: bool
+    dir_only: bool
+    # Match the full relative path rather than just the name
+    anchored: bool
+
+
+def parse_gitignore(text: str) -> List[_IgnoreRule]:
+    """Rules of a .gitignore file, in order."""
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            continue
+        regex = re.compile(_glob_to_regex(line) + r"\Z")
+        rules.append(_IgnoreRule(regex, negate, dir_only, anchored))
+    return rules
+
+
+@dataclass
+class IgnoreRules:
+    """gitignore rules in effect for a directory, outermost file first."""
+
+    # (base directory relative to the root, rules of its .gitignore)
+    layers: List[Tuple[str, List[_IgnoreRule]]] = field(default_factory=list)
+
+    def with_file(self, base: str, text: str) -> "IgnoreRules":
+        """Rules extended by the .gitignore of directory base."""
+        rules = parse_gitignore(text)
+        return IgnoreRules(self.layers + [(base, rules)]) if rules else self
+
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        """Whether a path relative to the root is ignored; the last match wins."""
+        ignored = False
+        name = path.rsplit("/", 1)[-1]
+        for base, rules in self.layers:
+            relative = path[len(base) + 1 :] if base else path
+            for rule in rules:
+                if rule.dir_only and not is_dir:
+                    continue
+                target = relative if rule.anchored else name
+                if rule.regex.match(target):
+                    ignored = not rule.negate
+        return ignored
+
+
+@dataclass
+class _CacheEntry:
+    """An analysis and the per-file TODO counts it was built from."""
+
+    fingerprint: str
+    analysis: CodebaseAnalysis
+    # Relative path -> (size, mtime_ns, TODO count)
+    todo_counts: Dict[str, Tuple[int, int, int]]
+
+
+class CodebaseAnalyzer:
+    """Analyze trees in one walk, caching results by tree fingerprint."""
+
+    def __init__(
+        self,
+        code_extensions: Iterable[str],
+        language_map: Dict[str, str],
+        excludes: Iterable[str] = DEFAULT_EXCLUDES,
+        max_directories: int = MAX_CACHED_DIRECTORIES,
+    ):
+        self.code_extensions: Set[str] = set(code_extensions)
+        self.language_map = language_map
+        self.excludes = frozenset(excludes)
+        self.max_directories = max_directories
+        self._cache: Dict[Path, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.files_read = 0
+
+    def analyze(self, directory: Path) -> CodebaseAnalysis:
+        """Analyze a tree, reusing the cached result if nothing changed."""
+        with self._lock:
+            cached = self._cache.get(directory)
+
+        files = self._walk(directory)
+        digest = hashlib.blake2b(digest_size=16)
+        for relative, size, mtime_ns in files:
+            digest.update(f"{relative}\0{size}\0{mtime_ns}\n".encode())
+        fingerprint = digest.hexdigest()
+
+        if cached is not None and cached.fingerprint == fingerprint:
+            self.hits += 1
+            return cached.analysis
+
+        previous = cached.todo_counts if cached else {}
+        analysis, todo_counts = self._build(directory, files, previous)
+        with self._lock:
+            self._cache.pop(directory, None)
+            self._cache[directory] = _CacheEntry(fingerprint, analysis, todo_counts)
+            while len(self._cache) > self.max_directories:
+                del self._cache[next(iter(self._cache))]
+        return analysis
+
+    def _walk(self, root: Path) -> List[Tuple[str, int, int]]:
+        """Relative path, size and mtime of every file that is not ignored."""
+        files: List[Tuple[str, int, int]] = []
+        stack: List[Tuple[str, IgnoreRules]] = [("", IgnoreRules())]
+        while stack:
+            relative_dir, rules = stack.pop()
+            directory = os.path.join(root, relative_dir) if relative_dir else root
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            gitignore = next((e for e in entries if e.name == ".gitignore"), None)
+            if gitignore is not None:
+                try:
+                    with open(gitignore.path, encoding="utf-8", errors="ignore") as f:
+                        rules = rules.with_file(relative_dir, f.read())
+                except OSError:
+                    pass
+
+            subdirectories = []
+            for entry in entries:
+                relative = (
+                    f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                )
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if not is_dir and not entry.is_file(follow_symlinks=False):
+                        continue
+                except OSError:
+                    continue
+                if is_dir and entry.name in self.excludes:
+                    continue
+                if rules.is_ignored(relative, is_dir):
+                    continue
+                if is_dir:
+                    subdirectories.append(relative)
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                files.append((relative, stat.st_size, stat.st_mtime_ns))
+
+            # Visit subdirectories in name order
+            stack.extend((sub, rules) for sub in reversed(subdirectories))
+        return files
+
+    def _build(
+        self,
+        root: Path,
+        files: List[Tuple[str, int, int]],
+        previous: Dict[str, Tuple[int, int, int]],
+    ) -> Tuple[CodebaseAnalysis, Dict[str, Tuple[int, int, int]]]:
+        """Compute every statistic from the walked files."""
+        languages: Dict[str, int] = defaultdict(int)
+        extensions: Dict[str, int] = defaultdict(int)
+        entry_points: Dict[str, List[str]] = defaultdict(list)
+        todo_counts: Dict[str, Tuple[int, int, int]] = {}
+        has_tests = False
+        entry_point_names = set(ENTRY_POINT_NAMES)
+
+        for relative, size, mtime_ns in files:
+            name = relative.rsplit("/", 1)[-1]
+            ext = os.path.splitext(name)[1].lower()
+            extensions[ext] += 1
+            language = self.language_map.get(ext)
+            if language:
+                languages[language] += 1
+
+            if name in entry_point_names:
+                entry_points[name].append(relative)
+            if not has_tests:
+                top = relative.split("/", 1)[0]
+                has_tests = ("/" in relative and top in TEST_DIRECTORIES) or bool(
+                    _TEST_FILE_RE.match(name)
+                )
+
+            if ext in self.code_extensions and size <= MAX_TODO_SCAN_BYTES:
+                known = previous.get(relative)
+                if known is not None and known[:2] == (size, mtime_ns):
+                    todo_counts[relative] = known
+                else:
+                    count = self._count_todos(root / relative)
+                    todo_counts[relative] = (size, mtime_ns, count)
+
+        analysis = CodebaseAnalysis(
+            languages=dict(languages),
+            frameworks=_detect_frameworks(root, {relative for relative, _, _ in files}),
+            entry_points=[
+                path for name in ENTRY_POINT_NAMES for path in entry_points[name]
+            ],
+            todo_count=sum(count for _, _, count in todo_counts.values()),
+            test_coverage=has_tests,
+            file_stats=dict(extensions),
+        )
+        return analysis, todo_counts
+
+    def _count_todos(self, path: Path) -> int:
+        """TODO and FIXME occurrences in a file, case-insensitively."""
+        self.files_read += 1
+        try:
+            data = path.read_bytes().upper()
+        except OSError:
+            return 0
+        return data.count(b"TODO") + data.count(b"FIXME")
+
+
+def _detect_frameworks(root: Path, files: Set[str]) -> List[str]:
+    """Frameworks named in top-level indicator files, or implied by a file."""
+    frameworks = set()
+    for indicator, candidates in FRAMEWORK_INDICATORS.items():
+        if indicator not in files:
+            continue
+        try:
+            content = (root / indicator).read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            continue
+        content = content.lower()
+        frameworks.update(name for name in candidates if name.lower() in content)
+    frameworks.update(name for file, name in FRAMEWORK_FILES.items() if file in files)
+    return sorted(frameworks)
@@ -0,0 +1,234 @@
+"""Directory listings scanned off the event loop and cached by mtime.
+
+``/ls``, ``/projects`` and their callbacks used to call ``iterdir()``,
+``is_dir()`` and ``stat()`` on the event loop, so a large or slow (network)
+directory stalled every other chat. ``DirectoryLister`` scans with
+``os.scandir`` in a worker thread and caches each listing against the
+directory's mtime:
+
+- a listing is reused while the directory's mtime is unchanged and it is
+  younger than ``max_age`` seconds; file sizes are refreshed by the age
+  limit, since editing a file does not touch its directory's mtime
+- the Refresh button forces a rescan
+- listings are paginated with Prev/Next buttons
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from ..utils.html_format import escape_html
+
+logger = structlog.get_logger()
+
+# Entries shown per page of a listing
+PAGE_SIZE = 30
+# Directories whose listings are kept at most
+MAX_CACHED_DIRECTORIES = 256
+# Seconds before a cached listing is rescanned regardless of mtime
+DEFAULT_MAX_AGE_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class DirectoryEntry:
+    """One visible entry of a directory."""
+
+    name: str
+    is_dir: bool
+    size: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class DirectoryListing:
+    """Visible entries of a directory: directories first, then files."""
+
+    path: Path
+    mtime_ns: int
+    scanned_at: float
+    entries: Tuple[DirectoryEntry, ...]
+
+    @property
+    def directories(self) -> List[str]:
+        """Names of the subdirectories, sorted."""
+        return [entry.name for entry in self.entries if entry.is_dir]
+
+    def page_count(self, page_size: int = PAGE_SIZE) -> int:
+        """Number of pages, at least one."""
+        return max(1, -(-len(self.entries) // page_size))
+
+    def page(
+        self, number: int, page_size: int = PAGE_SIZE
+    ) -> Tuple[DirectoryEntry, ...]:
+        """Entries on a page, numbered from 0."""
+        start = number * page_size
+        return self.entries[start : start + page_size]
+
+
+class DirectoryLister:
+    """Scan directories in a worker thread, caching listings by mtime."""
+
+    def __init__(
+        self,
+        max_directories: int = MAX_CACHED_DIRECTORIES,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        self.max_directories = max_directories
+        self.max_age = max_age
+        self._cache: "OrderedDict[Path, DirectoryListing]" = OrderedDict()
+
+        # Metrics
+        self.hits = 0
+        self.scans = 0
+
+    async def list_directory(
+        self, directory: Path, refresh: bool = False
+    ) -> DirectoryListing:
+        """List a directory, reusing the cached listing while it is current.
+
+        Raises OSError when the directory cannot be read.
+        """
+        cached = None if refresh else self._cache.get(directory)
+        if cached is not None and time.monotonic() - cached.scanned_at > self.max_age:
+            cached = None
+
+        listing = await asyncio.to_thread(_scan, directory, cached)
+        if listing is cached:
+            self.hits += 1
+        else:
+            self.scans += 1
+            logger.debug(
+                "Scanned directory", path=str(directory), entries=len(listing.entries)
+            )
+
+        self._cache[directory] = listing
+        self._cache.move_to_end(directory)
+        while len(self._cache) > self.max_directories:
+            self._cache.popitem(last=False)
+        return listing
+
+    async def is_directory(self, path: Path) -> bool:
+        """Whether path is a directory, checked in a worker thread."""
+        return await asyncio.to_thread(path.is_dir)
+
+    def invalidate(self, directory: Optional[Path] = None) -> None:
+        """Drop a directory's cached listing, or every listing."""
+        if directory is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(directory, None)
+
+
+def _scan(directory: Path, cached: Optional[DirectoryListing]) -> DirectoryListing:
+    """Return cached if the directory is unchanged, else scan it."""
+    # Read the mtime first: a change during the scan makes the next call rescan
+    mtime_ns = os.stat(directory).st_mtime_ns
+    if cached is not None and cached.mtime_ns == mtime_ns:
+        return cached
+
+    directories: List[DirectoryEntry] = []
+    files: List[DirectoryEntry] = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                directories.append(DirectoryEntry(entry.name, True))
+                continue
+            try:
+                size: Optional[int] = entry.stat().st_size
+            except OSError:
+                size = None
+            files.append(DirectoryEntry(entry.name, False, size))
+
+    directories.sort(key=lambda entry: entry.name)
+    files.sort(key=lambda entry: entry.name)
+    return DirectoryListing(
+        path=directory,
+        mtime_ns=mtime_ns,
+        scanned_at=time.monotonic(),
+        entries=tuple(directories + files),
+    )
+
+
+def get_directory_lister(bot_data: Dict[str, Any]) -> DirectoryLister:
+    """The shared lister from the feature registry, or a private one."""
+    features = bot_data.get("features")
+    lister = features.get_directory_lister() if features else None
+    return lister or DirectoryLister()
+
+
+def format_file_size(size: int) -> str:
+    """Format file size in human-readable format."""
+    value = float(size)
+    for unit in ["B", "KB", "MB", "GB"]:
+        if value < 1024:
+            return f"{value:.1f}{unit}" if unit != "B" else f"{size}B"
+        value /= 1024
+    return f"{value:.1f}TB"
+
+
+def format_listing_page(
+    listing: DirectoryListing, approved_directory: Path, page: int = 0
+) -> Tuple[str, InlineKeyboardMarkup]:
+    """Render one page of a listing with navigation buttons."""
+    page_count = listing.page_count()
+    page = min(max(page, 0), page_count - 1)
+    relative_path = escape_html(str(listing.path.relative_to(approved_directory)))
+
+    lines = []
+    for entry in listing.page(page):
+        name = escape_html(entry.name)
+        if entry.is_dir:
+            lines.append(f"📁 {name}/")
+        elif entry.size is None:
+            lines.append(f"📄 {name}")
+        else:
+            lines.append(f"📄 {name} ({format_file_size(entry.size)})")
+
+    if not lines:
+        message = f"📂 <code>{relative_path}/</code>\n\n<i>(empty directory)</i>"
+    else:
+        message = f"📂 <code>{relative_path}/</code>\n\n" + "\n".join(lines)
+    if page_count > 1:
+        message += (
+            f"\n\n<i>Page {page + 1} of {page_count}"
+            f" · {len(listing.entries)} items</i>"
+        )
+
+    keyboard = []
+    if page_count > 1:
+        pager = []
+        if page > 0:
+            pager.append(
+                InlineKeyboardButton("⬅️ Prev", callback_data=f"ls:{page - 1}")
+            )
+        if page < page_count - 1:
+            pager.append(
+                InlineKeyboardButton("Next ➡️", callback_data=f"ls:{page + 1}")
+            )
+        keyboard.append(pager)
+    if listing.path != approved_directory:
+        keyboard.append(
+            [
+                InlineKeyboardButton("⬆️ Go Up", callback_data="cd:.."),
+                InlineKeyboardButton("🏠 Go to Root", callback_data="cd:/"),
+            ]
+        )
+    keyboard.append(
+        [
+            InlineKeyboardButton("🔄 Refresh", callback_data=f"ls:{page}:refresh"),
+            InlineKeyboardButton("📁 Projects", callback_data="action:show_projects"),
+        ]
+    )
+    return message, InlineKeyboardMarkup(keyboard)
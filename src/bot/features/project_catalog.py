@@ -0,0 +1,230 @@
+"""Catalog of the projects in the approved directory, kept current in place.
+
+``/projects``, the Projects button and ``/cd`` suggestions read projects
+(the visible top-level directories of ``APPROVED_DIRECTORY``) from a
+``ProjectCatalog`` instead of rescanning the directory on every request.
+Each project carries its metadata: whether it is a git repository, the
+language detected from its marker files and when it last changed.
+
+The catalog is built on first use and then polled every ``poll_interval``
+seconds in a worker thread. A poll stats the root and each project; only
+projects whose mtime changed are re-examined. Creating or removing a
+project changes the root's mtime, and adding ``.git`` or a marker file
+changes the project's own.
+"""
+
+import asyncio
+import difflib
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+from ..utils.html_format import escape_html
+
+logger = structlog.get_logger()
+
+# Seconds between polls of the approved directory
+DEFAULT_POLL_INTERVAL_SECONDS = 15.0
+
+# Top-level files that identify a project's main language, most specific first
+LANGUAGE_MARKERS = [
+    ("tsconfig.json", "TypeScript"),
+    ("package.json", "JavaScript"),
+    ("pyproject.toml", "Python"),
+    ("setup.py", "Python"),
+    ("requirements.txt", "Python"),
+    ("Cargo.toml", "Rust"),
+    ("go.mod", "Go"),
+    ("pom.xml", "Java"),
+    ("build.gradle", "Java"),
+    ("build.gradle.kts", "Kotlin"),
+    ("Gemfile", "Ruby"),
+    ("composer.json", "PHP"),
+    ("mix.exs", "Elixir"),
+    ("Package.swift", "Swift"),
+    ("pubspec.yaml", "Dart"),
+    ("CMakeLists.txt", "C/C++"),
+]
+
+
+@dataclass(frozen=True)
+class ProjectInfo:
+    """A top-level project directory and what is known about it."""
+
+    name: str
+    path: Path
+    mtime_ns: int
+    is_git_repo: bool = False
+    language: Optional[str] = None
+
+    @property
+    def modified_at(self) -> datetime:
+        """When the project directory last changed."""
+        return datetime.fromtimestamp(self.mtime_ns / 1e9, timezone.utc)
+
+
+class ProjectCatalog:
+    """Index of projects in a root directory, refreshed by mtime polling."""
+
+    def __init__(
+        self, root: Path, poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS
+    ):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._projects: Optional[Dict[str, ProjectInfo]] = None
+        self._sorted: List[ProjectInfo] = []
+        self._root_mtime_ns: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._poll_task: Optional["asyncio.Task[None]"] = None
+
+        # Metrics
+        self.scans = 0
+
+    async def list_projects(self) -> List[ProjectInfo]:
+        """All projects sorted by name; builds the index on first use."""
+        if self._projects is None:
+            await self.refresh()
+        return self._sorted
+
+    async def get(self, name: str) -> Optional[ProjectInfo]:
+        """A project by directory name."""
+        if self._projects is None:
+            await self.refresh()
+        return (self._projects or {}).get(name)
+
+    async def search(self, query: str, limit: int = 3) -> List[ProjectInfo]:
+        """Projects whose names best match query: prefix, substring, fuzzy."""
+        projects = await self.list_projects()
+        needle = query.strip().lower()
+        if not needle:
+            return []
+
+        by_name = {project.name.lower(): project for project in projects}
+        ranked = [name for name in by_name if name.startswith(needle)]
+        ranked += [name for name in by_name if needle in name and name not in ranked]
+        ranked += [
+            name
+            for name in difflib.get_close_matches(needle, by_name, n=limit, cutoff=0.6)
+            if name not in ranked
+        ]
+        return [by_name[name] for name in ranked[:limit]]
+
+    async def refresh(self) -> None:
+        """Bring the index up to date now, and start polling if enabled."""
+        async with self._lock:
+            previous = self._projects or {}
+            result = await asyncio.to_thread(
+                _rescan, self.root, self._root_mtime_ns, previous
+            )
+            if result is not None:
+                self._root_mtime_ns, self._projects = result
+                self._sorted = sorted(self._projects.values(), key=lambda p: p.name)
+                self.scans += 1
+                logger.debug("Project catalog updated", projects=len(self._projects))
+        self._start_polling()
+
+    def close(self) -> None:
+        """Stop polling."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+    def _start_polling(self) -> None:
+        """Start the poll loop once, if an interval is set."""
+        if self.poll_interval > 0 and self._poll_task is None:
+            self._poll_task = asyncio.create_task(self._poll())
+
+    async def _poll(self) -> None:
+        """Refresh the index every poll_interval seconds."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Project catalog poll failed", error=str(e))
+
+
+def _rescan(
+    root: Path, root_mtime_ns: Optional[int], previous: Dict[str, ProjectInfo]
+) -> Optional[Tuple[int, Dict[str, ProjectInfo]]]:
+    """Return (root mtime, projects), re-examining only changed projects.
+
+    Returns None when neither the root nor any project changed.
+    """
+    mtime_ns = os.stat(root).st_mtime_ns
+    if mtime_ns == root_mtime_ns:
+        names = list(previous)
+    else:
+        with os.scandir(root) as it:
+            names = [
+                entry.name
+                for entry in it
+                if not entry.name.startswith(".") and _is_dir(entry)
+            ]
+
+    projects: Dict[str, ProjectInfo] = {}
+    changed = mtime_ns != root_mtime_ns
+    for name in names:
+        path = root / name
+        try:
+            project_mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            changed = True
+            continue
+        known = previous.get(name)
+        if known is not None and known.mtime_ns == project_mtime_ns:
+            projects[name] = known
+        else:
+            projects[name] = _examine(name, path, project_mtime_ns)
+            changed = True
+    return (mtime_ns, projects) if changed else None
+
+
+def _is_dir(entry: "os.DirEntry[str]") -> bool:
+    """Whether a directory entry is (or links to) a directory."""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _examine(name: str, path: Path, mtime_ns: int) -> ProjectInfo:
+    """Read a project's metadata from its top-level entries."""
+    try:
+        with os.scandir(path) as it:
+            entries = {entry.name for entry in it}
+    except OSError:
+        entries = set()
+    language = next(
+        (language for marker, language in LANGUAGE_MARKERS if marker in entries),
+        None,
+    )
+    return ProjectInfo(
+        name=name,
+        path=path,
+        mtime_ns=mtime_ns,
+        is_git_repo=".git" in entries,
+        language=language,
+    )
+
+
+def get_project_catalog(bot_data: Dict[str, Any]) -> ProjectCatalog:
+    """The shared catalog from the feature registry, or an unpolled one."""
+    features = bot_data.get("features")
+    catalog = features.get_project_catalog() if features else None
+    return catalog or ProjectCatalog(
+        bot_data["settings"].approved_directory, poll_interval=0
+    )
+
+
+def format_project_line(project: ProjectInfo) -> str:
+    """One bullet of the project list, with language and git status."""
+    details = [detail for detail in (project.language,) if detail]
+    if project.is_git_repo:
+        details.append("git")
+    suffix = f" · {' · '.join(details)}" if details else ""
+    return f"• <code>{escape_html(project.name)}/</code>{suffix}"
@@ -11,11 +11,14 @@ from src.security.validators import SecurityValidator
 from src.storage.facade import Storage
 
 from .conversation_mode import ConversationEnhancer
+from .directory_listing import DirectoryLister
 from .file_handler import FileHandler
 from .git_integration import GitIntegration
 from .image_handler import ImageHandler
+from .project_catalog import ProjectCatalog
 from .quick_actions import QuickActionManager
 from .session_export import SessionExporter
+from .upload_staging import UploadStager
 
 logger = structlog.get_logger(__name__)
 
@@ -46,6 +49,14 @@ class FeatureRegistry:
             except Exception as e:
                 logger.error("Failed to initialize file handler", error=str(e))
 
+        # Upload staging - conditionally enabled, replaces inlined uploads
+        if self.config.enable_file_uploads and self.config.enable_upload_staging:
+            self.features["upload_staging"] = UploadStager(
+                security=self.security,
+                max_age_hours=self.config.session_timeout_hours,
+            )
+            logger.info("Upload staging feature enabled")
+
         # Git integration - conditionally enabled
         if self.config.enable_git_integration:
             try:
@@ -77,6 +88,14 @@ class FeatureRegistry:
         except Exception as e:
             logger.error("Failed to initialize image handler", error=str(e))
 
+        # Directory listings - always enabled, shared by commands and callbacks
+        self.features["directory_listing"] = DirectoryLister()
+
+        # Project catalog - always enabled, polled once first used
+        self.features["project_catalog"] = ProjectCatalog(
+            self.config.approved_directory
+        )
+
         # Conversation enhancements - skip in agentic mode
         if not self.config.agentic_mode:
             try:
@@ -102,6 +121,10 @@ class FeatureRegistry:
         """Get file handler feature"""
         return self.get_feature("file_handler")
 
+    def get_upload_stager(self) -> Optional[UploadStager]:
+        """Get upload staging feature"""
+        return self.get_feature("upload_staging")
+
     def get_git_integration(self) -> Optional[GitIntegration]:
         """Get git integration feature"""
         return self.get_feature("git")
@@ -122,6 +145,14 @@ class FeatureRegistry:
         """Get conversation enhancer feature"""
         return self.get_feature("conversation")
 
+    def get_directory_lister(self) -> Optional[DirectoryLister]:
+        """Get directory listing feature"""
+        return self.get_feature("directory_listing")
+
+    def get_project_catalog(self) -> Optional[ProjectCatalog]:
+        """Get project catalog feature"""
+        return self.get_feature("project_catalog")
+
     def get_enabled_features(self) -> Dict[str, Any]:
         """Get all enabled features"""
         return self.features.copy()
@@ -130,6 +161,11 @@ class FeatureRegistry:
         """Shutdown all features"""
         logger.info("Shutting down features")
 
+        # Stop polling the approved directory
+        catalog = self.get_project_catalog()
+        if catalog:
+            catalog.close()
+
         # Clear conversation contexts
         conversation = self.get_conversation_enhancer()
         if conversation:
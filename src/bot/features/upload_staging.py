@@ -0,0 +1,226 @@
+"""Stage uploaded files in the working directory instead of the prompt.
+
+With ``ENABLE_UPLOAD_STAGING`` an upload is streamed to
+``<working directory>/.uploads/<staging id>/<file name>`` and Claude gets
+a short prompt naming that path, so its Read tool loads only what it
+needs. Prompts, stored ``messages.prompt`` rows and resumed session
+history stay small.
+
+- A staging id is created per chat session and kept in ``user_data``.
+  Ending the session (``/new``, ``/end`` and their buttons) deletes the
+  session's staging directories.
+- Staging directories left by a restart or a session that expired are
+  removed once they are older than ``SESSION_TIMEOUT_HOURS``. This is
+  checked whenever a file is staged in the same ``.uploads`` directory.
+- The file name and target path are checked by ``SecurityValidator``.
+- Uploads larger than ``MAX_FILE_SIZE_BYTES`` are refused, by their
+  declared size before downloading and by the bytes read while saving.
+- ``.uploads`` holds a ``.gitignore`` so staged files stay out of git.
+"""
+
+import asyncio
+import shutil
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+import structlog
+from telegram import Document
+from telegram.ext import ContextTypes
+
+from src.security.validators import SecurityValidator
+from src.utils.constants import MAX_FILE_SIZE_BYTES
+
+from .upload_stream import UploadStream
+
+logger = structlog.get_logger()
+
+STAGING_DIRNAME = ".uploads"
+# user_data key holding the current session's staging id
+STAGING_ID_KEY = "upload_staging_id"
+
+
+@dataclass(frozen=True)
+class StagedUpload:
+    """A file staged for Claude to read."""
+
+    path: Path
+    relative_path: str
+    size: int
+
+    def prompt(self, caption: str) -> str:
+        """The prompt pointing Claude at the staged file."""
+        return (
+            f"{caption}\n\n"
+            f"The file `{self.path.name}` ({self.size} bytes) was uploaded to "
+            f"`{self.relative_path}`. Read it from there as needed."
+        )
+
+
+class UploadStager:
+    """Write uploads to per-session staging directories and clean them up."""
+
+    def __init__(
+        self,
+        security: SecurityValidator,
+        max_age_hours: float,
+        max_bytes: int = MAX_FILE_SIZE_BYTES,
+    ):
+        self.security = security
+        self.max_age = max_age_hours * 3600
+        self.max_bytes = max_bytes
+        # Staging id -> staging directories created for it
+        self._staged: Dict[str, Set[Path]] = defaultdict(set)
+
+    @staticmethod
+    def staging_id(user_data: Dict[str, Any]) -> str:
+        """The current session's staging id, created on first use."""
+        if not user_data.get(STAGING_ID_KEY):
+            user_data[STAGING_ID_KEY] = uuid.uuid4().hex[:12]
+        return user_data[STAGING_ID_KEY]
+
+    async def stage(
+        self,
+        upload: UploadStream,
+        file_name: str,
+        working_directory: Path,
+        staging_id: str,
+    ) -> StagedUpload:
+        """Stream an upload into the session's staging directory.
+
+        Raises ValueError if the name or target path is rejected, or if the
+        upload is larger than max_bytes; a partial file is removed.
+        """
+        valid, error = self.security.validate_filename(file_name)
+        if not valid:
+            raise ValueError(error)
+
+        relative = f"{STAGING_DIRNAME}/{staging_id}/{file_name.strip()}"
+        valid, target, error = self.security.validate_path(relative, working_directory)
+        if not valid or target is None:
+            raise ValueError(error or "Invalid staging path")
+
+        target = await asyncio.to_thread(self._prepare, target)
+        try:
+            await upload.save(target, self.max_bytes)
+        except BaseException:
+            target.unlink(missing_ok=True)
+            raise
+        self._staged[staging_id].add(target.parent)
+
+        logger.info(
+            "Staged upload",
+            path=str(target),
+            size=upload.bytes_read,
+            staging_id=staging_id,
+        )
+        return StagedUpload(
+            path=target,
+            relative_path=f"{STAGING_DIRNAME}/{staging_id}/{target.name}",
+            size=upload.bytes_read,
+        )
+
+    def _prepare(self, target: Path) -> Path:
+        """Create the staging directory and pick a free file name."""
+        staging_root = target.parent.parent
+        staging_root.mkdir(exist_ok=True)
+        gitignore = staging_root / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("*\n")
+        self._sweep(staging_root)
+        target.parent.mkdir(exist_ok=True)
+
+        candidate = target
+        counter = 1
+        while candidate.exists():
+            candidate = target.with_name(f"{target.stem}-{counter}{target.suffix}")
+            counter += 1
+        return candidate
+
+    def _sweep(self, staging_root: Path) -> None:
+        """Remove staging directories untouched for longer than max_age.
+
+        Directories of sessions staged since startup are kept.
+        """
+        cutoff = time.time() - self.max_age
+        live = set().union(*self._staged.values())
+        for directory in staging_root.iterdir():
+            if directory in live or not directory.is_dir():
+                continue
+            try:
+                expired = directory.stat().st_mtime < cutoff
+            except OSError:
+                continue
+            if expired:
+                shutil.rmtree(directory, ignore_errors=True)
+                logger.info("Removed expired staging directory", path=str(directory))
+
+    async def release(self, staging_id: str) -> int:
+        """Delete a session's staging directories; returns how many."""
+        directories = self._staged.pop(staging_id, set())
+        for directory in directories:
+            await asyncio.to_thread(shutil.rmtree, directory, True)
+        if directories:
+            logger.info(
+                "Released staged uploads",
+                staging_id=staging_id,
+                directories=len(directories),
+            )
+        return len(directories)
+
+
+def get_upload_stager(bot_data: Dict[str, Any]) -> Optional[UploadStager]:
+    """The stager from the feature registry, if staging is enabled."""
+    features = bot_data.get("features")
+    return features.get_upload_stager() if features else None
+
+
+async def stage_document(
+    document: Document,
+    caption: str,
+    context: ContextTypes.DEFAULT_TYPE,
+    approved_directory: Path,
+) -> Optional[str]:
+    """Stage an uploaded document and return a prompt naming it.
+
+    The document goes to the user's current directory, or
+    approved_directory if none is set. Returns None when staging is
+    disabled, the document is too large or staging fails, so the caller
+    inlines the file contents instead.
+    """
+    stager = get_upload_stager(context.bot_data)
+    if not stager:
+        return None
+    if document.file_size and document.file_size > stager.max_bytes:
+        logger.warning(
+            "Upload too large to stage, inlining file",
+            size=document.file_size,
+            max_bytes=stager.max_bytes,
+        )
+        return None
+
+    current_dir = context.user_data.get("current_directory", approved_directory)
+    try:
+        file = await document.get_file()
+        async with UploadStream(file) as upload:
+            staged = await stager.stage(
+                upload,
+                document.file_name,
+                current_dir,
+                stager.staging_id(context.user_data),
+            )
+    except Exception as e:
+        logger.warning("Upload staging failed, inlining file", error=str(e))
+        return None
+    return staged.prompt(caption)
+
+
+async def release_staged_uploads(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """End the current upload session, deleting its staged files."""
+    staging_id = context.user_data.pop(STAGING_ID_KEY, None)
+    stager = get_upload_stager(context.bot_data)
+    if staging_id and stager:
+        await stager.release(staging_id)
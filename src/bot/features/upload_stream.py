@@ -0,0 +1,146 @@
+"""Stream uploaded Telegram files in chunks instead of loading them whole.
+
+``File.download_as_bytearray()`` and ``download_to_drive()`` buffer the
+entire file in memory before anything looks at it. Uploads only contribute
+a bounded prompt, so ``UploadStream`` fetches the file in chunks and lets
+the caller stop early:
+
+- ``head()`` returns the first chunk for sniffing the file type
+- ``read_text()`` validates UTF-8 incrementally and stops once the prompt
+  budget is exceeded; invalid bytes raise ``UnicodeDecodeError`` as soon
+  as they are read
+- ``save()`` writes the file to disk chunk by chunk, for archives that
+  need random access, and can stop at a size cap
+
+Memory per upload is one chunk plus the prompt budget. Download errors
+are re-raised without the file URL, which contains the bot token.
+"""
+
+import asyncio
+import codecs
+from contextlib import aclosing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from telegram import File
+
+# Bytes fetched per read
+CHUNK_SIZE = 64 * 1024
+# Characters of an uploaded file included in a prompt
+UPLOAD_PROMPT_CHARS = 50_000
+# Seconds to wait for the file server
+DOWNLOAD_TIMEOUT_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class UploadText:
+    """Decoded start of an upload."""
+
+    text: str
+    truncated: bool
+    bytes_read: int
+
+
+async def _fetch(file: File, chunk_size: int) -> AsyncIterator[bytes]:
+    """Chunks of a file from the Bot API file server or a local server's disk."""
+    if not file.file_path:
+        raise RuntimeError("No file_path available for this file")
+
+    if urlsplit(file.file_path).scheme not in ("http", "https"):
+        # A local Bot API server returns a path on its own disk
+        with open(file.file_path, "rb") as source:
+            while chunk := await asyncio.to_thread(source.read, chunk_size):
+                yield chunk
+        return
+
+    try:
+        async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT_SECONDS) as client:
+            async with client.stream("GET", file.file_path) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(chunk_size):
+                    yield chunk
+    except httpx.HTTPStatusError as e:
+        # httpx messages include the file URL, which contains the bot token
+        raise RuntimeError(
+            f"File download failed: HTTP {e.response.status_code}"
+        ) from None
+    except httpx.HTTPError as e:
+        raise RuntimeError(f"File download failed: {type(e).__name__}") from None
+
+
+class UploadStream:
+    """Chunks of an uploaded file, fetched only as far as they are read."""
+
+    def __init__(self, file: File, chunk_size: int = CHUNK_SIZE):
+        self._source = _fetch(file, chunk_size)
+        self._head: Optional[bytes] = None
+        self.bytes_read = 0
+
+    async def __aenter__(self) -> "UploadStream":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop fetching and release the connection."""
+        await self._source.aclose()
+
+    async def _next(self) -> Optional[bytes]:
+        """The next chunk, or None at the end of the file."""
+        chunk = await anext(self._source, None)
+        if chunk is not None:
+            self.bytes_read += len(chunk)
+        return chunk
+
+    async def head(self) -> bytes:
+        """The first chunk, fetched once and replayed by chunks()."""
+        if self._head is None:
+            self._head = await self._next() or b""
+        return self._head
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Every chunk from the start of the file."""
+        head = await self.head()
+        if head:
+            yield head
+        while (chunk := await self._next()) is not None:
+            yield chunk
+
+    async def read_text(self, max_chars: int = UPLOAD_PROMPT_CHARS) -> UploadText:
+        """Decode up to max_chars characters, reading no further than needed.
+
+        Raises UnicodeDecodeError if the bytes read are not valid UTF-8.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        parts = []
+        length = 0
+        truncated = False
+        async with aclosing(self.chunks()) as chunks:
+            async for chunk in chunks:
+                text = decoder.decode(chunk)
+                parts.append(text)
+                length += len(text)
+                if length > max_chars:
+                    truncated = True
+                    break
+        if not truncated:
+            parts.append(decoder.decode(b"", final=True))
+        return UploadText("".join(parts)[:max_chars], truncated, self.bytes_read)
+
+    async def save(self, path: Path, max_bytes: Optional[int] = None) -> int:
+        """Write the whole file to path; returns its size.
+
+        Raises ValueError once more than max_bytes have been read, leaving
+        a partial file at path.
+        """
+        with open(path, "wb") as target:
+            async with aclosing(self.chunks()) as chunks:
+                async for chunk in chunks:
+                    if max_bytes is not None and self.bytes_read > max_bytes:
+                        raise ValueError(f"File exceeds {max_bytes} bytes")
+                    target.write(chunk)
+        return self.bytes_read
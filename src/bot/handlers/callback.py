@@ -8,6 +8,9 @@ from ...claude.facade import ClaudeIntegration
 from ...config.settings import Settings
 from ...security.audit import AuditLogger
 from ...security.validators import SecurityValidator
+from ..features.directory_listing import format_listing_page, get_directory_lister
+from ..features.project_catalog import format_project_line, get_project_catalog
+from ..features.upload_staging import release_staged_uploads
 from ..utils.html_format import escape_html
 
 logger = structlog.get_logger()
@@ -35,6 +38,7 @@ async def handle_callback_query(
         # Route to appropriate handler
         handlers = {
             "cd": handle_cd_callback,
+            "ls": handle_ls_callback,
             "action": handle_action_callback,
             "confirm": handle_confirm_callback,
             "quick": handle_quick_action_callback,
@@ -120,7 +124,8 @@ async def handle_cd_callback(
             new_path = resolved_path
 
         # Check if directory exists
-        if not new_path.exists() or not new_path.is_dir():
+        lister = get_directory_lister(context.bot_data)
+        if not await lister.is_directory(new_path):
             await query.edit_message_text(
                 f"❌ <b>Directory Not Found</b>\n\n"
                 f"The directory <code>{escape_html(project_name)}</code> no longer exists or is not accessible.",
@@ -267,14 +272,10 @@ async def _handle_show_projects_action(
     query, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
     """Handle show projects action."""
-    settings: Settings = context.bot_data["settings"]
-
     try:
         # Get directories in approved directory
-        projects = []
-        for item in sorted(settings.approved_directory.iterdir()):
-            if item.is_dir() and not item.name.startswith("."):
-                projects.append(item.name)
+        catalog = get_project_catalog(context.bot_data)
+        projects = await catalog.list_projects()
 
         if not projects:
             await query.edit_message_text(
@@ -291,7 +292,7 @@ async def _handle_show_projects_action(
             row = []
             for j in range(2):
                 if i + j < len(projects):
-                    project = projects[i + j]
+                    project = projects[i + j].name
                     row.append(
                         InlineKeyboardButton(
                             f"📁 {project}", callback_data=f"cd:{project}"
@@ -310,9 +311,7 @@ async def _handle_show_projects_action(
         )
 
         reply_markup = InlineKeyboardMarkup(keyboard)
-        project_list = "\n".join(
-            [f"• <code>{escape_html(project)}/</code>" for project in projects]
-        )
+        project_list = "\n".join(format_project_line(project) for project in projects)
 
         await query.edit_message_text(
             f"📁 <b>Available Projects</b>\n\n"
@@ -332,6 +331,7 @@ async def _handle_new_session_action(query, context: ContextTypes.DEFAULT_TYPE)
 
     # Clear session
     context.user_data["claude_session_id"] = None
+    await release_staged_uploads(context)
     context.user_data["session_started"] = True
 
     current_dir = context.user_data.get(
@@ -403,6 +403,7 @@ async def _handle_end_session_action(query, context: ContextTypes.DEFAULT_TYPE)
 
     # Clear session data
     context.user_data["claude_session_id"] = None
+    await release_staged_uploads(context)
     context.user_data["session_started"] = False
     context.user_data["last_message"] = None
 
@@ -624,7 +625,9 @@ async def _handle_status_action(query, context: ContextTypes.DEFAULT_TYPE) -> No
     )
 
 
-async def _handle_ls_action(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def _handle_ls_action(
+    query, context: ContextTypes.DEFAULT_TYPE, page: int = 0, refresh: bool = False
+) -> None:
     """Handle ls action."""
     settings: Settings = context.bot_data["settings"]
     current_dir = context.user_data.get(
@@ -632,64 +635,12 @@ async def _handle_ls_action(query, context: ContextTypes.DEFAULT_TYPE) -> None:
     )
 
     try:
-        # List directory contents (similar to /ls command)
-        items = []
-        directories = []
-        files = []
-
-        for item in sorted(current_dir.iterdir()):
-            if item.name.startswith("."):
-                continue
-
-            # Escape markdown special characters in filenames
-            safe_name = _escape_markdown(item.name)
-
-            if item.is_dir():
-                directories.append(f"📁 {safe_name}/")
-            else:
-                try:
-                    size = item.stat().st_size
-                    size_str = _format_file_size(size)
-                    files.append(f"📄 {safe_name} ({size_str})")
-                except OSError:
-                    files.append(f"📄 {safe_name}")
-
-        items = directories + files
-        relative_path = current_dir.relative_to(settings.approved_directory)
-
-        if not items:
-            message = f"📂 <code>{escape_html(str(relative_path))}/</code>\n\n<i>(empty directory)</i>"
-        else:
-            message = f"📂 <code>{escape_html(str(relative_path))}/</code>\n\n"
-            max_items = 30  # Limit for inline display
-            if len(items) > max_items:
-                shown_items = items[:max_items]
-                message += "\n".join(shown_items)
-                message += f"\n\n<i>... and {len(items) - max_items} more items</i>"
-            else:
-                message += "\n".join(items)
-
-        # Add buttons
-        keyboard = []
-        if current_dir != settings.approved_directory:
-            keyboard.append(
-                [
-                    InlineKeyboardButton("⬆️ Go Up", callback_data="cd:.."),
-                    InlineKeyboardButton("🏠 Root", callback_data="cd:/"),
-                ]
-            )
-
-        keyboard.append(
-            [
-                InlineKeyboardButton("🔄 Refresh", callback_data="action:refresh_ls"),
-                InlineKeyboardButton(
-                    "📋 Projects", callback_data="action:show_projects"
-                ),
-            ]
+        lister = get_directory_lister(context.bot_data)
+        listing = await lister.list_directory(current_dir, refresh=refresh)
+        message, reply_markup = format_listing_page(
+            listing, settings.approved_directory, page
         )
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await query.edit_message_text(
             message, parse_mode="HTML", reply_markup=reply_markup
         )
@@ -698,6 +649,19 @@ async def _handle_ls_action(query, context: ContextTypes.DEFAULT_TYPE) -> None:
         await query.edit_message_text(f"❌ Error listing directory: {str(e)}")
 
 
+async def handle_ls_callback(
+    query, param: str, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Handle listing pages: ``ls:<page>`` or ``ls:<page>:refresh``."""
+    page, _, option = (param or "0").partition(":")
+    await _handle_ls_action(
+        query,
+        context,
+        page=int(page) if page.isdigit() else 0,
+        refresh=option == "refresh",
+    )
+
+
 async def _handle_start_coding_action(
     query, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
@@ -758,7 +722,7 @@ async def _handle_refresh_status_action(
 
 async def _handle_refresh_ls_action(query, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle refresh ls action."""
-    await _handle_ls_action(query, context)
+    await _handle_ls_action(query, context, refresh=True)
 
 
 async def _handle_export_action(query, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -942,6 +906,7 @@ async def handle_conversation_callback(
 
         # Clear session data
         context.user_data["claude_session_id"] = None
+        await release_staged_uploads(context)
         context.user_data["session_started"] = False
 
         current_dir = context.user_data.get(
@@ -1205,20 +1170,3 @@ async def handle_export_callback(
             f"❌ <b>Export Failed</b>\n\n{escape_html(str(e))}",
             parse_mode="HTML",
         )
-
-
-def _format_file_size(size: int) -> str:
-    """Format file size in human-readable format."""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size < 1024:
-            return f"{size:.1f}{unit}" if unit != "B" else f"{size}B"
-        size /= 1024
-    return f"{size:.1f}TB"
-
-
-def _escape_markdown(text: str) -> str:
-    """Escape HTML-special characters in text for Telegram.
-
-    Legacy name kept for compatibility with callers; actually escapes HTML.
-    """
-    return escape_html(text)
@@ -8,6 +8,9 @@ from ...claude.facade import ClaudeIntegration
 from ...config.settings import Settings
 from ...security.audit import AuditLogger
 from ...security.validators import SecurityValidator
+from ..features.directory_listing import format_listing_page, get_directory_lister
+from ..features.project_catalog import format_project_line, get_project_catalog
+from ..features.upload_staging import release_staged_uploads
 from ..utils.html_format import escape_html
 
 logger = structlog.get_logger()
@@ -126,6 +129,7 @@ async def new_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 
     # Clear existing session data - this is the explicit way to reset context
     context.user_data["claude_session_id"] = None
+    await release_staged_uploads(context)
     context.user_data["session_started"] = True
 
     cleared_info = ""
@@ -230,7 +234,7 @@ async def continue_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             await status_msg.delete()
 
             # Format and send Claude's response
-            from ..utils.formatting import ResponseFormatter
+            from ..utils.formatting import ResponseFormatter, reply_formatted
 
             formatter = ResponseFormatter(settings)
             formatted_messages = formatter.format_claude_response(
@@ -238,10 +242,8 @@ async def continue_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             )
 
             for msg in formatted_messages:
-                await update.message.reply_text(
-                    msg.text,
-                    parse_mode=msg.parse_mode,
-                    reply_markup=msg.reply_markup,
+                await reply_formatted(
+                    update.message, msg, reply_markup=msg.reply_markup
                 )
 
             # Log successful continue
@@ -323,70 +325,12 @@ async def list_files(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     )
 
     try:
-        # List directory contents
-        items = []
-        directories = []
-        files = []
-
-        for item in sorted(current_dir.iterdir()):
-            # Skip hidden files (starting with .)
-            if item.name.startswith("."):
-                continue
-
-            # Escape HTML special characters in filenames
-            safe_name = _escape_markdown(item.name)
-
-            if item.is_dir():
-                directories.append(f"📁 {safe_name}/")
-            else:
-                # Get file size
-                try:
-                    size = item.stat().st_size
-                    size_str = _format_file_size(size)
-                    files.append(f"📄 {safe_name} ({size_str})")
-                except OSError:
-                    files.append(f"📄 {safe_name}")
-
-        # Combine directories first, then files
-        items = directories + files
-
-        # Format response
-        relative_path = current_dir.relative_to(settings.approved_directory)
-        if not items:
-            message = f"📂 <code>{relative_path}/</code>\n\n<i>(empty directory)</i>"
-        else:
-            message = f"📂 <code>{relative_path}/</code>\n\n"
-
-            # Limit items shown to prevent message being too long
-            max_items = 50
-            if len(items) > max_items:
-                shown_items = items[:max_items]
-                message += "\n".join(shown_items)
-                message += f"\n\n<i>... and {len(items) - max_items} more items</i>"
-            else:
-                message += "\n".join(items)
-
-        # Add navigation buttons if not at root
-        keyboard = []
-        if current_dir != settings.approved_directory:
-            keyboard.append(
-                [
-                    InlineKeyboardButton("⬆️ Go Up", callback_data="cd:.."),
-                    InlineKeyboardButton("🏠 Go to Root", callback_data="cd:/"),
-                ]
-            )
-
-        keyboard.append(
-            [
-                InlineKeyboardButton("🔄 Refresh", callback_data="action:refresh_ls"),
-                InlineKeyboardButton(
-                    "📁 Projects", callback_data="action:show_projects"
-                ),
-            ]
+        lister = get_directory_lister(context.bot_data)
+        listing = await lister.list_directory(current_dir)
+        message, reply_markup = format_listing_page(
+            listing, settings.approved_directory
         )
 
-        reply_markup = InlineKeyboardMarkup(keyboard) if keyboard else None
-
         await update.message.reply_text(
             message, parse_mode="HTML", reply_markup=reply_markup
         )
@@ -466,8 +410,25 @@ async def change_directory(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
         # Check if directory exists and is actually a directory
         if not resolved_path.exists():
+            # Offer projects with a similar name
+            catalog = get_project_catalog(context.bot_data)
+            matches = await catalog.search(target_path)
+            reply_markup = None
+            if matches:
+                reply_markup = InlineKeyboardMarkup(
+                    [
+                        [
+                            InlineKeyboardButton(
+                                f"📁 {project.name}", callback_data=f"cd:{project.name}"
+                            )
+                        ]
+                        for project in matches
+                    ]
+                )
             await update.message.reply_text(
                 f"❌ <b>Directory Not Found</b>\n\n<code>{target_path}</code> does not exist."
+                + ("\n\nDid you mean one of these projects?" if matches else ""),
+                reply_markup=reply_markup,
             )
             return
 
@@ -558,14 +519,10 @@ async def print_working_directory(
 
 async def show_projects(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /projects command."""
-    settings: Settings = context.bot_data["settings"]
-
     try:
         # Get directories in approved directory (these are "projects")
-        projects = []
-        for item in sorted(settings.approved_directory.iterdir()):
-            if item.is_dir() and not item.name.startswith("."):
-                projects.append(item.name)
+        catalog = get_project_catalog(context.bot_data)
+        projects = await catalog.list_projects()
 
         if not projects:
             await update.message.reply_text(
@@ -581,7 +538,7 @@ async def show_projects(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             row = []
             for j in range(2):
                 if i + j < len(projects):
-                    project = projects[i + j]
+                    project = projects[i + j].name
                     row.append(
                         InlineKeyboardButton(
                             f"📁 {project}", callback_data=f"cd:{project}"
@@ -601,7 +558,7 @@ async def show_projects(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
         reply_markup = InlineKeyboardMarkup(keyboard)
 
-        project_list = "\n".join([f"• <code>{project}/</code>" for project in projects])
+        project_list = "\n".join(format_project_line(project) for project in projects)
 
         await update.message.reply_text(
             f"📁 <b>Available Projects</b>\n\n"
@@ -643,12 +600,11 @@ async def session_status(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         except Exception:
             usage_info = "💰 Usage: <i>Unable to retrieve</i>\n"
 
+    claude_integration: ClaudeIntegration = context.bot_data.get("claude_integration")
+
     # Check if there's a resumable session from the database
     resumable_info = ""
     if not claude_session_id:
-        claude_integration: ClaudeIntegration = context.bot_data.get(
-            "claude_integration"
-        )
         if claude_integration:
             existing = await claude_integration._find_resumable_session(
                 user_id, current_dir
@@ -669,6 +625,14 @@ async def session_status(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         f"🕐 Last Update: {update.message.date.strftime('%H:%M:%S UTC')}",
     ]
 
+    if claude_integration:
+        paused = claude_integration.usage_limiter.describe()
+        if paused:
+            status_lines.append(f"⏸ {paused}")
+        timeouts = claude_integration.describe_timeouts()
+        if timeouts:
+            status_lines.append(f"⏱ {timeouts}")
+
     if claude_session_id:
         status_lines.append(f"🆔 Session ID: <code>{claude_session_id[:8]}...</code>")
     elif resumable_info:
@@ -792,6 +756,7 @@ async def end_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 
     # Clear session data
     context.user_data["claude_session_id"] = None
+    await release_staged_uploads(context)
     context.user_data["session_started"] = False
     context.user_data["last_message"] = None
 
@@ -978,20 +943,3 @@ async def git_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     except Exception as e:
         await update.message.reply_text(f"❌ <b>Git Error</b>\n\n{str(e)}")
         logger.error("Error in git_command", error=str(e), user_id=user_id)
-
-
-def _format_file_size(size: int) -> str:
-    """Format file size in human-readable format."""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size < 1024:
-            return f"{size:.1f}{unit}" if unit != "B" else f"{size}B"
-        size /= 1024
-    return f"{size:.1f}TB"
-
-
-def _escape_markdown(text: str) -> str:
-    """Escape HTML-special characters in text for Telegram.
-
-    Legacy name kept for compatibility with callers; actually escapes HTML.
-    """
-    return escape_html(text)
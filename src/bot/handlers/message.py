@@ -12,6 +12,8 @@ from ...config.settings import Settings
 from ...security.audit import AuditLogger
 from ...security.rate_limiter import RateLimiter
 from ...security.validators import SecurityValidator
+from ..features.upload_staging import stage_document
+from ..features.upload_stream import UploadStream
 from ..utils.html_format import escape_html
 
 logger = structlog.get_logger()
@@ -110,6 +112,16 @@ def _format_error_message(error_str: str) -> str:
             f"• Use simpler requests\n"
             f"• Check your current usage with /status"
         )
+    elif "timed out" in error_str.lower():
+        # Watchdog timeouts name the phase that expired
+        return (
+            f"⏰ <b>Request Timeout</b>\n\n"
+            f"{escape_html(error_str)}.\n\n"
+            f"<b>What you can do:</b>\n"
+            f"• Try breaking down your request into smaller parts\n"
+            f"• Use simpler commands\n"
+            f"• Try again in a moment"
+        )
     elif "timeout" in error_str.lower():
         return (
             f"⏰ <b>Request Timeout</b>\n\n"
@@ -265,11 +277,13 @@ async def handle_text_message(
         await progress_msg.delete()
 
         # Send formatted responses (may be multiple messages)
+        from ..utils.formatting import reply_formatted
+
         for i, message in enumerate(formatted_messages):
             try:
-                await update.message.reply_text(
-                    message.text,
-                    parse_mode=message.parse_mode,
+                await reply_formatted(
+                    update.message,
+                    message,
                     reply_markup=message.reply_markup,
                     reply_to_message_id=update.message.message_id if i == 0 else None,
                 )
@@ -285,8 +299,10 @@ async def handle_text_message(
                     message_index=i,
                 )
                 try:
-                    await update.message.reply_text(
-                        message.text,
+                    await reply_formatted(
+                        update.message,
+                        message,
+                        parse_mode=None,
                         reply_markup=message.reply_markup,
                         reply_to_message_id=(
                             update.message.message_id if i == 0 else None
@@ -451,11 +467,19 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             parse_mode="HTML",
         )
 
+        # Stage the upload for Claude to read, if enabled
+        prompt = await stage_document(
+            document,
+            update.message.caption or "Please review this file:",
+            context,
+            settings.approved_directory,
+        )
+
         # Check if enhanced file handler is available
         features = context.bot_data.get("features")
         file_handler = features.get_file_handler() if features else None
 
-        if file_handler:
+        if file_handler and prompt is None:
             # Use enhanced file handler
             try:
                 processed_file = await file_handler.handle_document_upload(
@@ -478,22 +502,17 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 )
                 file_handler = None  # Fall back to basic handling
 
-        if not file_handler:
+        if prompt is None:
             # Fall back to basic file handling
             file = await document.get_file()
-            file_bytes = await file.download_as_bytearray()
 
-            # Try to decode as text
+            # Stream and decode as text, up to 50K characters
             try:
-                content = file_bytes.decode("utf-8")
-
-                # Check content length
-                max_content_length = 50000  # 50KB of text
-                if len(content) > max_content_length:
-                    content = (
-                        content[:max_content_length]
-                        + "\n... (file truncated for processing)"
-                    )
+                async with UploadStream(file) as upload:
+                    upload_text = await upload.read_text()
+                content = upload_text.text
+                if upload_text.truncated:
+                    content += "\n... (file truncated for processing)"
 
                 # Create prompt with file content
                 caption = update.message.caption or "Please review this file:"
@@ -555,7 +574,7 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             )
 
             # Format and send response
-            from ..utils.formatting import ResponseFormatter
+            from ..utils.formatting import ResponseFormatter, reply_formatted
 
             formatter = ResponseFormatter(settings)
             formatted_messages = formatter.format_claude_response(
@@ -567,9 +586,9 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
             # Send responses
             for i, message in enumerate(formatted_messages):
-                await update.message.reply_text(
-                    message.text,
-                    parse_mode=message.parse_mode,
+                await reply_formatted(
+                    update.message,
+                    message,
                     reply_markup=message.reply_markup,
                     reply_to_message_id=(update.message.message_id if i == 0 else None),
                 )
@@ -677,7 +696,7 @@ async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
                 context.user_data["claude_session_id"] = claude_response.session_id
 
                 # Format and send response
-                from ..utils.formatting import ResponseFormatter
+                from ..utils.formatting import ResponseFormatter, reply_formatted
 
                 formatter = ResponseFormatter(settings)
                 formatted_messages = formatter.format_claude_response(
@@ -689,9 +708,9 @@ async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
                 # Send responses
                 for i, message in enumerate(formatted_messages):
-                    await update.message.reply_text(
-                        message.text,
-                        parse_mode=message.parse_mode,
+                    await reply_formatted(
+                        update.message,
+                        message,
                         reply_markup=message.reply_markup,
                         reply_to_message_id=(
                             update.message.message_id if i == 0 else None
@@ -849,58 +868,39 @@ async def _generate_placeholder_response(
 def _update_working_directory_from_claude_response(
     claude_response, context, settings, user_id
 ):
-    """Update the working directory based on Claude's response content."""
-    import re
+    """Follow the working directory Claude's shell ended the run in.
+
+    Replays ``cd`` commands from the run's Bash tool calls, starting from the
+    ``cwd`` the CLI reported at startup.
+    """
     from pathlib import Path
 
-    # Look for directory changes in Claude's response
-    # This searches for common patterns that indicate directory changes
-    patterns = [
-        r"(?:^|\n).*?cd\s+([^\s\n]+)",  # cd command
-        r"(?:^|\n).*?Changed directory to:?\s*([^\s\n]+)",  # explicit directory change
-        r"(?:^|\n).*?Current directory:?\s*([^\s\n]+)",  # current directory indication
-        r"(?:^|\n).*?Working directory:?\s*([^\s\n]+)",  # working directory indication
-    ]
+    from ...claude.working_directory import final_working_directory
 
-    content = claude_response.content.lower()
     current_dir = context.user_data.get(
         "current_directory", settings.approved_directory
     )
+    start_dir = Path(claude_response.cwd) if claude_response.cwd else current_dir
 
-    for pattern in patterns:
-        matches = re.findall(pattern, content, re.MULTILINE | re.IGNORECASE)
-        for match in matches:
-            try:
-                # Clean up the path
-                new_path = match.strip().strip("\"'`")
-
-                # Handle relative paths
-                if new_path.startswith("./") or new_path.startswith("../"):
-                    new_path = (current_dir / new_path).resolve()
-                elif not new_path.startswith("/"):
-                    # Relative path without ./
-                    new_path = (current_dir / new_path).resolve()
-                else:
-                    # Absolute path
-                    new_path = Path(new_path).resolve()
-
-                # Validate that the new path is within the approved directory
-                if (
-                    new_path.is_relative_to(settings.approved_directory)
-                    and new_path.exists()
-                ):
-                    context.user_data["current_directory"] = new_path
-                    logger.info(
-                        "Updated working directory from Claude response",
-                        old_dir=str(current_dir),
-                        new_dir=str(new_path),
-                        user_id=user_id,
-                    )
-                    return  # Take the first valid match
+    new_path = final_working_directory(start_dir, claude_response.tools_used)
+    if new_path is None or new_path == current_dir:
+        return
 
-            except (ValueError, OSError) as e:
-                # Invalid path, skip this match
-                logger.debug(
-                    "Invalid path in Claude response", path=match, error=str(e)
-                )
-                continue
+    try:
+        new_path = new_path.resolve()
+        if not (
+            new_path.is_relative_to(settings.approved_directory) and new_path.is_dir()
+        ):
+            return
+    except (ValueError, OSError) as e:
+        logger.debug("Invalid working directory", path=str(new_path), error=str(e))
+        return
+
+    if new_path != current_dir:
+        context.user_data["current_directory"] = new_path
+        logger.info(
+            "Updated working directory from Claude tool calls",
+            old_dir=str(current_dir),
+            new_dir=str(new_path),
+            user_id=user_id,
+        )
@@ -4,10 +4,104 @@ from typing import Any, Callable, Dict
 
 import structlog
 
+from ...security.scanner import PatternScanner, ScanRule
 from ..utils.html_format import escape_html
 
 logger = structlog.get_logger()
 
+# Message content rules, scanned in a single pass per message
+MESSAGE_RULES = [
+    # Command injection
+    *(
+        ScanRule(pattern, category="command_injection")
+        for pattern in [
+            r";\s*rm\s+",
+            r";\s*del\s+",
+            r";\s*format\s+",
+            r"`[^`]*`",
+            r"\$\([^)]*\)",
+            r"&&\s*rm\s+",
+            r"\|\s*mail\s+",
+            r">\s*/dev/",
+            r"curl\s+.*\|\s*sh",
+            r"wget\s+.*\|\s*sh",
+            r"exec\s*\(",
+            r"eval\s*\(",
+        ]
+    ),
+    # Path traversal (case-sensitive)
+    *(
+        ScanRule(pattern, category="path_traversal", ignore_case=False)
+        for pattern in [
+            r"\.\./.*",
+            r"~\/.*",
+            r"\/etc\/.*",
+            r"\/var\/.*",
+            r"\/usr\/.*",
+            r"\/sys\/.*",
+            r"\/proc\/.*",
+        ]
+    ),
+    # Suspicious URLs or domains
+    *(
+        ScanRule(pattern, category="suspicious_url")
+        for pattern in [
+            r"https?://[^/]*\.ru/",
+            r"https?://[^/]*\.tk/",
+            r"https?://[^/]*\.ml/",
+            r"https?://bit\.ly/",
+            r"https?://tinyurl\.com/",
+            r"javascript:",
+            r"data:text/html",
+        ]
+    ),
+]
+
+# category -> (audit violation type, severity, audit details, result message),
+# in the order categories are reported
+MESSAGE_VIOLATIONS = {
+    "command_injection": (
+        "command_injection_attempt",
+        "high",
+        "Dangerous pattern detected",
+        "Command injection attempt",
+    ),
+    "path_traversal": (
+        "path_traversal_attempt",
+        "high",
+        "Path traversal pattern detected",
+        "Path traversal attempt",
+    ),
+    "suspicious_url": (
+        "suspicious_url",
+        "medium",
+        "Suspicious URL pattern detected",
+        "Suspicious URL detected",
+    ),
+}
+
+# Commands that might indicate reconnaissance
+RECON_PATTERNS = [
+    r"ls\s+/",
+    r"find\s+/",
+    r"locate\s+",
+    r"which\s+",
+    r"whereis\s+",
+    r"ps\s+",
+    r"netstat\s+",
+    r"lsof\s+",
+    r"env\s*$",
+    r"printenv\s*$",
+    r"whoami\s*$",
+    r"id\s*$",
+    r"uname\s+",
+    r"cat\s+/etc/",
+    r"cat\s+/proc/",
+]
+
+MESSAGE_SCANNER = PatternScanner(MESSAGE_RULES)
+RECON_SCANNER = PatternScanner.from_patterns(RECON_PATTERNS, category="recon")
+
 
 async def security_middleware(
     handler: Callable, event: Any, data: Dict[str, Any]
@@ -87,98 +181,34 @@ async def validate_message_content(
     text: str, security_validator: Any, user_id: int, audit_logger: Any
 ) -> tuple[bool, str]:
     """Validate message text content for security threats."""
+    # One pass finds every matching rule; report the first category hit
+    matched: Dict[str, ScanRule] = {}
+    for rule in MESSAGE_SCANNER.scan(text):
+        matched.setdefault(rule.category, rule)
 
-    # Check for command injection patterns
-    dangerous_patterns = [
-        r";\s*rm\s+",
-        r";\s*del\s+",
-        r";\s*format\s+",
-        r"`[^`]*`",
-        r"\$\([^)]*\)",
-        r"&&\s*rm\s+",
-        r"\|\s*mail\s+",
-        r">\s*/dev/",
-        r"curl\s+.*\|\s*sh",
-        r"wget\s+.*\|\s*sh",
-        r"exec\s*\(",
-        r"eval\s*\(",
-    ]
-
-    import re
-
-    for pattern in dangerous_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            if audit_logger:
-                await audit_logger.log_security_violation(
-                    user_id=user_id,
-                    violation_type="command_injection_attempt",
-                    details=f"Dangerous pattern detected: {pattern}",
-                    severity="high",
-                    attempted_action="message_send",
-                )
+    for category, violation in MESSAGE_VIOLATIONS.items():
+        rule = matched.get(category)
+        if rule is None:
+            continue
+        violation_type, severity, details, result = violation
 
-            logger.warning(
-                "Command injection attempt detected",
-                user_id=user_id,
-                pattern=pattern,
-                text_preview=text[:100],
-            )
-            return False, "Command injection attempt"
-
-    # Check for path traversal attempts
-    path_traversal_patterns = [
-        r"\.\./.*",
-        r"~\/.*",
-        r"\/etc\/.*",
-        r"\/var\/.*",
-        r"\/usr\/.*",
-        r"\/sys\/.*",
-        r"\/proc\/.*",
-    ]
-
-    for pattern in path_traversal_patterns:
-        if re.search(pattern, text):
-            if audit_logger:
-                await audit_logger.log_security_violation(
-                    user_id=user_id,
-                    violation_type="path_traversal_attempt",
-                    details=f"Path traversal pattern detected: {pattern}",
-                    severity="high",
-                    attempted_action="message_send",
-                )
-
-            logger.warning(
-                "Path traversal attempt detected",
+        if audit_logger:
+            await audit_logger.log_security_violation(
                 user_id=user_id,
-                pattern=pattern,
-                text_preview=text[:100],
+                violation_type=violation_type,
+                details=f"{details}: {rule.pattern}",
+                severity=severity,
+                attempted_action="message_send",
             )
-            return False, "Path traversal attempt"
-
-    # Check for suspicious URLs or domains
-    suspicious_patterns = [
-        r"https?://[^/]*\.ru/",
-        r"https?://[^/]*\.tk/",
-        r"https?://[^/]*\.ml/",
-        r"https?://bit\.ly/",
-        r"https?://tinyurl\.com/",
-        r"javascript:",
-        r"data:text/html",
-    ]
-
-    for pattern in suspicious_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            if audit_logger:
-                await audit_logger.log_security_violation(
-                    user_id=user_id,
-                    violation_type="suspicious_url",
-                    details=f"Suspicious URL pattern detected: {pattern}",
-                    severity="medium",
-                    attempted_action="message_send",
-                )
 
-            logger.warning("Suspicious URL detected", user_id=user_id, pattern=pattern)
-            return False, "Suspicious URL detected"
+        logger.warning(
+            "Security violation in message",
+            user_id=user_id,
+            violation_type=violation_type,
+            pattern=rule.pattern,
+            text_preview=text[:100],
+        )
+        return False, result
 
     # Sanitize content using security validator
     sanitized = security_validator.sanitize_command_input(text)
@@ -336,30 +366,7 @@ async def threat_detection_middleware(
     message = event.effective_message
     text = message.text if message else ""
 
-    # Suspicious commands that might indicate reconnaissance
-    recon_patterns = [
-        r"ls\s+/",
-        r"find\s+/",
-        r"locate\s+",
-        r"which\s+",
-        r"whereis\s+",
-        r"ps\s+",
-        r"netstat\s+",
-        r"lsof\s+",
-        r"env\s*$",
-        r"printenv\s*$",
-        r"whoami\s*$",
-        r"id\s*$",
-        r"uname\s+",
-        r"cat\s+/etc/",
-        r"cat\s+/proc/",
-    ]
-
-    import re
-
-    recon_attempts = sum(
-        1 for pattern in recon_patterns if re.search(pattern, text, re.IGNORECASE)
-    )
+    recon_attempts = len(RECON_SCANNER.scan(text)) if text else 0
 
     if recon_attempts > 0:
         user_data["recon_attempts"] = (
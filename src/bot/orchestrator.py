@@ -6,10 +6,12 @@ classic mode, delegates to existing full-featured handlers.
 """
 
 import asyncio
-from typing import Any, Callable, Dict, Optional
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, Dict, List, Optional
 
 import structlog
-from telegram import BotCommand, Update
+from telegram import BotCommand, Message, Update
+from telegram.constants import ReactionEmoji
 from telegram.ext import (
     Application,
     CallbackQueryHandler,
@@ -21,6 +23,10 @@ from telegram.ext import (
 
 from ..claude.exceptions import ClaudeToolValidationError
 from ..config.settings import Settings
+from .debounce import MessageDebouncer
+from .features.upload_staging import release_staged_uploads, stage_document
+from .features.upload_stream import UploadStream
+from .update_processor import UserOrderedUpdateProcessor
 from .utils.html_format import escape_html
 
 logger = structlog.get_logger()
@@ -32,20 +38,18 @@ class MessageOrchestrator:
     def __init__(self, settings: Settings, deps: Dict[str, Any]):
         self.settings = settings
         self.deps = deps
-
-    def _inject_deps(self, handler: Callable) -> Callable:  # type: ignore[type-arg]
-        """Wrap handler to inject dependencies into context.bot_data."""
-
-        async def wrapped(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-            for key, value in self.deps.items():
-                context.bot_data[key] = value
-            context.bot_data["settings"] = self.settings
-            await handler(update, context)
-
-        return wrapped
+        self.debouncer: Optional[MessageDebouncer[Message]] = (
+            MessageDebouncer(settings.message_debounce_ms / 1000)
+            if settings.agentic_mode and settings.message_debounce_ms > 0
+            else None
+        )
 
     def register_handlers(self, app: Application) -> None:
-        """Register handlers based on mode."""
+        """Register handlers based on mode.
+
+        Handlers read their dependencies from ``context.bot_data``, which
+        ClaudeCodeBot populates once at startup.
+        """
         if self.settings.agentic_mode:
             self._register_agentic_handlers(app)
         else:
@@ -59,35 +63,33 @@ class MessageOrchestrator:
             ("new", self.agentic_new),
             ("status", self.agentic_status),
         ]:
-            app.add_handler(CommandHandler(cmd, self._inject_deps(handler)))
+            app.add_handler(CommandHandler(cmd, handler))
 
         # Text messages -> Claude
         app.add_handler(
             MessageHandler(
                 filters.TEXT & ~filters.COMMAND,
-                self._inject_deps(self.agentic_text),
+                self.agentic_text,
             ),
             group=10,
         )
 
         # File uploads -> Claude
         app.add_handler(
-            MessageHandler(
-                filters.Document.ALL, self._inject_deps(self.agentic_document)
-            ),
+            MessageHandler(filters.Document.ALL, self.agentic_document),
             group=10,
         )
 
         # Photo uploads -> Claude
         app.add_handler(
-            MessageHandler(filters.PHOTO, self._inject_deps(self.agentic_photo)),
+            MessageHandler(filters.PHOTO, self.agentic_photo),
             group=10,
         )
 
         # Only cd: callbacks (for project selection), scoped by pattern
         app.add_handler(
             CallbackQueryHandler(
-                self._inject_deps(self._agentic_callback),
+                self._agentic_callback,
                 pattern=r"^cd:",
             )
         )
@@ -115,28 +117,24 @@ class MessageOrchestrator:
         ]
 
         for cmd, handler in handlers:
-            app.add_handler(CommandHandler(cmd, self._inject_deps(handler)))
+            app.add_handler(CommandHandler(cmd, handler))
 
         app.add_handler(
             MessageHandler(
                 filters.TEXT & ~filters.COMMAND,
-                self._inject_deps(message.handle_text_message),
+                message.handle_text_message,
             ),
             group=10,
         )
         app.add_handler(
-            MessageHandler(
-                filters.Document.ALL, self._inject_deps(message.handle_document)
-            ),
+            MessageHandler(filters.Document.ALL, message.handle_document),
             group=10,
         )
         app.add_handler(
-            MessageHandler(filters.PHOTO, self._inject_deps(message.handle_photo)),
+            MessageHandler(filters.PHOTO, message.handle_photo),
             group=10,
         )
-        app.add_handler(
-            CallbackQueryHandler(self._inject_deps(callback.handle_callback_query))
-        )
+        app.add_handler(CallbackQueryHandler(callback.handle_callback_query))
 
         logger.info("Classic handlers registered (13 commands + full handler set)")
 
@@ -191,6 +189,7 @@ class MessageOrchestrator:
     ) -> None:
         """Reset session, one-line confirmation."""
         context.user_data["claude_session_id"] = None
+        await release_staged_uploads(context)
         context.user_data["session_started"] = True
 
         await update.message.reply_text("Session reset. What's next?")
@@ -219,8 +218,19 @@ class MessageOrchestrator:
             except Exception:
                 pass
 
+        # Usage limit and timeout state
+        limit_str = ""
+        claude_integration = context.bot_data.get("claude_integration")
+        if claude_integration:
+            paused = claude_integration.usage_limiter.describe()
+            if paused:
+                limit_str = f"\n⏸ {paused}"
+            timeouts = claude_integration.describe_timeouts()
+            if timeouts:
+                limit_str += f"\n⏱ {timeouts}"
+
         await update.message.reply_text(
-            f"📂 {dir_display} · Session: {session_status}{cost_str}"
+            f"📂 {dir_display} · Session: {session_status}{cost_str}{limit_str}"
         )
 
     async def agentic_text(
@@ -244,9 +254,85 @@ class MessageOrchestrator:
                 await update.message.reply_text(f"⏱️ {limit_message}")
                 return
 
-        await update.message.chat.send_action("typing")
+        if self.debouncer:
+            await self._agentic_text_debounced(update, context)
+        else:
+            await self._run_agentic_turn(update, context, update.message, message_text)
 
-        progress_msg = await update.message.reply_text("Working...")
+    async def _agentic_text_debounced(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Merge the user's rapid messages in a chat and run them as one turn."""
+        user_id = update.effective_user.id
+        key = (update.effective_chat.id, user_id)
+        batch = await self.debouncer.submit(key, update.message)
+        if batch is None:
+            # Picked up by the turn already gathering or running for this user
+            await self._acknowledge_merged(update.message)
+            return
+
+        try:
+            while batch:
+                prompt = "\n\n".join(message.text for message in batch)
+                async with self._user_turn(context, user_id):
+                    await self._run_agentic_turn(update, context, batch[-1], prompt)
+                batch = await self.debouncer.next_batch(key)
+        finally:
+            # Normally a no-op: next_batch already gave up leadership
+            dropped = self.debouncer.release(key)
+            if dropped:
+                logger.warning(
+                    "Dropped merged messages after failed turn",
+                    chat_id=key[0],
+                    user_id=user_id,
+                    count=len(dropped),
+                )
+                await self._report_dropped(dropped)
+
+    async def _acknowledge_merged(self, message: Message) -> None:
+        """React to a message that was merged into another turn."""
+        try:
+            await message.set_reaction(ReactionEmoji.EYES)
+        except Exception as e:
+            logger.debug("Failed to set reaction", error=str(e))
+
+    async def _report_dropped(self, messages: List[Message]) -> None:
+        """Tell the user that messages queued behind a failed turn were not run."""
+        what = "This message was" if len(messages) == 1 else "These messages were"
+        try:
+            await messages[-1].reply_text(
+                f"❌ {what} not processed because the previous request failed. "
+                "Please send again."
+            )
+        except Exception as e:
+            logger.debug("Failed to report dropped messages", error=str(e))
+
+    @staticmethod
+    def _user_turn(
+        context: ContextTypes.DEFAULT_TYPE, user_id: int
+    ) -> AsyncContextManager[None]:
+        """Hold the user's update lock when text bypasses it."""
+        processor = context.application.update_processor
+        if (
+            isinstance(processor, UserOrderedUpdateProcessor)
+            and processor.bypass_text_messages
+        ):
+            return processor.user_lock(user_id)
+        return nullcontext()
+
+    async def _run_agentic_turn(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        reply_to: Message,
+        prompt: str,
+    ) -> None:
+        """Run one Claude turn for prompt and reply to reply_to."""
+        user_id = update.effective_user.id
+
+        await reply_to.chat.send_action("typing")
+
+        progress_msg = await reply_to.reply_text("Working...")
 
         claude_integration = context.bot_data.get("claude_integration")
         if not claude_integration:
@@ -263,7 +349,7 @@ class MessageOrchestrator:
         success = True
         try:
             claude_response = await claude_integration.run_command(
-                prompt=message_text,
+                prompt=prompt,
                 working_directory=current_dir,
                 user_id=user_id,
                 session_id=session_id,
@@ -285,7 +371,7 @@ class MessageOrchestrator:
                     await storage.save_claude_interaction(
                         user_id=user_id,
                         session_id=claude_response.session_id,
-                        prompt=message_text,
+                        prompt=prompt,
                         response=claude_response,
                         ip_address=None,
                     )
@@ -319,13 +405,15 @@ class MessageOrchestrator:
 
         await progress_msg.delete()
 
+        from .utils.formatting import reply_formatted
+
         for i, message in enumerate(formatted_messages):
             try:
-                await update.message.reply_text(
-                    message.text,
-                    parse_mode=message.parse_mode,
+                await reply_formatted(
+                    reply_to,
+                    message,
                     reply_markup=None,  # No keyboards in agentic mode
-                    reply_to_message_id=(update.message.message_id if i == 0 else None),
+                    reply_to_message_id=(reply_to.message_id if i == 0 else None),
                 )
                 if i < len(formatted_messages) - 1:
                     await asyncio.sleep(0.5)
@@ -336,19 +424,17 @@ class MessageOrchestrator:
                     message_index=i,
                 )
                 try:
-                    await update.message.reply_text(
-                        message.text,
+                    await reply_formatted(
+                        reply_to,
+                        message,
+                        parse_mode=None,
                         reply_markup=None,
-                        reply_to_message_id=(
-                            update.message.message_id if i == 0 else None
-                        ),
+                        reply_to_message_id=(reply_to.message_id if i == 0 else None),
                     )
                 except Exception:
-                    await update.message.reply_text(
+                    await reply_to.reply_text(
                         "Failed to send response. Please try again.",
-                        reply_to_message_id=(
-                            update.message.message_id if i == 0 else None
-                        ),
+                        reply_to_message_id=(reply_to.message_id if i == 0 else None),
                     )
 
         # Audit log
@@ -357,7 +443,7 @@ class MessageOrchestrator:
             await audit_logger.log_command(
                 user_id=user_id,
                 command="text_message",
-                args=[message_text[:100]],
+                args=[prompt[:100]],
                 success=success,
             )
 
@@ -392,30 +478,31 @@ class MessageOrchestrator:
 
         progress_msg = await update.message.reply_text("Working...")
 
-        # Try enhanced file handler, fall back to basic
+        # Stage for Claude to read if enabled, else try enhanced handler, then basic
+        caption = update.message.caption or "Please review this file:"
+        prompt = await stage_document(
+            document, caption, context, self.settings.approved_directory
+        )
         features = context.bot_data.get("features")
         file_handler = features.get_file_handler() if features else None
-        prompt: Optional[str] = None
 
-        if file_handler:
+        if file_handler and prompt is None:
             try:
                 processed_file = await file_handler.handle_document_upload(
-                    document,
-                    user_id,
-                    update.message.caption or "Please review this file:",
+                    document, user_id, caption
                 )
                 prompt = processed_file.prompt
             except Exception:
                 file_handler = None
 
-        if not file_handler:
+        if prompt is None:
             file = await document.get_file()
-            file_bytes = await file.download_as_bytearray()
             try:
-                content = file_bytes.decode("utf-8")
-                if len(content) > 50000:
-                    content = content[:50000] + "\n... (truncated)"
-                caption = update.message.caption or "Please review this file:"
+                async with UploadStream(file) as upload:
+                    upload_text = await upload.read_text()
+                content = upload_text.text
+                if upload_text.truncated:
+                    content += "\n... (truncated)"
                 prompt = (
                     f"{caption}\n\n**File:** `{document.file_name}`\n\n"
                     f"```\n{content}\n```"
@@ -454,7 +541,7 @@ class MessageOrchestrator:
                 claude_response, context, self.settings, user_id
             )
 
-            from .utils.formatting import ResponseFormatter
+            from .utils.formatting import ResponseFormatter, reply_formatted
 
             formatter = ResponseFormatter(self.settings)
             formatted_messages = formatter.format_claude_response(
@@ -464,9 +551,9 @@ class MessageOrchestrator:
             await progress_msg.delete()
 
             for i, message in enumerate(formatted_messages):
-                await update.message.reply_text(
-                    message.text,
-                    parse_mode=message.parse_mode,
+                await reply_formatted(
+                    update.message,
+                    message,
                     reply_markup=None,
                     reply_to_message_id=(update.message.message_id if i == 0 else None),
                 )
@@ -522,7 +609,7 @@ class MessageOrchestrator:
             )
             context.user_data["claude_session_id"] = claude_response.session_id
 
-            from .utils.formatting import ResponseFormatter
+            from .utils.formatting import ResponseFormatter, reply_formatted
 
             formatter = ResponseFormatter(self.settings)
             formatted_messages = formatter.format_claude_response(
@@ -532,9 +619,9 @@ class MessageOrchestrator:
             await progress_msg.delete()
 
             for i, message in enumerate(formatted_messages):
-                await update.message.reply_text(
-                    message.text,
-                    parse_mode=message.parse_mode,
+                await reply_formatted(
+                    update.message,
+                    message,
                     reply_markup=None,
                     reply_to_message_id=(update.message.message_id if i == 0 else None),
                 )
@@ -0,0 +1,259 @@
+"""Concurrent update processing with per-user ordering.
+
+python-telegram-bot processes updates one at a time unless an update
+processor is configured. This processor lets updates from different users
+run concurrently (up to a global cap) while serialising each user's updates
+behind an async lock, so a long Claude run for one user does not hold up
+anyone else and a user's own messages are still handled in order.
+
+A user's updates queue on the user's lock *before* taking one of the
+``max_concurrent_updates`` processing slots, so a user with a backlog
+behind a long Claude run holds at most one slot and never starves other
+users. python-telegram-bot's own semaphore, which is taken before
+``do_process_update``, is therefore set to ``UNBOUNDED_UPDATES`` and the
+real cap is a separate semaphore taken inside ``user_lock``.
+
+Read-only commands such as /status skip the lock so they answer
+immediately even while that user's previous request is still running.
+With ``bypass_text_messages`` plain text skips it too, without a slot;
+the message debouncer then takes the lock and a slot through
+``user_lock`` when it runs a merged turn.
+
+While updates are coming in, ``get_stats()`` (including a histogram of
+lock waits) is logged as one "Update processor stats" line every
+``stats_interval`` seconds.
+"""
+
+import asyncio
+import bisect
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+)
+
+import structlog
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = structlog.get_logger()
+
+# Commands that only read state and may run alongside the user's other updates
+DEFAULT_BYPASS_COMMANDS = frozenset({"start", "help", "status", "pwd"})
+
+# Limit given to python-telegram-bot's semaphore, which is taken before
+# updates reach the per-user lock; the real cap is applied after the lock
+UNBOUNDED_UPDATES = 2**31 - 1
+
+# Waits longer than this are logged at info level
+SLOW_LOCK_WAIT_SECONDS = 1.0
+
+# Upper bounds of the lock wait histogram buckets, in seconds
+LOCK_WAIT_BUCKETS = (0.01, 0.1, 1.0, 10.0, 60.0)
+
+# Seconds between stats log lines
+STATS_LOG_INTERVAL_SECONDS = 300.0
+
+
+class UserOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Process updates concurrently, one at a time per user."""
+
+    def __init__(
+        self,
+        max_concurrent_updates: int,
+        bypass_commands: Optional[Iterable[str]] = None,
+        bypass_text_messages: bool = False,
+        stats_interval: float = STATS_LOG_INTERVAL_SECONDS,
+    ):
+        if max_concurrent_updates < 1:
+            raise ValueError("max_concurrent_updates must be a positive integer")
+        # The base class sizes its semaphore from max_concurrent_updates
+        self._max_updates = UNBOUNDED_UPDATES
+        super().__init__(UNBOUNDED_UPDATES)
+        self._max_updates = max_concurrent_updates
+        self._slots = asyncio.Semaphore(max_concurrent_updates)
+        self._running = 0
+        self.bypass_text_messages = bypass_text_messages
+        self.stats_interval = stats_interval
+        self.bypass_commands: FrozenSet[str] = (
+            frozenset(bypass_commands)
+            if bypass_commands is not None
+            else DEFAULT_BYPASS_COMMANDS
+        )
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._lock_users: Dict[int, int] = {}
+        self._stats_task: Optional["asyncio.Task[None]"] = None
+
+        # Metrics
+        self.processed = 0
+        self.bypassed = 0
+        self.lock_waits = 0
+        self.total_lock_wait_seconds = 0.0
+        self.max_lock_wait_seconds = 0.0
+        # One count per LOCK_WAIT_BUCKETS bound, plus one for longer waits
+        self.lock_wait_counts: List[int] = [0] * (len(LOCK_WAIT_BUCKETS) + 1)
+
+    @property
+    def max_concurrent_updates(self) -> int:
+        """The maximum number of updates processed at once."""
+        return self._max_updates
+
+    @property
+    def current_concurrent_updates(self) -> int:
+        """The number of updates holding a processing slot."""
+        return self._running
+
+    async def initialize(self) -> None:
+        """Start logging stats; locks are created on demand."""
+        if self.stats_interval > 0 and self._stats_task is None:
+            self._stats_task = asyncio.create_task(self._log_stats())
+
+    async def shutdown(self) -> None:
+        """Stop logging stats and drop per-user locks."""
+        if self._stats_task:
+            self._stats_task.cancel()
+            try:
+                await self._stats_task
+            except asyncio.CancelledError:
+                pass
+            self._stats_task = None
+        self._locks.clear()
+        self._lock_users.clear()
+
+    async def _log_stats(self) -> None:
+        """Log stats every stats_interval seconds while updates arrive."""
+        logged = self.processed
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            if self.processed != logged:
+                logged = self.processed
+                logger.info("Update processor stats", **self.get_stats())
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any]
+    ) -> None:
+        """Run the update under its user's lock unless it may bypass it."""
+        self.processed += 1
+        key = self._lock_key(update)
+        if key is None:
+            async with self._slot():
+                await coroutine
+            return
+
+        bypass = self._bypass(update)
+        if bypass:
+            self.bypassed += 1
+        if bypass == "text":
+            # Only gathers the debounce batch; the turn takes user_lock
+            await coroutine
+        elif bypass:
+            async with self._slot():
+                await coroutine
+        else:
+            async with self.user_lock(key):
+                await coroutine
+
+    @asynccontextmanager
+    async def user_lock(self, key: int) -> AsyncIterator[None]:
+        """Hold the lock that orders a user's updates, then a processing slot."""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+
+        try:
+            start = time.monotonic()
+            async with lock:
+                self._record_wait(key, time.monotonic() - start)
+                async with self._slot():
+                    yield
+        finally:
+            # Forget the lock once nobody holds or waits for it
+            remaining = self._lock_users[key] - 1
+            if remaining:
+                self._lock_users[key] = remaining
+            else:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold one of the max_concurrent_updates processing slots."""
+        async with self._slots:
+            self._running += 1
+            try:
+                yield
+            finally:
+                self._running -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return processing and lock wait metrics."""
+        return {
+            "max_concurrent_updates": self.max_concurrent_updates,
+            "current_concurrent_updates": self.current_concurrent_updates,
+            "processed": self.processed,
+            "bypassed": self.bypassed,
+            "active_user_locks": len(self._locks),
+            "lock_waits": self.lock_waits,
+            "total_lock_wait_seconds": self.total_lock_wait_seconds,
+            "max_lock_wait_seconds": self.max_lock_wait_seconds,
+            "avg_lock_wait_seconds": (
+                self.total_lock_wait_seconds / self.lock_waits
+                if self.lock_waits
+                else 0.0
+            ),
+            "lock_wait_histogram": self.lock_wait_histogram(),
+        }
+
+    def lock_wait_histogram(self) -> Dict[str, int]:
+        """Lock waits counted per bucket, e.g. {"<=0.01s": 40, ">60s": 0}."""
+        labels = [f"<={bound:g}s" for bound in LOCK_WAIT_BUCKETS]
+        labels.append(f">{LOCK_WAIT_BUCKETS[-1]:g}s")
+        return dict(zip(labels, self.lock_wait_counts))
+
+    def _record_wait(self, key: int, waited: float) -> None:
+        """Update lock wait metrics."""
+        self.lock_waits += 1
+        self.total_lock_wait_seconds += waited
+        self.max_lock_wait_seconds = max(self.max_lock_wait_seconds, waited)
+        self.lock_wait_counts[bisect.bisect_left(LOCK_WAIT_BUCKETS, waited)] += 1
+        if waited >= SLOW_LOCK_WAIT_SECONDS:
+            logger.info(
+                "Update waited for user lock",
+                user_id=key,
+                wait_seconds=round(waited, 3),
+            )
+
+    @staticmethod
+    def _lock_key(update: object) -> Optional[int]:
+        """Serialise by user, falling back to chat for user-less updates."""
+        if not isinstance(update, Update):
+            return None
+        if update.effective_user:
+            return update.effective_user.id
+        if update.effective_chat:
+            return update.effective_chat.id
+        return None
+
+    def _bypass(self, update: object) -> Optional[str]:
+        """How the update skips the per-user lock: "command", "text" or None."""
+        message = update.effective_message if isinstance(update, Update) else None
+        text = message.text if message else None
+        if not text:
+            return None
+        if not text.startswith("/"):
+            return "text" if self.bypass_text_messages else None
+        parts = text[1:].split(maxsplit=1)
+        if not parts:
+            return None
+        # "/status@my_bot args" -> "status"
+        command = parts[0].split("@", 1)[0]
+        return "command" if command.lower() in self.bypass_commands else None
@@ -1,10 +1,11 @@
 """Format bot responses for optimal display."""
 
+import io
 import re
 from dataclasses import dataclass
 from typing import Any, List, Optional
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, InputFile, Message
 
 from ...config.settings import Settings
 from .html_format import escape_html, markdown_to_telegram_html
@@ -17,12 +18,33 @@ class FormattedMessage:
     text: str
     parse_mode: str = "HTML"
     reply_markup: Optional[InlineKeyboardMarkup] = None
+    # Attachment sent with text as its caption
+    document: Optional[bytes] = None
+    filename: Optional[str] = None
 
     def __len__(self) -> int:
         """Return length of message text."""
         return len(self.text)
 
 
+async def reply_formatted(
+    reply_to: Message, message: FormattedMessage, **kwargs: Any
+) -> Message:
+    """Send a formatted message as a reply, with its document if it has one.
+
+    Keyword arguments are passed to the Bot API call; parse_mode defaults to
+    the message's own.
+    """
+    kwargs.setdefault("parse_mode", message.parse_mode)
+    if message.document is not None:
+        return await reply_to.reply_document(
+            InputFile(io.BytesIO(message.document), filename=message.filename),
+            caption=message.text,
+            **kwargs,
+        )
+    return await reply_to.reply_text(message.text, **kwargs)
+
+
 class ResponseFormatter:
     """Format Claude responses for Telegram display."""
 
@@ -31,14 +53,37 @@ class ResponseFormatter:
         self.settings = settings
         self.max_message_length = 4000  # Telegram limit is 4096, leave some buffer
         self.max_code_block_length = 3000  # Max length for code blocks
+        self.max_summary_length = 600  # Captions are limited to 1024
 
     def format_claude_response(
         self, text: str, context: Optional[dict] = None
     ) -> List[FormattedMessage]:
         """Enhanced formatting with context awareness and semantic chunking."""
-        # Clean and prepare text
-        text = self._clean_text(text)
+        # Long responses go out as one document instead of many messages
+        markdown = text.strip()
+        threshold = self.settings.response_document_threshold_chars
+        if threshold and len(markdown) > threshold:
+            messages = [self._format_as_document(markdown)]
+        else:
+            messages = self._format_as_messages(self._clean_text(text), context)
+            max_messages = self.settings.response_document_max_messages
+            if max_messages and len(messages) > max_messages:
+                messages = [self._format_as_document(markdown)]
+
+        # Add context-aware quick actions to the last message
+        if messages and self.settings.enable_quick_actions:
+            messages[-1].reply_markup = self._get_contextual_keyboard(context)
+
+        return (
+            messages
+            if messages
+            else [FormattedMessage("<i>(No content to display)</i>")]
+        )
 
+    def _format_as_messages(
+        self, text: str, context: Optional[dict]
+    ) -> List[FormattedMessage]:
+        """Split cleaned text into messages that fit Telegram's limit."""
         # Check if we need semantic chunking (for complex content)
         if self._should_use_semantic_chunking(text):
             # Use enhanced semantic chunking for complex content
@@ -47,19 +92,29 @@ class ResponseFormatter:
             for chunk in chunks:
                 formatted = self._format_chunk(chunk)
                 messages.extend(formatted)
-        else:
-            # Use original simple formatting for basic content
-            text = self._format_code_blocks(text)
-            messages = self._split_message(text)
+            return messages
 
-        # Add context-aware quick actions to the last message
-        if messages and self.settings.enable_quick_actions:
-            messages[-1].reply_markup = self._get_contextual_keyboard(context)
+        # Use original simple formatting for basic content
+        text = self._format_code_blocks(text)
+        return self._split_message(text)
 
-        return (
-            messages
-            if messages
-            else [FormattedMessage("<i>(No content to display)</i>")]
+    def _format_as_document(self, text: str) -> FormattedMessage:
+        """Summarize a long markdown response and attach it as a file."""
+        summary = ""
+        for paragraph in re.split(r"\n\s*\n", text):
+            paragraph = paragraph.strip()
+            if paragraph and not paragraph.startswith("```"):
+                summary = paragraph
+                break
+        if len(summary) > self.max_summary_length:
+            cut = summary.rfind(" ", 0, self.max_summary_length)
+            summary = summary[: cut if cut > 0 else self.max_summary_length] + "…"
+
+        caption = f"📎 <i>Full response attached ({len(text):,} characters)</i>"
+        if summary:
+            caption = f"{markdown_to_telegram_html(summary)}\n\n{caption}"
+        return FormattedMessage(
+            caption, document=text.encode("utf-8"), filename="response.md"
         )
 
     def _should_use_semantic_chunking(self, text: str) -> bool:
@@ -6,7 +6,8 @@ Claude's output which contains underscores, asterisks, brackets, etc.
 """
 
 import re
-from typing import List, Tuple
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Union
 
 
 def escape_html(text: str) -> str:
@@ -18,87 +19,348 @@ def escape_html(text: str) -> str:
     return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
 
+_FENCE = re.compile(r"```(?P<lang>\w+)?\n(?P<code>[\s\S]*?)```")
+_CODE = re.compile(r"`(?P<code>[^`\n]+)`")
+_HEADER = re.compile(r"#{1,6}(\s+)")
+_WORD = re.compile(r"\w")
+_LINK_MARK = re.compile(r"[\[\]]")
+
+
+@dataclass
+class _Html:
+    """Already rendered HTML, such as a code span."""
+
+    html: str
+
+
+@dataclass
+class _Span:
+    """A tag wrapped around inline content."""
+
+    tag: str
+    children: List["_Node"] = field(default_factory=list)
+    href: Optional[str] = None
+
+
+_Node = Union[str, _Html, _Span]
+
+# Stands for the character next to an embedded node: like the placeholder
+# characters of a code span or the markup of a tag, it is neither a space
+# nor a word character.
+_OPAQUE = "\x00"
+
+
 def markdown_to_telegram_html(text: str) -> str:
     """Convert Claude's markdown output to Telegram-compatible HTML.
 
     Telegram supports a narrow HTML subset: <b>, <i>, <code>, <pre>,
     <a href>, <s>, <u>. This function converts common markdown patterns
-    to that subset while preserving code blocks verbatim.
-
-    Order of operations:
-    1. Extract fenced code blocks -> placeholders
-    2. Extract inline code -> placeholders
-    3. HTML-escape remaining text
-    4. Convert bold (**text** / __text__)
-    5. Convert italic (*text*, _text_ with word boundaries)
-    6. Convert links [text](url)
-    7. Convert headers (# Header -> <b>Header</b>)
-    8. Convert strikethrough (~~text~~)
-    9. Restore placeholders
+    to that subset while preserving code blocks verbatim:
+
+    - fenced code blocks -> <pre><code>, inline code -> <code>
+    - bold (**text** / __text__), headers (# Header) -> <b>
+    - italic (*text*, _text_ with word boundaries) -> <i>
+    - bold italic (***text*** / ___text___) -> <b><i>
+    - links [text](url) -> <a href>, strikethrough (~~text~~) -> <s>
+
+    This is not a single-pass tokenizer. Code is cut out first and kept as
+    single nodes. Each line then gets one left-to-right scan per delimiter,
+    in the order ***, ___, **, __, *, _, links, ~~. A scan pairs each
+    opener with the nearest valid closer, and spans found by earlier scans
+    are single nodes for later ones. Tags therefore always nest, and every
+    scan is linear in the length of the line.
     """
-    placeholders: List[Tuple[str, str]] = []
-    placeholder_counter = 0
-
-    def _make_placeholder(html_content: str) -> str:
-        nonlocal placeholder_counter
-        key = f"\x00PH{placeholder_counter}\x00"
-        placeholder_counter += 1
-        placeholders.append((key, html_content))
-        return key
-
-    # --- 1. Extract fenced code blocks ---
-    def _replace_fenced(m: re.Match) -> str:  # type: ignore[type-arg]
-        lang = m.group(1) or ""
-        code = m.group(2)
-        escaped_code = escape_html(code)
+    parts: List[str] = []
+    for line in _split_lines(_extract_code(text)):
+        nodes = _header(line)
+        for scan in _SCANS:
+            nodes = scan(nodes)
+        parts.append(_render(nodes))
+    return "\n".join(parts)
+
+
+def _extract_code(text: str) -> List[_Node]:
+    """Split text into plain text and rendered fenced and inline code."""
+    nodes: List[_Node] = []
+    pos = 0
+    for m in _FENCE.finditer(text):
+        nodes.extend(_extract_inline_code(text[pos : m.start()]))
+        code = escape_html(m.group("code"))
+        lang = m.group("lang")
         if lang:
-            html = f'<pre><code class="language-{escape_html(lang)}">{escaped_code}</code></pre>'
+            html = (
+                f'<pre><code class="language-{escape_html(lang)}">'
+                f"{code}</code></pre>"
+            )
+        else:
+            html = f"<pre><code>{code}</code></pre>"
+        nodes.append(_Html(html))
+        pos = m.end()
+    nodes.extend(_extract_inline_code(text[pos:]))
+    return nodes
+
+
+def _extract_inline_code(text: str) -> List[_Node]:
+    """Split text into plain text and rendered inline code."""
+    nodes: List[_Node] = []
+    pos = 0
+    for m in _CODE.finditer(text):
+        nodes.append(text[pos : m.start()])
+        nodes.append(_Html(f"<code>{escape_html(m.group('code'))}</code>"))
+        pos = m.end()
+    nodes.append(text[pos:])
+    return nodes
+
+
+def _split_lines(nodes: List[_Node]) -> List[List[_Node]]:
+    """Split nodes at the newlines of their text; code blocks stay whole."""
+    lines: List[List[_Node]] = [[]]
+    for node in nodes:
+        if not isinstance(node, str):
+            lines[-1].append(node)
+            continue
+        first, *rest = node.split("\n")
+        lines[-1].append(first)
+        lines.extend([piece] for piece in rest)
+    return [[node for node in line if node != ""] for line in lines]
+
+
+def _header(line: List[_Node]) -> List[_Node]:
+    """Wrap the rest of a line starting with 1-6 '#' and a space in <b>."""
+    if not line or not isinstance(line[0], str):
+        return line
+    m = _HEADER.match(line[0])
+    if not m:
+        return line
+    content = [line[0][m.end() :], *line[1:]]
+    if content == [""]:
+        # The header text is at least one character, even a space
+        if len(m.group(1)) < 2:
+            return line
+        content = [m.group(1)[-1]]
+    return [_Span("b", [node for node in content if node != ""])]
+
+
+def _merge_text(nodes: List[_Node]) -> List[_Node]:
+    """Join adjacent text nodes and drop empty ones."""
+    merged: List[_Node] = []
+    run: List[str] = []
+    for node in nodes:
+        if isinstance(node, str):
+            if node:
+                run.append(node)
+            continue
+        if run:
+            merged.append(run[0] if len(run) == 1 else "".join(run))
+            run = []
+        merged.append(node)
+    if run:
+        merged.append(run[0] if len(run) == 1 else "".join(run))
+    return merged
+
+
+def _char_before(nodes: List[_Node], index: int, text: str, pos: int) -> str:
+    """The character before text[pos], where text is nodes[index]."""
+    if pos > 0:
+        return text[pos - 1]
+    if index == 0:
+        return ""
+    prev = nodes[index - 1]
+    return prev[-1] if isinstance(prev, str) else _OPAQUE
+
+
+def _char_after(nodes: List[_Node], index: int, text: str, pos: int) -> str:
+    """The character at text[pos], where text is nodes[index]."""
+    if pos < len(text):
+        return text[pos]
+    if index + 1 == len(nodes):
+        return ""
+    after = nodes[index + 1]
+    return after[0] if isinstance(after, str) else _OPAQUE
+
+
+def _is_word(char: str) -> bool:
+    return bool(char) and _WORD.match(char) is not None
+
+
+def _is_space(char: str) -> bool:
+    # The end of a line counts as a space
+    return not char or char.isspace()
+
+
+@dataclass(frozen=True)
+class _Delimiter:
+    """A symmetric delimiter such as ** and where it may open or close."""
+
+    marker: str
+    tag: str
+    # Tag nested inside tag, as <i> in <b><i> for ***
+    inner_tag: Optional[str] = None
+    can_open: Callable[[str, str], bool] = lambda before, after: True
+    can_close: Callable[[str, str], bool] = lambda before, after: True
+
+    def __call__(self, nodes: List[_Node]) -> List[_Node]:
+        """Pair the markers in nodes and in the spans already found."""
+        if not _descend(nodes, self, self.marker):
+            return nodes
+        out: List[_Node] = []
+        # Index in out of the pending opener, kept there as literal text
+        opener: Optional[int] = None
+        size = len(self.marker)
+        for index, node in enumerate(nodes):
+            if not isinstance(node, str):
+                out.append(node)
+                continue
+            emitted = 0
+            pos = node.find(self.marker)
+            while pos >= 0:
+                before = _char_before(nodes, index, node, pos)
+                after = _char_after(nodes, index, node, pos + size)
+                if opener is None:
+                    if self.can_open(before, after):
+                        out.extend([node[emitted:pos], self.marker])
+                        opener = len(out) - 1
+                        emitted = pos + size
+                        pos = node.find(self.marker, emitted)
+                        continue
+                elif (pos > emitted or len(out) > opener + 1) and self.can_close(
+                    before, after
+                ):
+                    # The nearest valid closer ends the span
+                    out.append(node[emitted:pos])
+                    children = _merge_text(out[opener + 1 :])
+                    if self.inner_tag:
+                        children = [_Span(self.inner_tag, children)]
+                    span = _Span(self.tag, children)
+                    del out[opener:]
+                    out.append(span)
+                    opener = None
+                    emitted = pos + size
+                    pos = node.find(self.marker, emitted)
+                    continue
+                # Not a delimiter here; its first character is plain text
+                pos = node.find(self.marker, pos + 1)
+            out.append(node[emitted:])
+        return _merge_text(out)
+
+
+def _links(nodes: List[_Node]) -> List[_Node]:
+    """Turn [text](url) into links; the text ends at the first ']'."""
+    if not _descend(nodes, _links, "]"):
+        return nodes
+    out: List[_Node] = []
+    opener: Optional[int] = None
+    for node in nodes:
+        if not isinstance(node, str):
+            if _has_text(node, "]"):
+                # Link text never contains ']', even inside other markup
+                opener = None
+            out.append(node)
+            continue
+        emitted = 0
+        # Position of the next ')', found once per stretch of text
+        paren = -1
+        for m in _LINK_MARK.finditer(node):
+            pos = m.start()
+            if pos < emitted:
+                # Inside the URL of the previous link
+                continue
+            if m.group() == "[":
+                if opener is None:
+                    out.extend([node[emitted:pos], "["])
+                    opener = len(out) - 1
+                    emitted = pos + 1
+                continue
+            if opener is None:
+                continue
+            if paren < pos + 2 and paren != len(node):
+                paren = node.find(")", pos + 2)
+                if paren < 0:
+                    paren = len(node)
+            has_text = pos > emitted or len(out) > opener + 1
+            if (
+                has_text
+                and node.startswith("(", pos + 1)
+                and pos + 2 < paren < len(node)
+            ):
+                out.append(node[emitted:pos])
+                span = _Span("a", _merge_text(out[opener + 1 :]), node[pos + 2 : paren])
+                del out[opener:]
+                out.append(span)
+                emitted = paren + 1
+            opener = None
+        out.append(node[emitted:])
+    return _merge_text(out)
+
+
+def _has_text(node: _Node, char: str) -> bool:
+    """Whether the plain text of a node contains char."""
+    if isinstance(node, str):
+        return char in node
+    if isinstance(node, _Html):
+        return False
+    return any(_has_text(child, char) for child in node.children)
+
+
+def _descend(
+    nodes: List[_Node], scan: Callable[[List[_Node]], List[_Node]], marker: str
+) -> bool:
+    """Apply a scan inside the spans found by earlier scans.
+
+    Returns whether the text of nodes itself contains marker, i.e. whether
+    this level needs scanning too.
+    """
+    found = False
+    for node in nodes:
+        if isinstance(node, _Span):
+            node.children = scan(node.children)
+        elif isinstance(node, str) and marker in node:
+            found = True
+    return found
+
+
+def _star_opens(before: str, after: str) -> bool:
+    return not _is_space(after)
+
+
+def _star_closes(before: str, after: str) -> bool:
+    return not _is_space(before)
+
+
+def _underscore_opens(before: str, after: str) -> bool:
+    return not _is_word(before) and not _is_space(after)
+
+
+def _underscore_closes(before: str, after: str) -> bool:
+    return not _is_space(before) and not _is_word(after)
+
+
+_SCANS: List[Callable[[List[_Node]], List[_Node]]] = [
+    _Delimiter("***", "b", "i", can_open=_star_opens, can_close=_star_closes),
+    _Delimiter(
+        "___", "b", "i", can_open=_underscore_opens, can_close=_underscore_closes
+    ),
+    _Delimiter("**", "b"),
+    _Delimiter("__", "b"),
+    _Delimiter("*", "i", can_open=_star_opens, can_close=_star_closes),
+    _Delimiter("_", "i", can_open=_underscore_opens, can_close=_underscore_closes),
+    _links,
+    _Delimiter("~~", "s"),
+]
+
+
+def _render(nodes: List[_Node]) -> str:
+    """Render nodes as Telegram HTML, escaping plain text."""
+    parts: List[str] = []
+    for node in nodes:
+        if isinstance(node, str):
+            parts.append(escape_html(node))
+        elif isinstance(node, _Html):
+            parts.append(node.html)
+        elif node.href is not None:
+            parts.append(
+                f'<a href="{escape_html(node.href)}">{_render(node.children)}</a>'
+            )
         else:
-            html = f"<pre><code>{escaped_code}</code></pre>"
-        return _make_placeholder(html)
-
-    text = re.sub(
-        r"```(\w+)?\n(.*?)```",
-        _replace_fenced,
-        text,
-        flags=re.DOTALL,
-    )
-
-    # --- 2. Extract inline code ---
-    def _replace_inline_code(m: re.Match) -> str:  # type: ignore[type-arg]
-        code = m.group(1)
-        escaped_code = escape_html(code)
-        return _make_placeholder(f"<code>{escaped_code}</code>")
-
-    text = re.sub(r"`([^`\n]+)`", _replace_inline_code, text)
-
-    # --- 3. HTML-escape remaining text ---
-    text = escape_html(text)
-
-    # --- 4. Bold: **text** or __text__ ---
-    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
-    text = re.sub(r"__(.+?)__", r"<b>\1</b>", text)
-
-    # --- 5. Italic: *text* (require non-space after/before) ---
-    text = re.sub(r"\*(\S.*?\S|\S)\*", r"<i>\1</i>", text)
-    # _text_ only at word boundaries (avoid my_var_name)
-    text = re.sub(r"(?<!\w)_(\S.*?\S|\S)_(?!\w)", r"<i>\1</i>", text)
-
-    # --- 6. Links: [text](url) ---
-    text = re.sub(
-        r"\[([^\]]+)\]\(([^)]+)\)",
-        r'<a href="\2">\1</a>',
-        text,
-    )
-
-    # --- 7. Headers: # Header -> <b>Header</b> ---
-    text = re.sub(r"^#{1,6}\s+(.+)$", r"<b>\1</b>", text, flags=re.MULTILINE)
-
-    # --- 8. Strikethrough: ~~text~~ ---
-    text = re.sub(r"~~(.+?)~~", r"<s>\1</s>", text)
-
-    # --- 9. Restore placeholders ---
-    for key, html_content in placeholders:
-        text = text.replace(key, html_content)
-
-    return text
+            parts.append(f"<{node.tag}>{_render(node.children)}</{node.tag}>")
+    return "".join(parts)
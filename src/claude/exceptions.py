@@ -1,5 +1,8 @@
 """Claude-specific exceptions."""
 
+from datetime import datetime
+from typing import Optional
+
 
 class ClaudeError(Exception):
     """Base Claude error."""
@@ -10,7 +13,17 @@ class ClaudeError(Exception):
 class ClaudeTimeoutError(ClaudeError):
     """Operation timed out."""
 
-    pass
+    def __init__(
+        self,
+        message: str,
+        phase: str = "total",
+        timeout_seconds: float = None,
+        elapsed_seconds: float = None,
+    ):
+        super().__init__(message)
+        self.phase = phase
+        self.timeout_seconds = timeout_seconds
+        self.elapsed_seconds = elapsed_seconds
 
 
 class ClaudeProcessError(ClaudeError):
@@ -19,6 +32,14 @@ class ClaudeProcessError(ClaudeError):
     pass
 
 
+class ClaudeUsageLimitError(ClaudeProcessError):
+    """Claude usage limit reached until reset_at."""
+
+    def __init__(self, message: str, reset_at: Optional[datetime] = None):
+        super().__init__(message)
+        self.reset_at = reset_at
+
+
 class ClaudeParsingError(ClaudeError):
     """Failed to parse output."""
 
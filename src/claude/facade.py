@@ -3,17 +3,23 @@
 Provides simple interface for bot handlers.
 """
 
+from collections import Counter
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Union
 
 import structlog
 
 from ..config.settings import Settings
-from .exceptions import ClaudeToolValidationError
+from .exceptions import (
+    ClaudeTimeoutError,
+    ClaudeToolValidationError,
+    ClaudeUsageLimitError,
+)
 from .integration import ClaudeProcessManager, ClaudeResponse, StreamUpdate
-from .monitor import ToolMonitor
+from .monitor import ToolCallGate, ToolMonitor
 from .sdk_integration import ClaudeSDKManager
 from .session import SessionManager
+from .usage_limit import UsageLimiter
 
 logger = structlog.get_logger()
 
@@ -28,6 +34,7 @@ class ClaudeIntegration:
         sdk_manager: Optional[ClaudeSDKManager] = None,
         session_manager: Optional[SessionManager] = None,
         tool_monitor: Optional[ToolMonitor] = None,
+        usage_limiter: Optional[UsageLimiter] = None,
     ):
         """Initialize Claude integration facade."""
         self.config = config
@@ -47,6 +54,8 @@ class ClaudeIntegration:
         self.session_manager = session_manager
         self.tool_monitor = tool_monitor
         self._sdk_failed_count = 0  # Track SDK failures for adaptive fallback
+        self.timeouts_by_phase: Counter[str] = Counter()
+        self.usage_limiter = usage_limiter or UsageLimiter()
 
     async def run_command(
         self,
@@ -55,8 +64,13 @@ class ClaudeIntegration:
         user_id: int,
         session_id: Optional[str] = None,
         on_stream: Optional[Callable[[StreamUpdate], None]] = None,
+        defer_if_limited: bool = False,
     ) -> ClaudeResponse:
-        """Run Claude Code command with full integration."""
+        """Run Claude Code command with full integration.
+
+        While the usage limit is exhausted the request fails fast, or with
+        ``defer_if_limited`` waits for the limit to reset.
+        """
         logger.info(
             "Running Claude command",
             user_id=user_id,
@@ -65,6 +79,8 @@ class ClaudeIntegration:
             prompt_length=len(prompt),
         )
 
+        await self.usage_limiter.acquire(defer=defer_if_limited)
+
         # If no session_id provided, try to find an existing session for this
         # user+directory combination (auto-resume)
         if not session_id:
@@ -85,29 +101,22 @@ class ClaudeIntegration:
             user_id, working_directory, session_id
         )
 
-        # Track streaming updates and validate tool calls
-        tools_validated = True
-        validation_errors = []
+        # Validate tool calls, caching decisions for the run. In SDK mode the
+        # gate runs inline as a PreToolUse hook; subprocess mode validates the
+        # tool calls reported in stream updates.
+        tool_gate = ToolCallGate(self.tool_monitor, working_directory, user_id)
         blocked_tools = set()
 
         async def stream_handler(update: StreamUpdate):
-            nonlocal tools_validated
-
             # Validate tool calls
             if update.tool_calls:
                 for tool_call in update.tool_calls:
                     tool_name = tool_call["name"]
-                    valid, error = await self.tool_monitor.validate_tool_call(
-                        tool_name,
-                        tool_call.get("input", {}),
-                        working_directory,
-                        user_id,
+                    valid, error = await tool_gate.check(
+                        tool_name, tool_call.get("input", {})
                     )
 
                     if not valid:
-                        tools_validated = False
-                        validation_errors.append(error)
-
                         # Track blocked tools
                         if "Tool not allowed:" in error:
                             blocked_tools.add(tool_name)
@@ -161,6 +170,7 @@ class ClaudeIntegration:
                     session_id=claude_session_id,
                     continue_session=should_continue,
                     stream_callback=stream_handler,
+                    tool_gate=tool_gate,
                 )
             except Exception as resume_error:
                 # If resume failed (e.g., session expired on Claude's side),
@@ -187,12 +197,14 @@ class ClaudeIntegration:
                         session_id=None,
                         continue_session=False,
                         stream_callback=stream_handler,
+                        tool_gate=tool_gate,
                     )
                 else:
                     raise
 
             # Check if tool validation failed
-            if not tools_validated:
+            validation_errors = tool_gate.errors
+            if validation_errors:
                 logger.error(
                     "Command completed but tool validation failed",
                     validation_errors=validation_errors,
@@ -256,11 +268,16 @@ class ClaudeIntegration:
             return response
 
         except Exception as e:
+            if isinstance(e, ClaudeTimeoutError):
+                self.timeouts_by_phase[e.phase] += 1
+            elif isinstance(e, ClaudeUsageLimitError):
+                self.usage_limiter.park(e.reset_at)
             logger.error(
                 "Claude command failed",
                 error=str(e),
                 user_id=user_id,
                 session_id=session.session_id,
+                timeout_phase=(e.phase if isinstance(e, ClaudeTimeoutError) else None),
             )
             raise
 
@@ -271,6 +288,7 @@ class ClaudeIntegration:
         session_id: Optional[str] = None,
         continue_session: bool = False,
         stream_callback: Optional[Callable] = None,
+        tool_gate: Optional[ToolCallGate] = None,
     ) -> ClaudeResponse:
         """Execute command with SDK->subprocess fallback on JSON decode errors."""
         # Try SDK first if configured
@@ -283,6 +301,7 @@ class ClaudeIntegration:
                     session_id=session_id,
                     continue_session=continue_session,
                     stream_callback=stream_callback,
+                    tool_gate=tool_gate,
                 )
                 # Reset failure count on success
                 self._sdk_failed_count = 0
@@ -444,6 +463,19 @@ class ClaudeIntegration:
         """Get tool usage statistics."""
         return self.tool_monitor.get_tool_stats()
 
+    def get_timeout_stats(self) -> Dict[str, int]:
+        """Get run timeout counts by watchdog phase."""
+        return dict(self.timeouts_by_phase)
+
+    def describe_timeouts(self) -> Optional[str]:
+        """One-line timeout counts for status displays, None without timeouts."""
+        if not self.timeouts_by_phase:
+            return None
+        counts = " · ".join(
+            f"{phase} {count}" for phase, count in self.timeouts_by_phase.items()
+        )
+        return f"Run timeouts: {counts}"
+
     async def get_user_summary(self, user_id: int) -> Dict[str, Any]:
         """Get comprehensive user summary."""
         session_summary = await self.session_manager.get_user_session_summary(user_id)
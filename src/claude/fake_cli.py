@@ -0,0 +1,390 @@
+"""Stand-in ``claude`` executable for offline tests and load runs.
+
+Replays a stream-json transcript, such as the output of
+``claude -p "..." --output-format stream-json --verbose``, instead of
+calling the API. Session ids and the init message's ``cwd`` are rewritten
+to match the run. Both backends can be pointed at it:
+
+- ``ClaudeProcessManager`` runs it in print mode (``-p``) and reads stdout.
+- ``ClaudeSDKManager`` talks the SDK control protocol over stdin/stdout.
+  The fake answers ``initialize``, replays the transcript for each user
+  message and sends ``PreToolUse`` hook callbacks for tool calls. A denied
+  call ends the turn.
+
+A ``FakeCliScenario`` controls pacing and failures: delay before the first
+message and between messages, per-token delay for assistant text, stderr
+noise, a crash after N messages, a usage limit error and the exit code.
+
+Usage:
+    cli = write_fake_cli(tmp_path / "claude", FakeCliScenario(token_delay=0.01))
+    config = create_test_config(
+        claude_binary_path=str(cli), claude_cli_path=str(cli)
+    )
+
+This module only uses the standard library; the generated script runs it
+directly, without importing the bot's packages.
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+FAKE_CLI_VERSION = "2.0.0 (Claude Code)"
+
+# Filler line written as stderr noise
+STDERR_NOISE_LINE = "debug: " + "x" * 1016 + "\n"
+
+
+def default_transcript(
+    text: str = "Done.",
+    tool_name: Optional[str] = "Read",
+    tool_input: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Build a small transcript: init, an optional tool call, text, result."""
+    session_id = "fake-session"
+    messages: List[Dict[str, Any]] = [
+        {
+            "type": "system",
+            "subtype": "init",
+            "session_id": session_id,
+            "cwd": ".",
+            "tools": [tool_name] if tool_name else [],
+            "model": "fake-model",
+        }
+    ]
+    if tool_name:
+        messages.append(
+            {
+                "type": "assistant",
+                "session_id": session_id,
+                "message": {
+                    "role": "assistant",
+                    "model": "fake-model",
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": "toolu_fake_1",
+                            "name": tool_name,
+                            "input": tool_input or {"file_path": "README.md"},
+                        }
+                    ],
+                },
+            }
+        )
+        messages.append(
+            {
+                "type": "user",
+                "session_id": session_id,
+                "message": {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": "toolu_fake_1",
+                            "content": "fake file contents",
+                        }
+                    ],
+                },
+            }
+        )
+    messages.append(
+        {
+            "type": "assistant",
+            "session_id": session_id,
+            "message": {
+                "role": "assistant",
+                "model": "fake-model",
+                "content": [{"type": "text", "text": text}],
+            },
+        }
+    )
+    messages.append(
+        {
+            "type": "result",
+            "subtype": "success",
+            "is_error": False,
+            "result": text,
+            "session_id": session_id,
+            "total_cost_usd": 0.001,
+            "duration_ms": 10,
+            "duration_api_ms": 8,
+            "num_turns": 1,
+        }
+    )
+    return messages
+
+
+def load_transcript(path: Path) -> List[Dict[str, Any]]:
+    """Read a recorded stream-json transcript, one message per line."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@dataclass
+class FakeCliScenario:
+    """What the fake CLI replays and how it misbehaves."""
+
+    transcript: List[Dict[str, Any]] = field(default_factory=default_transcript)
+    # Seconds before the first message
+    first_message_delay: float = 0.0
+    # Seconds between messages
+    message_delay: float = 0.0
+    # Seconds per whitespace-separated token of assistant text
+    token_delay: float = 0.0
+    # Bytes of noise written to stderr before the first message
+    stderr_bytes: int = 0
+    # Crash after this many messages
+    fail_after_messages: Optional[int] = None
+    # Report "usage limit reached" with this reset time (epoch seconds)
+    usage_limit_reset_at: Optional[int] = None
+    exit_code: int = 0
+
+
+def write_fake_cli(path: Path, scenario: Optional[FakeCliScenario] = None) -> Path:
+    """Write an executable fake CLI at path, returning the path.
+
+    The scenario is stored beside the script as ``<name>.scenario.json``.
+    """
+    scenario = scenario or FakeCliScenario()
+    scenario_path = path.with_name(f"{path.name}.scenario.json")
+    scenario_path.write_text(json.dumps(asdict(scenario)), encoding="utf-8")
+    path.write_text(
+        f"#!{sys.executable}\n"
+        "import runpy, sys\n"
+        f"sys.argv[1:1] = ['--fake-scenario', {str(scenario_path)!r}]\n"
+        f"runpy.run_path({str(Path(__file__).resolve())!r}, run_name='__main__')\n",
+        encoding="utf-8",
+    )
+    path.chmod(0o755)
+    return path
+
+
+class _Replay:
+    """Writes one run's messages to stdout with the scenario's pacing."""
+
+    def __init__(self, scenario: FakeCliScenario, session_id: str):
+        self.scenario = scenario
+        self.session_id = session_id
+        self.sent = 0
+
+    def emit(self, message: Dict[str, Any]) -> None:
+        """Write a message, after the delay due before it."""
+        if self.sent == 0:
+            time.sleep(self.scenario.first_message_delay)
+        else:
+            time.sleep(self.scenario.message_delay)
+        if message.get("type") == "assistant":
+            time.sleep(self.scenario.token_delay * _count_tokens(message))
+
+        if "session_id" in message:
+            message = {**message, "session_id": self.session_id}
+        if message.get("type") == "system" and message.get("subtype") == "init":
+            message = {**message, "cwd": os.getcwd()}
+        self.write(message)
+        self.sent += 1
+
+        limit = self.scenario.fail_after_messages
+        if limit is not None and self.sent >= limit:
+            sys.stderr.write(f"Error: simulated crash after {self.sent} messages\n")
+            sys.stderr.flush()
+            sys.exit(self.scenario.exit_code or 1)
+
+    def write(self, message: Dict[str, Any]) -> None:
+        """Write a line to stdout without pacing."""
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+    def usage_limit(self) -> None:
+        """Report an exhausted usage limit the way the CLI does, then exit."""
+        error = f"Claude AI usage limit reached|{self.scenario.usage_limit_reset_at}"
+        sys.stderr.write(error + "\n")
+        sys.stderr.flush()
+        self.emit(
+            {
+                "type": "result",
+                "subtype": "error_during_execution",
+                "is_error": True,
+                "result": error,
+                "errors": [error],
+                "session_id": self.session_id,
+                "total_cost_usd": 0.0,
+                "duration_ms": 0,
+                "duration_api_ms": 0,
+                "num_turns": 0,
+            }
+        )
+        sys.exit(1)
+
+
+def _count_tokens(message: Dict[str, Any]) -> int:
+    """Whitespace-separated tokens in an assistant message's text blocks."""
+    content = message.get("message", {}).get("content", [])
+    if isinstance(content, str):
+        return len(content.split())
+    return sum(
+        len(block.get("text", "").split())
+        for block in content
+        if isinstance(block, dict) and block.get("type") == "text"
+    )
+
+
+def _write_stderr_noise(size: int) -> None:
+    """Write about size bytes to stderr, starting with a warning line."""
+    if size <= 0:
+        return
+    sys.stderr.write("warning: fake CLI stderr noise\n")
+    for _ in range(size // len(STDERR_NOISE_LINE)):
+        sys.stderr.write(STDERR_NOISE_LINE)
+    sys.stderr.flush()
+
+
+def _run_print_mode(scenario: FakeCliScenario, replay: _Replay) -> int:
+    """Replay the transcript once, as ``claude -p`` does."""
+    _write_stderr_noise(scenario.stderr_bytes)
+    if scenario.usage_limit_reset_at is not None:
+        replay.usage_limit()
+    for message in scenario.transcript:
+        replay.emit(message)
+    return scenario.exit_code
+
+
+class _ControlChannel:
+    """SDK control protocol: reads stdin, answers and sends requests."""
+
+    def __init__(self, replay: _Replay):
+        self.replay = replay
+        self.pre_tool_use_callbacks: List[str] = []
+        self._counter = 0
+
+    def request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a control request and wait for the SDK's response."""
+        self._counter += 1
+        request_id = f"fake_req_{self._counter}"
+        self.replay.write(
+            {"type": "control_request", "request_id": request_id, "request": request}
+        )
+        for message in self.incoming():
+            response = message.get("response", {})
+            if (
+                message.get("type") == "control_response"
+                and response.get("request_id") == request_id
+            ):
+                if response.get("subtype") == "error":
+                    return {}
+                return response.get("response") or {}
+        return {}
+
+    def incoming(self):
+        """Yield messages from stdin, answering initialize along the way."""
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if (
+                message.get("type") == "control_request"
+                and message["request"].get("subtype") == "initialize"
+            ):
+                self._initialize(message)
+                continue
+            yield message
+
+    def _initialize(self, message: Dict[str, Any]) -> None:
+        """Record PreToolUse hooks and acknowledge the handshake."""
+        hooks = message["request"].get("hooks") or {}
+        for matcher in hooks.get("PreToolUse", []):
+            self.pre_tool_use_callbacks.extend(matcher.get("hookCallbackIds", []))
+        self.replay.write(
+            {
+                "type": "control_response",
+                "response": {
+                    "subtype": "success",
+                    "request_id": message["request_id"],
+                    "response": {},
+                },
+            }
+        )
+
+    def tool_denied(self, block: Dict[str, Any]) -> bool:
+        """Run PreToolUse hooks for a tool call; True when one denies it."""
+        for callback_id in self.pre_tool_use_callbacks:
+            output = self.request(
+                {
+                    "subtype": "hook_callback",
+                    "callback_id": callback_id,
+                    "tool_use_id": block.get("id"),
+                    "input": {
+                        "hook_event_name": "PreToolUse",
+                        "session_id": self.replay.session_id,
+                        "tool_name": block.get("name"),
+                        "tool_input": block.get("input", {}),
+                    },
+                }
+            )
+            decision = output.get("hookSpecificOutput", {}).get("permissionDecision")
+            if decision == "deny" or output.get("continue") is False:
+                return True
+        return False
+
+
+def _run_stream_mode(scenario: FakeCliScenario, replay: _Replay) -> int:
+    """Serve the SDK: replay the transcript for every user message."""
+    channel = _ControlChannel(replay)
+    _write_stderr_noise(scenario.stderr_bytes)
+
+    for message in channel.incoming():
+        if message.get("type") != "user":
+            continue
+        if scenario.usage_limit_reset_at is not None:
+            replay.usage_limit()
+
+        result = next(
+            (m for m in scenario.transcript if m.get("type") == "result"), None
+        )
+        for transcript_message in scenario.transcript:
+            replay.emit(transcript_message)
+            if transcript_message.get("type") != "assistant":
+                continue
+            content = transcript_message.get("message", {}).get("content", [])
+            tool_calls = [
+                block
+                for block in content
+                if isinstance(block, dict) and block.get("type") == "tool_use"
+            ]
+            if any(channel.tool_denied(block) for block in tool_calls):
+                if result is not None:
+                    replay.emit(result)
+                break
+    return scenario.exit_code
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the generated script."""
+    args = list(sys.argv[1:] if argv is None else argv)
+    if "-v" in args or "--version" in args:
+        print(FAKE_CLI_VERSION)
+        return 0
+
+    scenario = FakeCliScenario()
+    if "--fake-scenario" in args:
+        with open(args[args.index("--fake-scenario") + 1], encoding="utf-8") as f:
+            scenario = FakeCliScenario(**json.load(f))
+
+    # Resumed runs keep their session; new runs get a fresh one
+    if "--resume" in args:
+        session_id = args[args.index("--resume") + 1]
+    else:
+        session_id = str(uuid.uuid4())
+    replay = _Replay(scenario, session_id)
+
+    if "-p" in args or "--print" in args:
+        return _run_print_mode(scenario, replay)
+    return _run_stream_mode(scenario, replay)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
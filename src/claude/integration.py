@@ -24,10 +24,20 @@ from .exceptions import (
     ClaudeParsingError,
     ClaudeProcessError,
     ClaudeTimeoutError,
+    ClaudeUsageLimitError,
 )
+from .usage_limit import parse_reset_time
+from .watchdog import RunWatchdog, WatchdogLimits
 
 logger = structlog.get_logger()
 
+# Bytes of stderr kept for error reporting (the most recent output wins)
+STDERR_TAIL_BYTES = 64 * 1024
+# Stderr warnings forwarded to the stream callback per run
+MAX_STDERR_WARNINGS = 10
+# Longest stderr line inspected for warnings
+MAX_STDERR_LINE_LENGTH = 4096
+
 
 @dataclass
 class ClaudeResponse:
@@ -41,6 +51,8 @@ class ClaudeResponse:
     is_error: bool = False
     error_type: Optional[str] = None
     tools_used: List[Dict[str, Any]] = field(default_factory=list)
+    # Working directory the CLI reported when the run started
+    cwd: Optional[str] = None
 
 
 @dataclass
@@ -89,6 +101,32 @@ class StreamUpdate:
         return None
 
 
+class StderrTail:
+    """Ring buffer holding the last bytes written to stderr."""
+
+    def __init__(self, max_bytes: int = STDERR_TAIL_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._buffer = bytearray()
+
+    def append(self, data: bytes) -> None:
+        """Add output, dropping the oldest bytes beyond the limit."""
+        self.total_bytes += len(data)
+        self._buffer += data
+        overflow = len(self._buffer) - self.max_bytes
+        if overflow > 0:
+            del self._buffer[:overflow]
+
+    @property
+    def truncated(self) -> bool:
+        """Whether older output was dropped."""
+        return self.total_bytes > len(self._buffer)
+
+    def text(self) -> str:
+        """Decoded tail of the output."""
+        return self._buffer.decode("utf-8", errors="replace")
+
+
 class ClaudeProcessManager:
     """Manage Claude Code subprocess execution with memory optimization."""
 
@@ -131,10 +169,10 @@ class ClaudeProcessManager:
             process = await self._start_process(cmd, working_directory)
             self.active_processes[process_id] = process
 
-            # Handle output with timeout
-            result = await asyncio.wait_for(
-                self._handle_process_output(process, stream_callback),
-                timeout=self.config.claude_timeout_seconds,
+            # Handle output under per-phase deadlines
+            watchdog = RunWatchdog(WatchdogLimits.from_settings(self.config))
+            result = await watchdog.run(
+                self._handle_process_output(process, stream_callback, watchdog)
             )
 
             logger.info(
@@ -146,7 +184,7 @@ class ClaudeProcessManager:
 
             return result
 
-        except asyncio.TimeoutError:
+        except ClaudeTimeoutError as e:
             # Kill process on timeout
             if process_id in self.active_processes:
                 self.active_processes[process_id].kill()
@@ -155,12 +193,11 @@ class ClaudeProcessManager:
             logger.error(
                 "Claude Code process timed out",
                 process_id=process_id,
-                timeout_seconds=self.config.claude_timeout_seconds,
-            )
-
-            raise ClaudeTimeoutError(
-                f"Claude Code timed out after {self.config.claude_timeout_seconds}s"
+                phase=e.phase,
+                timeout_seconds=e.timeout_seconds,
+                elapsed_seconds=e.elapsed_seconds,
             )
+            raise
 
         except Exception as e:
             logger.error(
@@ -231,109 +268,162 @@ class ClaudeProcessManager:
         )
 
     async def _handle_process_output(
-        self, process: Process, stream_callback: Optional[Callable]
+        self,
+        process: Process,
+        stream_callback: Optional[Callable],
+        watchdog: Optional[RunWatchdog] = None,
     ) -> ClaudeResponse:
         """Memory-optimized output handling with bounded buffers."""
         message_buffer = deque(maxlen=self.max_message_buffer)
         result = None
+        init_cwd = None
         parsing_errors = []
 
-        async for line in self._read_stream_bounded(process.stdout):
-            try:
-                msg = json.loads(line)
-
-                # Enhanced validation
-                if not self._validate_message_structure(msg):
-                    parsing_errors.append(f"Invalid message structure: {line[:100]}")
-                    continue
-
-                message_buffer.append(msg)
-
-                # Process immediately to avoid memory buildup
-                update = self._parse_stream_message(msg)
-                if update and stream_callback:
-                    try:
-                        await stream_callback(update)
-                    except Exception as e:
-                        logger.warning(
-                            "Stream callback failed",
-                            error=str(e),
-                            update_type=update.type,
+        # Drain stderr alongside stdout so a chatty CLI cannot fill the pipe
+        stderr_tail = StderrTail(STDERR_TAIL_BYTES)
+        stderr_task = asyncio.create_task(
+            self._drain_stderr(process.stderr, stderr_tail, stream_callback)
+        )
+        try:
+            async for line in self._read_stream_bounded(process.stdout):
+                if watchdog:
+                    watchdog.feed()
+                try:
+                    msg = json.loads(line)
+
+                    # Enhanced validation
+                    if not self._validate_message_structure(msg):
+                        parsing_errors.append(
+                            f"Invalid message structure: {line[:100]}"
                         )
+                        continue
+
+                    message_buffer.append(msg)
+
+                    # Process immediately to avoid memory buildup
+                    update = self._parse_stream_message(msg)
+                    if update and stream_callback:
+                        try:
+                            await stream_callback(update)
+                        except Exception as e:
+                            logger.warning(
+                                "Stream callback failed",
+                                error=str(e),
+                                update_type=update.type,
+                            )
+
+                    # Check for final result
+                    if msg.get("type") == "result":
+                        result = msg
+                    elif msg.get("type") == "system" and msg.get("subtype") == "init":
+                        init_cwd = msg.get("cwd")
+
+                except json.JSONDecodeError as e:
+                    parsing_errors.append(f"JSON decode error: {e}")
+                    logger.warning(
+                        "Failed to parse JSON line", line=line[:200], error=str(e)
+                    )
+                    continue
 
-                # Check for final result
-                if msg.get("type") == "result":
-                    result = msg
-
-            except json.JSONDecodeError as e:
-                parsing_errors.append(f"JSON decode error: {e}")
+            # Enhanced error reporting
+            if parsing_errors:
                 logger.warning(
-                    "Failed to parse JSON line", line=line[:200], error=str(e)
+                    "Parsing errors encountered",
+                    count=len(parsing_errors),
+                    errors=parsing_errors[:5],
                 )
-                continue
 
-        # Enhanced error reporting
-        if parsing_errors:
-            logger.warning(
-                "Parsing errors encountered",
-                count=len(parsing_errors),
-                errors=parsing_errors[:5],
-            )
-
-        # Wait for process to complete
-        return_code = await process.wait()
-
-        if return_code != 0:
-            stderr = await process.stderr.read()
-            error_msg = stderr.decode("utf-8", errors="replace")
-            logger.error(
-                "Claude Code process failed",
-                return_code=return_code,
-                stderr=error_msg,
-            )
-
-            # Check for specific error types
-            if "usage limit reached" in error_msg.lower():
-                # Extract reset time if available
-                import re
-
-                time_match = re.search(
-                    r"reset at (\d+[apm]+)", error_msg, re.IGNORECASE
+            # Wait for process to complete
+            return_code = await process.wait()
+            await stderr_task
+
+            if return_code != 0:
+                error_msg = stderr_tail.text()
+                logger.error(
+                    "Claude Code process failed",
+                    return_code=return_code,
+                    stderr=error_msg,
+                    stderr_bytes=stderr_tail.total_bytes,
+                    stderr_truncated=stderr_tail.truncated,
                 )
-                timezone_match = re.search(r"\(([^)]+)\)", error_msg)
-
-                reset_time = time_match.group(1) if time_match else "later"
-                timezone = timezone_match.group(1) if timezone_match else ""
-
-                user_friendly_msg = (
-                    f"⏱️ **Claude AI Usage Limit Reached**\n\n"
-                    f"You've reached your Claude AI usage limit for this period.\n\n"
-                    f"**When will it reset?**\n"
-                    f"Your limit will reset at **{reset_time}**"
-                    f"{f' ({timezone})' if timezone else ''}\n\n"
-                    f"**What you can do:**\n"
-                    f"• Wait for the limit to reset automatically\n"
-                    f"• Try again after the reset time\n"
-                    f"• Use simpler requests that require less processing\n"
-                    f"• Contact support if you need a higher limit"
+
+                # Check for specific error types
+                if "usage limit reached" in error_msg.lower():
+                    reset_at = parse_reset_time(error_msg)
+                    reset = reset_at.strftime("%H:%M UTC") if reset_at else "later"
+
+                    user_friendly_msg = (
+                        f"⏱️ **Claude AI Usage Limit Reached**\n\n"
+                        f"You've reached your Claude AI usage limit "
+                        f"for this period.\n\n"
+                        f"**When will it reset?**\n"
+                        f"Your limit will reset at **{reset}**\n\n"
+                        f"**What you can do:**\n"
+                        f"• Wait for the limit to reset automatically\n"
+                        f"• Try again after the reset time\n"
+                        f"• Use simpler requests that require less processing\n"
+                        f"• Contact support if you need a higher limit"
+                    )
+
+                    raise ClaudeUsageLimitError(user_friendly_msg, reset_at=reset_at)
+
+                # Check for MCP-related errors
+                if "mcp" in error_msg.lower():
+                    raise ClaudeMCPError(f"MCP server error: {error_msg}")
+
+                # Generic error handling for other cases
+                raise ClaudeProcessError(
+                    f"Claude Code exited with code {return_code}: {error_msg}"
                 )
 
-                raise ClaudeProcessError(user_friendly_msg)
+            if not result:
+                logger.error("No result message received from Claude Code")
+                raise ClaudeParsingError("No result message received from Claude Code")
+
+            response = self._parse_result(result, list(message_buffer))
+            response.cwd = init_cwd
+            return response
+        finally:
+            if not stderr_task.done():
+                stderr_task.cancel()
 
-            # Check for MCP-related errors
-            if "mcp" in error_msg.lower():
-                raise ClaudeMCPError(f"MCP server error: {error_msg}")
+    async def _drain_stderr(
+        self, stream, tail: StderrTail, stream_callback: Optional[Callable]
+    ) -> None:
+        """Read stderr to EOF into tail, forwarding warning lines."""
+        partial = b""
+        warnings_sent = 0
 
-            # Generic error handling for other cases
-            raise ClaudeProcessError(
-                f"Claude Code exited with code {return_code}: {error_msg}"
-            )
+        while True:
+            chunk = await stream.read(self.streaming_buffer_size)
+            if not chunk:
+                break
+            tail.append(chunk)
 
-        if not result:
-            logger.error("No result message received from Claude Code")
-            raise ClaudeParsingError("No result message received from Claude Code")
+            if not stream_callback or warnings_sent >= MAX_STDERR_WARNINGS:
+                continue
 
-        return self._parse_result(result, list(message_buffer))
+            *lines, partial = (partial + chunk).split(b"\n")
+            partial = partial[-MAX_STDERR_LINE_LENGTH:]
+            for raw_line in lines:
+                line = raw_line[:MAX_STDERR_LINE_LENGTH].decode(
+                    "utf-8", errors="replace"
+                )
+                if "warn" not in line.lower():
+                    continue
+                try:
+                    await stream_callback(
+                        StreamUpdate(
+                            type="system",
+                            content=line.strip(),
+                            metadata={"subtype": "stderr_warning"},
+                        )
+                    )
+                except Exception as e:
+                    logger.warning("Stream callback failed", error=str(e))
+                warnings_sent += 1
+                if warnings_sent >= MAX_STDERR_WARNINGS:
+                    break
 
     async def _read_stream(self, stream) -> AsyncIterator[str]:
         """Read lines from stream."""
@@ -540,6 +630,7 @@ class ClaudeProcessManager:
                             {
                                 "name": block.get("name"),
                                 "timestamp": msg.get("timestamp"),
+                                "input": block.get("input", {}),
                             }
                         )
                     elif block.get("type") == "text":
@@ -6,17 +6,106 @@ Features:
 - Usage analytics
 """
 
-from collections import defaultdict
+import json
+import re
+from collections import Counter, defaultdict, deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
 
 import structlog
 
 from ..config.settings import Settings
+from ..security.scanner import PatternScanner
 from ..security.validators import SecurityValidator
 
 logger = structlog.get_logger()
 
+# Shell commands that can move or relink directories under cached path validations
+RENAME_COMMAND = re.compile(r"\b(?:mv|rename|rmdir|ln)\b")
+
+# Substrings that block a shell command (matched case-insensitively)
+DANGEROUS_SHELL_PATTERNS = [
+    "rm -rf",
+    "sudo",
+    "chmod 777",
+    "curl",
+    "wget",
+    "nc ",
+    "netcat",
+    ">",
+    ">>",
+    "|",
+    "&",
+    ";",
+    "$(",
+    "`",
+]
+
+FILE_TOOLS = frozenset(
+    {"create_file", "edit_file", "read_file", "Write", "Edit", "Read"}
+)
+SHELL_TOOLS = frozenset({"bash", "shell", "Bash"})
+
+# Most recent violations kept in memory
+MAX_STORED_VIOLATIONS = 1000
+
+ValidationResult = Tuple[bool, Optional[str]]
+
+
+class ToolPolicy:
+    """Tool allow/deny rules compiled once from settings."""
+
+    def __init__(
+        self,
+        allowed_tools: Optional[List[str]] = None,
+        disallowed_tools: Optional[List[str]] = None,
+        shell_patterns: Optional[List[str]] = None,
+    ):
+        # An empty or missing allow list means every tool is allowed
+        self.allowed_tools: Optional[FrozenSet[str]] = (
+            frozenset(allowed_tools) if allowed_tools else None
+        )
+        self.disallowed_tools: FrozenSet[str] = frozenset(disallowed_tools or ())
+        patterns = (
+            DANGEROUS_SHELL_PATTERNS if shell_patterns is None else shell_patterns
+        )
+        # Escaped regex -> original substring, for reporting
+        self._shell_patterns = {re.escape(pattern): pattern for pattern in patterns}
+        self.shell_scanner = PatternScanner.from_patterns(
+            self._shell_patterns, category="dangerous_command"
+        )
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> "ToolPolicy":
+        """Build the policy from the tool settings."""
+        return cls(
+            allowed_tools=getattr(config, "claude_allowed_tools", None),
+            disallowed_tools=getattr(config, "claude_disallowed_tools", None),
+        )
+
+    def check_tool(self, tool_name: str) -> Optional[str]:
+        """Return the violation type if the tool may not be used."""
+        if self.allowed_tools is not None and tool_name not in self.allowed_tools:
+            return "disallowed_tool"
+        if tool_name in self.disallowed_tools:
+            return "explicitly_disallowed_tool"
+        return None
+
+    def dangerous_shell_pattern(self, command: str) -> Optional[str]:
+        """Return the first dangerous pattern found in a shell command."""
+        rule = self.shell_scanner.first_match(command)
+        return self._shell_patterns[rule.pattern] if rule else None
+
 
 class ToolMonitor:
     """Monitor and validate Claude's tool usage."""
@@ -27,8 +116,22 @@ class ToolMonitor:
         """Initialize tool monitor."""
         self.config = config
         self.security_validator = security_validator
+        self.policy = ToolPolicy.from_settings(config)
         self.tool_usage: Dict[str, int] = defaultdict(int)
-        self.security_violations: List[Dict[str, Any]] = []
+        self.security_violations: Deque[Dict[str, Any]] = deque(
+            maxlen=MAX_STORED_VIOLATIONS
+        )
+        self.total_violations = 0
+        # user_id -> violation type counts for violations still in the buffer
+        self._violations_by_user: Dict[Any, Counter[str]] = {}
+
+        self._tool_validators: Dict[
+            str,
+            Callable[[str, Dict[str, Any], Path, int], Awaitable[ValidationResult]],
+        ] = {
+            **{name: self._validate_file_tool for name in FILE_TOOLS},
+            **{name: self._validate_shell_tool for name in SHELL_TOOLS},
+        }
 
     async def validate_tool_call(
         self,
@@ -36,7 +139,7 @@ class ToolMonitor:
         tool_input: Dict[str, Any],
         working_directory: Path,
         user_id: int,
-    ) -> Tuple[bool, Optional[str]]:
+    ) -> ValidationResult:
         """Validate tool call before execution."""
         logger.debug(
             "Validating tool call",
@@ -45,159 +148,201 @@ class ToolMonitor:
             user_id=user_id,
         )
 
-        # Check if tool is allowed
-        if (
-            hasattr(self.config, "claude_allowed_tools")
-            and self.config.claude_allowed_tools
-        ):
-            if tool_name not in self.config.claude_allowed_tools:
-                violation = {
-                    "type": "disallowed_tool",
-                    "tool_name": tool_name,
-                    "user_id": user_id,
-                    "working_directory": str(working_directory),
-                }
-                self.security_violations.append(violation)
+        violation_type = self.policy.check_tool(tool_name)
+        if violation_type:
+            violation = {
+                "type": violation_type,
+                "tool_name": tool_name,
+                "user_id": user_id,
+                "working_directory": str(working_directory),
+            }
+            self._record_violation(violation)
+            if violation_type == "disallowed_tool":
                 logger.warning("Tool not allowed", **violation)
                 return False, f"Tool not allowed: {tool_name}"
+            logger.warning("Tool explicitly disallowed", **violation)
+            return False, f"Tool explicitly disallowed: {tool_name}"
+
+        validator = self._tool_validators.get(tool_name)
+        if validator:
+            valid, error = await validator(
+                tool_name, tool_input, working_directory, user_id
+            )
+            if not valid:
+                return False, error
+
+        # Track usage
+        self.tool_usage[tool_name] += 1
+
+        logger.debug("Tool call validated successfully", tool_name=tool_name)
+        return True, None
 
-        # Check if tool is explicitly disallowed
-        if (
-            hasattr(self.config, "claude_disallowed_tools")
-            and self.config.claude_disallowed_tools
-        ):
-            if tool_name in self.config.claude_disallowed_tools:
+    async def _validate_file_tool(
+        self,
+        tool_name: str,
+        tool_input: Dict[str, Any],
+        working_directory: Path,
+        user_id: int,
+    ) -> ValidationResult:
+        """Validate the path of a file operation."""
+        file_path = tool_input.get("path") or tool_input.get("file_path")
+        if not file_path:
+            return False, "File path required"
+
+        # Validate path security
+        if self.security_validator:
+            valid, resolved_path, error = self.security_validator.validate_path(
+                file_path, working_directory
+            )
+
+            if not valid:
                 violation = {
-                    "type": "explicitly_disallowed_tool",
+                    "type": "invalid_file_path",
                     "tool_name": tool_name,
+                    "file_path": file_path,
                     "user_id": user_id,
                     "working_directory": str(working_directory),
+                    "error": error,
                 }
-                self.security_violations.append(violation)
-                logger.warning("Tool explicitly disallowed", **violation)
-                return False, f"Tool explicitly disallowed: {tool_name}"
-
-        # Validate file operations
-        if tool_name in [
-            "create_file",
-            "edit_file",
-            "read_file",
-            "Write",
-            "Edit",
-            "Read",
-        ]:
-            file_path = tool_input.get("path") or tool_input.get("file_path")
-            if not file_path:
-                return False, "File path required"
-
-            # Validate path security
-            if self.security_validator:
-                valid, resolved_path, error = self.security_validator.validate_path(
-                    file_path, working_directory
-                )
-
-                if not valid:
-                    violation = {
-                        "type": "invalid_file_path",
-                        "tool_name": tool_name,
-                        "file_path": file_path,
-                        "user_id": user_id,
-                        "working_directory": str(working_directory),
-                        "error": error,
-                    }
-                    self.security_violations.append(violation)
-                    logger.warning("Invalid file path in tool call", **violation)
-                    return False, error
-
-        # Validate shell commands
-        if tool_name in ["bash", "shell", "Bash"]:
-            command = tool_input.get("command", "")
-
-            # Check for dangerous commands
-            dangerous_patterns = [
-                "rm -rf",
-                "sudo",
-                "chmod 777",
-                "curl",
-                "wget",
-                "nc ",
-                "netcat",
-                ">",
-                ">>",
-                "|",
-                "&",
-                ";",
-                "$(",
-                "`",
-            ]
-
-            for pattern in dangerous_patterns:
-                if pattern in command.lower():
-                    violation = {
-                        "type": "dangerous_command",
-                        "tool_name": tool_name,
-                        "command": command,
-                        "pattern": pattern,
-                        "user_id": user_id,
-                        "working_directory": str(working_directory),
-                    }
-                    self.security_violations.append(violation)
-                    logger.warning("Dangerous command detected", **violation)
-                    return False, f"Dangerous command pattern detected: {pattern}"
+                self._record_violation(violation)
+                logger.warning("Invalid file path in tool call", **violation)
+                return False, error
 
-        # Track usage
-        self.tool_usage[tool_name] += 1
+        return True, None
+
+    async def _validate_shell_tool(
+        self,
+        tool_name: str,
+        tool_input: Dict[str, Any],
+        working_directory: Path,
+        user_id: int,
+    ) -> ValidationResult:
+        """Check a shell command against the dangerous pattern list."""
+        command = tool_input.get("command", "")
+
+        pattern = self.policy.dangerous_shell_pattern(command)
+        if pattern:
+            violation = {
+                "type": "dangerous_command",
+                "tool_name": tool_name,
+                "command": command,
+                "pattern": pattern,
+                "user_id": user_id,
+                "working_directory": str(working_directory),
+            }
+            self._record_violation(violation)
+            logger.warning("Dangerous command detected", **violation)
+            return False, f"Dangerous command pattern detected: {pattern}"
+
+        if self.security_validator and RENAME_COMMAND.search(command):
+            self.security_validator.invalidate_path_cache()
 
-        logger.debug("Tool call validated successfully", tool_name=tool_name)
         return True, None
 
+    def _record_violation(self, violation: Dict[str, Any]) -> None:
+        """Store a violation in the ring buffer and the per-user index."""
+        if len(self.security_violations) == self.security_violations.maxlen:
+            evicted = self.security_violations[0]
+            counts = self._violations_by_user.get(evicted.get("user_id"))
+            if counts is not None:
+                counts[evicted["type"]] -= 1
+                if counts[evicted["type"]] <= 0:
+                    del counts[evicted["type"]]
+                if not counts:
+                    del self._violations_by_user[evicted.get("user_id")]
+
+        self.security_violations.append(violation)
+        self.total_violations += 1
+        self._violations_by_user.setdefault(violation.get("user_id"), Counter())[
+            violation["type"]
+        ] += 1
+
     def get_tool_stats(self) -> Dict[str, Any]:
         """Get tool usage statistics."""
         return {
             "total_calls": sum(self.tool_usage.values()),
             "by_tool": dict(self.tool_usage),
             "unique_tools": len(self.tool_usage),
-            "security_violations": len(self.security_violations),
+            "security_violations": self.total_violations,
         }
 
     def get_security_violations(self) -> List[Dict[str, Any]]:
-        """Get security violations."""
-        return self.security_violations.copy()
+        """Get the most recent security violations."""
+        return list(self.security_violations)
 
     def reset_stats(self) -> None:
         """Reset statistics."""
         self.tool_usage.clear()
         self.security_violations.clear()
+        self._violations_by_user.clear()
+        self.total_violations = 0
         logger.info("Tool monitor statistics reset")
 
     def get_user_tool_usage(self, user_id: int) -> Dict[str, Any]:
         """Get tool usage for specific user."""
-        user_violations = [
-            v for v in self.security_violations if v.get("user_id") == user_id
-        ]
+        counts = self._violations_by_user.get(user_id, Counter())
 
         return {
             "user_id": user_id,
-            "security_violations": len(user_violations),
-            "violation_types": list(set(v.get("type") for v in user_violations)),
+            "security_violations": sum(counts.values()),
+            "violation_types": list(counts),
         }
 
     def is_tool_allowed(self, tool_name: str) -> bool:
         """Check if tool is allowed without validation."""
-        # Check allowed list
-        if (
-            hasattr(self.config, "claude_allowed_tools")
-            and self.config.claude_allowed_tools
-        ):
-            if tool_name not in self.config.claude_allowed_tools:
-                return False
-
-        # Check disallowed list
-        if (
-            hasattr(self.config, "claude_disallowed_tools")
-            and self.config.claude_disallowed_tools
-        ):
-            if tool_name in self.config.claude_disallowed_tools:
-                return False
-
-        return True
+        return self.policy.check_tool(tool_name) is None
+
+    def validates_input(self, tool_name: str) -> bool:
+        """Whether the tool's input is checked, not only its name."""
+        return tool_name in self._tool_validators
+
+
+def normalize_tool_input(tool_input: Dict[str, Any]) -> str:
+    """Canonical form of a tool input, used as a decision cache key."""
+    return json.dumps(tool_input, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ToolCallGate:
+    """Validate the tool calls of a single run, caching safe decisions.
+
+    Decisions are keyed by (tool name, normalized input). The user and working
+    directory are fixed for the run, so denials and decisions that depend only
+    on the tool name are reused. Allowed file and shell calls are validated
+    every time: an earlier shell call may have moved or relinked a path, and
+    the validator's own path cache already makes the repeat cheap. Only the
+    first denial of a call is recorded.
+    """
+
+    def __init__(self, monitor: ToolMonitor, working_directory: Path, user_id: int):
+        self.monitor = monitor
+        self.working_directory = working_directory
+        self.user_id = user_id
+        self.denials: List[Tuple[str, str]] = []
+        self.cache_hits = 0
+        self._decisions: Dict[Tuple[str, str], ValidationResult] = {}
+
+    async def check(
+        self, tool_name: str, tool_input: Dict[str, Any]
+    ) -> ValidationResult:
+        """Return whether the tool call may run, and the error if not."""
+        key = (tool_name, normalize_tool_input(tool_input))
+        decision = self._decisions.get(key)
+        if decision is not None:
+            self.cache_hits += 1
+            if decision[0]:
+                self.monitor.tool_usage[tool_name] += 1
+            return decision
+
+        decision = await self.monitor.validate_tool_call(
+            tool_name, tool_input, self.working_directory, self.user_id
+        )
+        if not decision[0] or not self.monitor.validates_input(tool_name):
+            self._decisions[key] = decision
+        if not decision[0]:
+            self.denials.append((tool_name, decision[1] or "Tool call denied"))
+        return decision
+
+    @property
+    def errors(self) -> List[str]:
+        """Errors of the denied tool calls, in order."""
+        return [error for _, error in self.denials]
@@ -22,9 +22,12 @@ from claude_agent_sdk import (
     CLIConnectionError,
     CLIJSONDecodeError,
     CLINotFoundError,
+    HookContext,
+    HookMatcher,
     Message,
     ProcessError,
     ResultMessage,
+    SystemMessage,
     TextBlock,
     ToolResultBlock,
     ToolUseBlock,
@@ -38,7 +41,11 @@ from .exceptions import (
     ClaudeParsingError,
     ClaudeProcessError,
     ClaudeTimeoutError,
+    ClaudeUsageLimitError,
 )
+from .monitor import ToolCallGate
+from .usage_limit import parse_reset_time
+from .watchdog import RunWatchdog, WatchdogLimits
 
 logger = structlog.get_logger()
 
@@ -116,6 +123,8 @@ class ClaudeResponse:
     is_error: bool = False
     error_type: Optional[str] = None
     tools_used: List[Dict[str, Any]] = field(default_factory=list)
+    # Working directory the CLI reported when the run started
+    cwd: Optional[str] = None
 
 
 @dataclass
@@ -128,6 +137,61 @@ class StreamUpdate:
     metadata: Optional[Dict] = None
 
 
+@dataclass
+class TranscriptAccumulator:
+    """Fold SDK messages into response fields as they stream in.
+
+    Only the text parts, tool uses and counters are kept, so a long agent
+    run does not hold on to its whole transcript.
+    """
+
+    content_parts: List[str] = field(default_factory=list)
+    tools_used: List[Dict[str, Any]] = field(default_factory=list)
+    num_turns: int = 0
+    cost: float = 0.0
+    session_id: Optional[str] = None
+    cwd: Optional[str] = None
+    result_received: bool = False
+
+    def add(self, message: Message) -> None:
+        """Fold one message into the accumulated state."""
+        if isinstance(message, AssistantMessage):
+            self.num_turns += 1
+            content = getattr(message, "content", [])
+            if content and isinstance(content, list):
+                timestamp = asyncio.get_event_loop().time()
+                for block in content:
+                    if isinstance(block, ToolUseBlock):
+                        self.tools_used.append(
+                            {
+                                "name": block.name,
+                                "timestamp": timestamp,
+                                "input": block.input,
+                            }
+                        )
+                    elif hasattr(block, "text"):
+                        self.content_parts.append(block.text)
+            elif content:
+                # Fallback for non-list content
+                self.content_parts.append(str(content))
+
+        elif isinstance(message, UserMessage):
+            self.num_turns += 1
+
+        elif isinstance(message, SystemMessage) and message.subtype == "init":
+            self.cwd = message.data.get("cwd")
+
+        elif isinstance(message, ResultMessage) and not self.result_received:
+            self.result_received = True
+            self.cost = getattr(message, "total_cost_usd", 0.0) or 0.0
+            self.session_id = getattr(message, "session_id", None)
+
+    @property
+    def content(self) -> str:
+        """Text of all assistant messages."""
+        return "\n".join(self.content_parts)
+
+
 class ClaudeSDKManager:
     """Manage Claude Code SDK integration."""
 
@@ -158,8 +222,13 @@ class ClaudeSDKManager:
         session_id: Optional[str] = None,
         continue_session: bool = False,
         stream_callback: Optional[Callable[[StreamUpdate], None]] = None,
+        tool_gate: Optional[ToolCallGate] = None,
     ) -> ClaudeResponse:
-        """Execute Claude Code command via SDK."""
+        """Execute Claude Code command via SDK.
+
+        With a ``tool_gate`` every tool call is checked before it runs; a
+        denied call is refused and the run is stopped.
+        """
         start_time = asyncio.get_event_loop().time()
 
         logger.info(
@@ -179,6 +248,13 @@ class ClaudeSDKManager:
                 cli_path=cli_path,
             )
 
+            if tool_gate:
+                options.hooks = {
+                    "PreToolUse": [
+                        HookMatcher(hooks=[self._make_pre_tool_use_hook(tool_gate)])
+                    ]
+                }
+
             # Pass MCP server configuration if enabled
             if self.config.enable_mcp and self.config.mcp_config_path:
                 options.mcp_servers = self._load_mcp_config(self.config.mcp_config_path)
@@ -195,29 +271,18 @@ class ClaudeSDKManager:
                     session_id=session_id,
                 )
 
-            # Collect messages
-            messages = []
-            cost = 0.0
-            tools_used = []
+            # Fold messages into the response as they arrive
+            transcript = TranscriptAccumulator()
 
-            # Execute with streaming and timeout
-            await asyncio.wait_for(
+            # Execute with streaming under per-phase deadlines
+            watchdog = RunWatchdog(WatchdogLimits.from_settings(self.config))
+            await watchdog.run(
                 self._execute_query_with_streaming(
-                    prompt, options, messages, stream_callback
-                ),
-                timeout=self.config.claude_timeout_seconds,
+                    prompt, options, transcript, stream_callback, watchdog
+                )
             )
 
-            # Extract cost, tools, and session_id from result message
-            cost = 0.0
-            tools_used = []
-            claude_session_id = None
-            for message in messages:
-                if isinstance(message, ResultMessage):
-                    cost = getattr(message, "total_cost_usd", 0.0) or 0.0
-                    claude_session_id = getattr(message, "session_id", None)
-                    tools_used = self._extract_tools_from_messages(messages)
-                    break
+            claude_session_id = transcript.session_id
 
             # Calculate duration
             duration_ms = int((asyncio.get_event_loop().time() - start_time) * 1000)
@@ -233,31 +298,26 @@ class ClaudeSDKManager:
                 )
 
             # Update session
-            self._update_session(final_session_id, messages)
+            self._update_session(final_session_id, transcript.num_turns)
 
             return ClaudeResponse(
-                content=self._extract_content_from_messages(messages),
+                content=transcript.content,
                 session_id=final_session_id,
-                cost=cost,
+                cost=transcript.cost,
                 duration_ms=duration_ms,
-                num_turns=len(
-                    [
-                        m
-                        for m in messages
-                        if isinstance(m, (UserMessage, AssistantMessage))
-                    ]
-                ),
-                tools_used=tools_used,
+                num_turns=transcript.num_turns,
+                tools_used=transcript.tools_used if transcript.result_received else [],
+                cwd=transcript.cwd,
             )
 
-        except asyncio.TimeoutError:
+        except ClaudeTimeoutError as e:
             logger.error(
                 "Claude SDK command timed out",
-                timeout_seconds=self.config.claude_timeout_seconds,
-            )
-            raise ClaudeTimeoutError(
-                f"Claude SDK timed out after {self.config.claude_timeout_seconds}s"
+                phase=e.phase,
+                timeout_seconds=e.timeout_seconds,
+                elapsed_seconds=e.elapsed_seconds,
             )
+            raise
 
         except CLINotFoundError as e:
             logger.error("Claude CLI not found", error=str(e))
@@ -278,6 +338,8 @@ class ClaudeSDKManager:
                 error=error_str,
                 exit_code=getattr(e, "exit_code", None),
             )
+            if "usage limit reached" in error_str.lower():
+                raise self._usage_limit_error(error_str)
             # Check if the process error is MCP-related
             if "mcp" in error_str.lower():
                 raise ClaudeMCPError(f"MCP server error: {error_str}")
@@ -327,6 +389,11 @@ class ClaudeSDKManager:
                 )
                 raise ClaudeProcessError(f"Claude SDK task error: {str(e)}")
 
+            # The SDK reports the CLI's error result as a plain exception
+            elif "usage limit reached" in str(e).lower():
+                logger.error("Claude usage limit reached", error=str(e))
+                raise self._usage_limit_error(str(e))
+
             else:
                 logger.error(
                     "Unexpected error in Claude SDK",
@@ -335,13 +402,63 @@ class ClaudeSDKManager:
                 )
                 raise ClaudeProcessError(f"Unexpected error: {str(e)}")
 
+    def _usage_limit_error(self, error_str: str) -> ClaudeUsageLimitError:
+        """Build the usage limit error, with the reset time when known."""
+        reset_at = parse_reset_time(error_str)
+        reset = reset_at.strftime("%H:%M UTC") if reset_at else "later"
+        return ClaudeUsageLimitError(
+            f"⏱️ **Claude AI Usage Limit Reached**\n\n"
+            f"Your limit will reset at **{reset}**.",
+            reset_at=reset_at,
+        )
+
+    def _make_pre_tool_use_hook(self, tool_gate: ToolCallGate) -> Callable:
+        """Build a PreToolUse hook that denies calls rejected by the gate."""
+
+        async def pre_tool_use(
+            input_data: Dict[str, Any],
+            tool_use_id: Optional[str],
+            context: HookContext,
+        ) -> Dict[str, Any]:
+            tool_name = input_data.get("tool_name", "")
+            valid, error = await tool_gate.check(
+                tool_name, input_data.get("tool_input") or {}
+            )
+            if valid:
+                return {}
+
+            logger.warning(
+                "Tool call denied, stopping run",
+                tool_name=tool_name,
+                tool_use_id=tool_use_id,
+                error=error,
+            )
+            return {
+                "continue_": False,
+                "stopReason": error,
+                "hookSpecificOutput": {
+                    "hookEventName": "PreToolUse",
+                    "permissionDecision": "deny",
+                    "permissionDecisionReason": error,
+                },
+            }
+
+        return pre_tool_use
+
     async def _execute_query_with_streaming(
-        self, prompt: str, options, messages: List, stream_callback: Optional[Callable]
+        self,
+        prompt: str,
+        options,
+        transcript: TranscriptAccumulator,
+        stream_callback: Optional[Callable],
+        watchdog: Optional[RunWatchdog] = None,
     ) -> None:
-        """Execute query with streaming and collect messages."""
+        """Execute query with streaming and fold messages into the transcript."""
         try:
             async for message in query(prompt=prompt, options=options):
-                messages.append(message)
+                if watchdog:
+                    watchdog.feed()
+                transcript.add(message)
 
                 # Handle streaming callback
                 if stream_callback:
@@ -415,47 +532,6 @@ class ClaudeSDKManager:
         except Exception as e:
             logger.warning("Stream callback failed", error=str(e))
 
-    def _extract_content_from_messages(self, messages: List[Message]) -> str:
-        """Extract content from message list."""
-        content_parts = []
-
-        for message in messages:
-            if isinstance(message, AssistantMessage):
-                content = getattr(message, "content", [])
-                if content and isinstance(content, list):
-                    # Extract text from TextBlock objects
-                    for block in content:
-                        if hasattr(block, "text"):
-                            content_parts.append(block.text)
-                elif content:
-                    # Fallback for non-list content
-                    content_parts.append(str(content))
-
-        return "\n".join(content_parts)
-
-    def _extract_tools_from_messages(
-        self, messages: List[Message]
-    ) -> List[Dict[str, Any]]:
-        """Extract tools used from message list."""
-        tools_used = []
-        current_time = asyncio.get_event_loop().time()
-
-        for message in messages:
-            if isinstance(message, AssistantMessage):
-                content = getattr(message, "content", [])
-                if content and isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, ToolUseBlock):
-                            tools_used.append(
-                                {
-                                    "name": getattr(block, "tool_name", "unknown"),
-                                    "timestamp": current_time,
-                                    "input": getattr(block, "tool_input", {}),
-                                }
-                            )
-
-        return tools_used
-
     def _load_mcp_config(self, config_path: Path) -> Dict[str, Any]:
         """Load MCP server configuration from a JSON file.
 
@@ -473,16 +549,16 @@ class ClaudeSDKManager:
             )
             return {}
 
-    def _update_session(self, session_id: str, messages: List[Message]) -> None:
+    def _update_session(self, session_id: str, num_turns: int) -> None:
         """Update session data."""
         if session_id not in self.active_sessions:
             self.active_sessions[session_id] = {
-                "messages": [],
+                "num_turns": 0,
                 "created_at": asyncio.get_event_loop().time(),
             }
 
         session_data = self.active_sessions[session_id]
-        session_data["messages"] = messages
+        session_data["num_turns"] += num_turns
         session_data["last_used"] = asyncio.get_event_loop().time()
 
     async def kill_all_processes(self) -> None:
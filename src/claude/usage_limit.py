@@ -0,0 +1,178 @@
+"""Park Claude requests while the account usage limit is exhausted.
+
+When the CLI reports "usage limit reached", every further launch fails the
+same way until the limit resets. ``UsageLimiter`` records the reset time
+once and parks the backend:
+
+- interactive requests fail fast with the resume time
+- event-driven requests (webhooks, scheduled jobs) wait in a bounded queue
+  and are released one at a time, ``drain_interval`` seconds apart, after
+  the reset
+"""
+
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import structlog
+
+from .exceptions import ClaudeUsageLimitError
+
+logger = structlog.get_logger()
+
+# Park duration when the reset time cannot be parsed
+DEFAULT_PARK_SECONDS = 30 * 60
+# Spacing between deferred requests released after the reset
+DRAIN_INTERVAL_SECONDS = 5.0
+# Requests that may wait for the reset at once
+MAX_DEFERRED_REQUESTS = 50
+
+RESET_EPOCH = re.compile(r"usage limit reached\|(\d{9,})", re.IGNORECASE)
+RESET_CLOCK = re.compile(
+    r"reset(?:s)?(?: at)? (\d{1,2})(?::(\d{2}))?\s*([ap]m)", re.IGNORECASE
+)
+RESET_TIMEZONE = re.compile(r"\(([^)]+)\)")
+
+
+def parse_reset_time(
+    error_msg: str, now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """Return when a usage limit resets, from the CLI's error text."""
+    now = now or datetime.now(timezone.utc)
+
+    epoch_match = RESET_EPOCH.search(error_msg)
+    if epoch_match:
+        return datetime.fromtimestamp(int(epoch_match.group(1)), timezone.utc)
+
+    clock_match = RESET_CLOCK.search(error_msg)
+    if not clock_match:
+        return None
+
+    hour = int(clock_match.group(1)) % 12
+    if clock_match.group(3).lower() == "pm":
+        hour += 12
+    minute = int(clock_match.group(2) or 0)
+
+    tz: Any = timezone.utc
+    tz_match = RESET_TIMEZONE.search(error_msg[clock_match.end() :])
+    if tz_match:
+        try:
+            tz = ZoneInfo(tz_match.group(1).strip())
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+
+    local_now = now.astimezone(tz)
+    reset = local_now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if reset <= local_now:
+        reset += timedelta(days=1)
+    return reset.astimezone(timezone.utc)
+
+
+class UsageLimiter:
+    """Global parked state for the Claude backend."""
+
+    def __init__(
+        self,
+        drain_interval: float = DRAIN_INTERVAL_SECONDS,
+        max_deferred: int = MAX_DEFERRED_REQUESTS,
+        default_park_seconds: float = DEFAULT_PARK_SECONDS,
+    ):
+        self.drain_interval = drain_interval
+        self.max_deferred = max_deferred
+        self.default_park_seconds = default_park_seconds
+        self.resume_at: Optional[datetime] = None
+        self.deferred = 0
+        self.rejected = 0
+        self._release_lock = asyncio.Lock()
+        self._next_release = 0.0
+
+    def park(self, reset_at: Optional[datetime] = None) -> datetime:
+        """Park the backend until reset_at, or the default duration."""
+        resume_at = reset_at or datetime.now(timezone.utc) + timedelta(
+            seconds=self.default_park_seconds
+        )
+        if self.resume_at is None or resume_at > self.resume_at:
+            self.resume_at = resume_at
+        logger.warning(
+            "Claude usage limit reached, parking requests",
+            resume_at=self.resume_at.isoformat(),
+            deferred=self.deferred,
+        )
+        return self.resume_at
+
+    def is_parked(self) -> bool:
+        """Whether requests must wait for the usage limit to reset."""
+        if self.resume_at is None:
+            return False
+        if datetime.now(timezone.utc) >= self.resume_at:
+            self.resume_at = None
+            return False
+        return True
+
+    async def acquire(self, defer: bool = False) -> None:
+        """Return once a request may run.
+
+        While parked, raises ``ClaudeUsageLimitError`` unless ``defer`` is set
+        and the queue has room; deferred requests wait for the reset and are
+        then released one per ``drain_interval``.
+        """
+        if not self.is_parked():
+            return
+
+        if not defer or self.deferred >= self.max_deferred:
+            self.rejected += 1
+            raise self._parked_error()
+
+        self.deferred += 1
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                while self.is_parked():
+                    remaining = self.resume_at - datetime.now(timezone.utc)
+                    await asyncio.sleep(max(remaining.total_seconds(), 0.0))
+
+                async with self._release_lock:
+                    delay = self._next_release - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    # A released request may have hit the limit again
+                    if self.is_parked():
+                        continue
+                    self._next_release = loop.time() + self.drain_interval
+                    return
+        finally:
+            self.deferred -= 1
+
+    def get_status(self) -> Dict[str, Any]:
+        """Parked state, queue size and estimated resume time."""
+        parked = self.is_parked()
+        return {
+            "parked": parked,
+            "resume_at": self.resume_at if parked else None,
+            "deferred": self.deferred,
+            "rejected": self.rejected,
+        }
+
+    def describe(self) -> Optional[str]:
+        """One-line parked state for status displays, None when running."""
+        status = self.get_status()
+        if not status["parked"]:
+            return None
+        return (
+            f"Paused by usage limit until {status['resume_at']:%H:%M} UTC"
+            f" · {status['deferred']} deferred"
+        )
+
+    def _parked_error(self) -> ClaudeUsageLimitError:
+        """Error for a request refused while parked."""
+        resume = self.resume_at.strftime("%H:%M UTC")
+        return ClaudeUsageLimitError(
+            f"⏱️ **Claude AI Usage Limit Reached**\n\n"
+            f"Claude requests are paused until **{resume}**.\n\n"
+            f"**What you can do:**\n"
+            f"• Try again after the reset time\n"
+            f"• Check /status for the current state",
+            reset_at=self.resume_at,
+        )
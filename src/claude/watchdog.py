@@ -0,0 +1,114 @@
+"""Per-phase deadlines for Claude runs.
+
+A single timeout around the whole run cannot tell a CLI that never starts
+from a long, productive session. ``RunWatchdog`` tracks three limits:
+
+- ``first_message``: time from start until the first stream message
+- ``idle``: longest gap between two stream messages
+- ``total``: wall clock for the whole run
+
+The backends call ``feed()`` for every stream message. When a limit
+expires the run is cancelled and ``ClaudeTimeoutError`` names the phase.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Tuple, TypeVar
+
+from ..config.settings import Settings
+from .exceptions import ClaudeTimeoutError
+
+T = TypeVar("T")
+
+PHASE_FIRST_MESSAGE = "first_message"
+PHASE_IDLE = "idle"
+PHASE_TOTAL = "total"
+
+
+@dataclass(frozen=True)
+class WatchdogLimits:
+    """Timeouts in seconds for each phase of a run."""
+
+    first_message: float
+    idle: float
+    total: float
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> "WatchdogLimits":
+        """Read the limits from settings."""
+        return cls(
+            first_message=config.claude_first_message_timeout_seconds,
+            idle=config.claude_idle_timeout_seconds,
+            total=config.claude_timeout_seconds,
+        )
+
+
+class RunWatchdog:
+    """Cancel a run when any of its phase deadlines passes."""
+
+    def __init__(
+        self, limits: WatchdogLimits, clock: Callable[[], float] = time.monotonic
+    ):
+        self.limits = limits
+        self._clock = clock
+        self.started_at = clock()
+        self.first_message_at: Optional[float] = None
+        self.last_message_at: Optional[float] = None
+        self.messages = 0
+
+    def feed(self) -> None:
+        """Record stream activity."""
+        now = self._clock()
+        if self.first_message_at is None:
+            self.first_message_at = now
+        self.last_message_at = now
+        self.messages += 1
+
+    def next_deadline(self) -> Tuple[str, float]:
+        """Return the phase and clock time of the earliest pending deadline."""
+        total = (PHASE_TOTAL, self.started_at + self.limits.total)
+        if self.last_message_at is None:
+            pending = (PHASE_FIRST_MESSAGE, self.started_at + self.limits.first_message)
+        else:
+            pending = (PHASE_IDLE, self.last_message_at + self.limits.idle)
+        return min(pending, total, key=lambda deadline: deadline[1])
+
+    async def run(self, coro: Awaitable[T]) -> T:
+        """Await coro, cancelling it if a deadline passes."""
+        self.started_at = self._clock()
+        task = asyncio.ensure_future(coro)
+        try:
+            while True:
+                phase, deadline = self.next_deadline()
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    raise self._timeout_error(phase)
+                done, _ = await asyncio.wait({task}, timeout=remaining)
+                if done:
+                    return task.result()
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+    def _timeout_error(self, phase: str) -> ClaudeTimeoutError:
+        """Build the error for an expired phase."""
+        if phase == PHASE_FIRST_MESSAGE:
+            limit = self.limits.first_message
+            message = f"Claude timed out: no response within {limit:g}s of starting"
+        elif phase == PHASE_IDLE:
+            limit = self.limits.idle
+            message = f"Claude timed out: no activity for {limit:g}s"
+        else:
+            limit = self.limits.total
+            message = f"Claude timed out after {limit:g}s"
+        return ClaudeTimeoutError(
+            message,
+            phase=phase,
+            timeout_seconds=limit,
+            elapsed_seconds=self._clock() - self.started_at,
+        )
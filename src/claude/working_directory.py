@@ -0,0 +1,133 @@
+"""Follow Claude's working directory through a run's tool calls.
+
+Claude Code's Bash tool keeps its shell between calls, so a ``cd`` in one
+command moves every later command. ``final_working_directory`` replays the
+run from the ``cwd`` the CLI reported at start:
+
+- each Bash command is split into shell commands; a ``cd`` that runs in the
+  tool's own shell (not in a pipeline, subshell or background job) moves
+  the tracked directory
+- reserved words that start a command (``then``, ``do``, ``{`` ...) are
+  skipped, so a ``cd`` inside a compound statement is seen. If it may or
+  may not run (after ``||``, in an ``if`` branch or a loop), the directory
+  becomes unknown
+- paths are joined lexically while replaying and the filesystem is only
+  touched once, for the final directory
+- a target that cannot be known without running the shell (``$VAR``,
+  ``cd -``, command substitution) stops tracking until an absolute ``cd``
+"""
+
+import os
+import shlex
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Characters that end a shell command; redirections stay inside words
+_SEPARATOR_CHARS = "();|&\n"
+# Separators that run the command before them outside the tool's shell
+_BACKGROUND = {"|", "|&", "&"}
+# Separators that run the command after them outside the tool's shell
+_PIPES = {"|", "|&"}
+# Reserved words that open and close compound statements
+_OPENERS = {"if", "while", "until", "for", "select", "case"}
+_CLOSERS = {"fi", "done", "esac"}
+# Reserved words that only prefix the command after them
+_PREFIXES = {"then", "else", "elif", "do", "{", "}", "!"}
+
+
+def _split_commands(command: str) -> Optional[List[Tuple[List[str], bool]]]:
+    """Split a command line into the simple commands run by its own shell.
+
+    Each command comes with whether it is conditional: it may not run, or
+    may run more than once. Returns None when the line cannot be tokenized
+    (unbalanced quotes).
+    """
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=_SEPARATOR_CHARS)
+    lexer.whitespace = " \t\r"
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer) + ["\n"]
+    except ValueError:
+        return None
+
+    commands: List[Tuple[List[str], bool]] = []
+    words: List[str] = []
+    depth = 0
+    piped = False
+    # Open compound statements, and whether the last separator was ||
+    blocks = 0
+    after_or = False
+    for i, token in enumerate(tokens):
+        if not all(char in _SEPARATOR_CHARS for char in token):
+            words.append(token)
+            continue
+        # The & of a redirection such as 2>&1 or &>file
+        if token == "&" and (
+            (words and words[-1].endswith((">", "<"))) or tokens[i + 1].startswith(">")
+        ):
+            words.append(token)
+            continue
+
+        ops = set(token.replace("\n", " ").split())
+        conditional = after_or or blocks > 0
+        while words and words[0] in _OPENERS | _CLOSERS | _PREFIXES:
+            keyword, words = words[0], words[1:]
+            if keyword in _CLOSERS:
+                blocks = max(blocks - 1, 0)
+            elif keyword in _OPENERS:
+                blocks += 1
+                # An if condition runs once; a loop condition may run again
+                conditional = conditional or keyword != "if"
+                if keyword in ("for", "select", "case"):
+                    # The variable and word list are not a command
+                    words = []
+        if words and depth == 0 and not piped and not _BACKGROUND & ops:
+            commands.append((words, conditional))
+        words = []
+        piped = bool(_PIPES & ops)
+        after_or = "||" in ops
+        # Case patterns such as "a)" close parentheses that were never opened
+        depth = max(depth + token.count("(") - token.count(")"), 0)
+    return commands
+
+
+def _cd_target(words: List[str]) -> Optional[str]:
+    """The directory a ``cd`` changes to, or None if it depends on the shell."""
+    args = [word for word in words[1:] if not word.startswith("-")]
+    if any(word == "-" for word in words[1:]):
+        return None
+    if not args:
+        return "~"
+    target = args[0]
+    if "$" in target or "`" in target:
+        return None
+    return target
+
+
+def final_working_directory(
+    start: Path, tools_used: Iterable[Dict[str, Any]]
+) -> Optional[Path]:
+    """Directory Claude's shell ended the run in, or None if unknown."""
+    current: Optional[str] = os.path.normpath(str(start))
+    for tool in tools_used:
+        if tool.get("name") != "Bash":
+            continue
+        command = (tool.get("input") or {}).get("command")
+        if not isinstance(command, str) or "cd" not in command:
+            continue
+
+        # Bash rejects a line it cannot parse without running any of it
+        for words, conditional in _split_commands(command) or []:
+            if words[0] != "cd":
+                continue
+            target = _cd_target(words)
+            if target is None or conditional:
+                current = None
+                continue
+            target = os.path.expanduser(target)
+            if os.path.isabs(target):
+                current = os.path.normpath(target)
+            elif current is not None:
+                current = os.path.normpath(os.path.join(current, target))
+
+    return Path(current) if current is not None else None
@@ -28,6 +28,11 @@ class FeatureFlags:
         """Check if file uploads are enabled."""
         return self.settings.enable_file_uploads
 
+    @property
+    def upload_staging_enabled(self) -> bool:
+        """Check if uploads are staged in the working directory."""
+        return self.settings.enable_file_uploads and self.settings.enable_upload_staging
+
     @property
     def quick_actions_enabled(self) -> bool:
         """Check if quick action buttons are enabled."""
@@ -77,6 +82,7 @@ class FeatureFlags:
             "mcp": self.mcp_enabled,
             "git": self.git_enabled,
             "file_uploads": self.file_uploads_enabled,
+            "upload_staging": self.upload_staging_enabled,
             "quick_actions": self.quick_actions_enabled,
             "telemetry": self.telemetry_enabled,
             "token_auth": self.token_auth_enabled,
@@ -97,6 +103,8 @@ class FeatureFlags:
             features.append("git")
         if self.file_uploads_enabled:
             features.append("file_uploads")
+        if self.upload_staging_enabled:
+            features.append("upload_staging")
         if self.quick_actions_enabled:
             features.append("quick_actions")
         if self.telemetry_enabled:
@@ -16,14 +16,20 @@ from pydantic import Field, SecretStr, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from src.utils.constants import (
+    DEFAULT_CLAUDE_FIRST_MESSAGE_TIMEOUT_SECONDS,
+    DEFAULT_CLAUDE_IDLE_TIMEOUT_SECONDS,
     DEFAULT_CLAUDE_MAX_COST_PER_USER,
     DEFAULT_CLAUDE_MAX_TURNS,
     DEFAULT_CLAUDE_TIMEOUT_SECONDS,
     DEFAULT_DATABASE_URL,
+    DEFAULT_MAX_CONCURRENT_UPDATES,
     DEFAULT_MAX_SESSIONS_PER_USER,
+    DEFAULT_MESSAGE_DEBOUNCE_MS,
     DEFAULT_RATE_LIMIT_BURST,
     DEFAULT_RATE_LIMIT_REQUESTS,
     DEFAULT_RATE_LIMIT_WINDOW,
+    DEFAULT_RESPONSE_DOCUMENT_MAX_MESSAGES,
+    DEFAULT_RESPONSE_DOCUMENT_THRESHOLD_CHARS,
     DEFAULT_SESSION_TIMEOUT_HOURS,
 )
 
@@ -69,6 +75,16 @@ class Settings(BaseSettings):
     claude_timeout_seconds: int = Field(
         DEFAULT_CLAUDE_TIMEOUT_SECONDS, description="Claude timeout"
     )
+    claude_first_message_timeout_seconds: int = Field(
+        DEFAULT_CLAUDE_FIRST_MESSAGE_TIMEOUT_SECONDS,
+        description="Max seconds until Claude sends its first stream message",
+        ge=1,
+    )
+    claude_idle_timeout_seconds: int = Field(
+        DEFAULT_CLAUDE_IDLE_TIMEOUT_SECONDS,
+        description="Max seconds between two stream messages from Claude",
+        ge=1,
+    )
     claude_max_cost_per_user: float = Field(
         DEFAULT_CLAUDE_MAX_COST_PER_USER, description="Max cost per user"
     )
@@ -109,6 +125,30 @@ class Settings(BaseSettings):
         DEFAULT_RATE_LIMIT_BURST, description="Burst capacity"
     )
 
+    # Concurrency
+    max_concurrent_updates: int = Field(
+        DEFAULT_MAX_CONCURRENT_UPDATES,
+        description="Max updates processed at once (each user stays in order)",
+        ge=1,
+    )
+    message_debounce_ms: int = Field(
+        DEFAULT_MESSAGE_DEBOUNCE_MS,
+        description="Merge a user's messages sent within this window (0 = off)",
+        ge=0,
+    )
+
+    # Responses
+    response_document_threshold_chars: int = Field(
+        DEFAULT_RESPONSE_DOCUMENT_THRESHOLD_CHARS,
+        description="Send longer responses as a document (0 = off)",
+        ge=0,
+    )
+    response_document_max_messages: int = Field(
+        DEFAULT_RESPONSE_DOCUMENT_MAX_MESSAGES,
+        description="Send responses needing more messages as a document (0 = off)",
+        ge=0,
+    )
+
     # Storage
     database_url: str = Field(
         DEFAULT_DATABASE_URL, description="Database connection URL"
@@ -133,6 +173,11 @@ class Settings(BaseSettings):
     )
     enable_git_integration: bool = Field(True, description="Enable git commands")
     enable_file_uploads: bool = Field(True, description="Enable file upload handling")
+    enable_upload_staging: bool = Field(
+        False,
+        description="Stage uploads in .uploads/ of the working directory "
+        "instead of inlining their contents in prompts",
+    )
     enable_quick_actions: bool = Field(True, description="Enable quick action buttons")
     agentic_mode: bool = Field(
         True,
@@ -166,6 +211,14 @@ class Settings(BaseSettings):
     notification_chat_ids: Optional[List[int]] = Field(
         None, description="Default Telegram chat IDs for proactive notifications"
     )
+    notification_digest_window_seconds: float = Field(
+        0.0,
+        description=(
+            "Buffer proactive notifications per chat for this many seconds and "
+            "send one de-duplicated digest (0 disables digesting)"
+        ),
+        ge=0,
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore"
@@ -4,8 +4,9 @@ AgentHandler: translates events into ClaudeIntegration.run_command() calls.
 NotificationHandler: subscribes to AgentResponseEvent and delivers to Telegram.
 """
 
+import asyncio
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Coroutine, Dict, List, Set
 
 import structlog
 
@@ -22,6 +23,9 @@ class AgentHandler:
     Webhook and scheduled events are converted into prompts and sent
     to ClaudeIntegration.run_command(). The response is published
     back as an AgentResponseEvent for delivery.
+
+    While the usage limit is reached, runs wait for the reset in their own
+    tasks so that the event bus keeps dispatching other events.
     """
 
     def __init__(
@@ -35,6 +39,8 @@ class AgentHandler:
         self.claude = claude_integration
         self.default_working_directory = default_working_directory
         self.default_user_id = default_user_id
+        # Runs waiting for the usage limit to reset
+        self._deferred: Set["asyncio.Task[None]"] = set()
 
     def register(self) -> None:
         """Subscribe to events that need agent processing."""
@@ -45,7 +51,35 @@ class AgentHandler:
         """Process a webhook event through Claude."""
         if not isinstance(event, WebhookEvent):
             return
+        await self._execute(self._run_webhook(event), event)
+
+    async def handle_scheduled(self, event: Event) -> None:
+        """Process a scheduled event through Claude."""
+        if not isinstance(event, ScheduledEvent):
+            return
+        await self._execute(self._run_scheduled(event), event)
+
+    async def _execute(self, run: Coroutine[Any, Any, None], event: Event) -> None:
+        """Await a run, or start it in a task while the usage limit is reached.
+
+        Deferred runs wait until the limit resets, which may take hours; the
+        bus dispatches events one at a time and would stall meanwhile.
+        """
+        if not self.claude.usage_limiter.is_parked():
+            await run
+            return
 
+        logger.info(
+            "Usage limit reached, deferring agent run",
+            event_type=event.event_type,
+            event_id=event.id,
+        )
+        task = asyncio.create_task(run)
+        self._deferred.add(task)
+        task.add_done_callback(self._deferred.discard)
+
+    async def _run_webhook(self, event: WebhookEvent) -> None:
+        """Run Claude on a webhook event and publish the response."""
         logger.info(
             "Processing webhook event through agent",
             provider=event.provider,
@@ -60,6 +94,7 @@ class AgentHandler:
                 prompt=prompt,
                 working_directory=self.default_working_directory,
                 user_id=self.default_user_id,
+                defer_if_limited=True,
             )
 
             if response.content:
@@ -81,11 +116,8 @@ class AgentHandler:
                 event_id=event.id,
             )
 
-    async def handle_scheduled(self, event: Event) -> None:
-        """Process a scheduled event through Claude."""
-        if not isinstance(event, ScheduledEvent):
-            return
-
+    async def _run_scheduled(self, event: ScheduledEvent) -> None:
+        """Run Claude on a scheduled job and publish the response."""
         logger.info(
             "Processing scheduled event through agent",
             job_id=event.job_id,
@@ -105,6 +137,7 @@ class AgentHandler:
                 prompt=prompt,
                 working_directory=working_dir,
                 user_id=self.default_user_id,
+                defer_if_limited=True,
             )
 
             if response.content:
@@ -250,6 +250,8 @@ async def run_application(app: Dict[str, Any]) -> None:
             event_bus=event_bus,
             bot=telegram_bot,
             default_chat_ids=config.notification_chat_ids or [],
+            digest_window_seconds=config.notification_digest_window_seconds,
+            outbox=storage.notifications,
         )
         notification_service.register()
         await notification_service.start()
@@ -1,24 +1,101 @@
 """Notification service for delivering proactive agent responses to Telegram.
 
 Subscribes to AgentResponseEvent on the event bus and delivers messages
-through the Telegram bot API with rate limiting (1 msg/sec per chat).
+through the Telegram bot API. Each chat has its own delivery queue drained
+by a dedicated worker (1 msg/sec per chat), and all workers share a global
+token bucket sized to Telegram's ~30 msg/sec bot-wide limit.
+
+Optional digest mode buffers responses per chat for a short window, drops
+duplicates and sends one combined message instead of many.
+
+When an outbox repository is provided, every delivery is persisted before
+it is sent, retried with exponential backoff on transient errors (network,
+5xx, RetryAfter) and marked delivered with the Telegram message ID. Pending
+rows survive restarts and are re-queued on start.
 """
 
 import asyncio
-from typing import List, Optional
+import hashlib
+import html
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
 
 import structlog
 from telegram import Bot
 from telegram.constants import ParseMode
-from telegram.error import TelegramError
+from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError
 
 from ..events.bus import Event, EventBus
 from ..events.types import AgentResponseEvent
 
+if TYPE_CHECKING:
+    from ..storage.repositories import NotificationOutboxRepository
+
 logger = structlog.get_logger()
 
 # Telegram rate limit: ~30 msgs/sec globally, ~1 msg/sec per chat
 SEND_INTERVAL_SECONDS = 1.1
+GLOBAL_SEND_RATE_PER_SECOND = 30.0
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+# Per-chat workers exit after this long without work
+CHAT_WORKER_IDLE_SECONDS = 30.0
+
+# Retry policy for transient delivery errors
+MAX_DELIVERY_ATTEMPTS = 8
+RETRY_BASE_DELAY_SECONDS = 2.0
+RETRY_MAX_DELAY_SECONDS = 300.0
+
+# Separator between entries in a combined digest message
+DIGEST_SEPARATOR = "\n\n" + "\u2500" * 12 + "\n\n"
+
+
+class TokenBucket:
+    """Async token bucket shared by all per-chat delivery workers."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._last_refill: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            while True:
+                now = loop.time()
+                if self._last_refill is not None:
+                    elapsed = now - self._last_refill
+                    self._tokens = min(
+                        self.capacity, self._tokens + elapsed * self.rate
+                    )
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class PendingDelivery:
+    """A notification queued for one chat, with its retry state."""
+
+    event: AgentResponseEvent
+    outbox_ids: List[int] = field(default_factory=list)
+    attempts: int = 0
+    delivered_chunks: int = 0
+    telegram_message_id: Optional[int] = None
+    not_before: float = 0.0  # event loop time
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether nothing has been attempted yet for this delivery."""
+        return self.attempts == 0 and self.delivered_chunks == 0
 
 
 class NotificationService:
@@ -29,12 +106,24 @@ class NotificationService:
         event_bus: EventBus,
         bot: Bot,
         default_chat_ids: Optional[List[int]] = None,
+        global_rate_per_second: float = GLOBAL_SEND_RATE_PER_SECOND,
+        digest_window_seconds: float = 0.0,
+        outbox: Optional["NotificationOutboxRepository"] = None,
     ) -> None:
         self.event_bus = event_bus
         self.bot = bot
         self.default_chat_ids = default_chat_ids or []
+        self.outbox = outbox
         self._send_queue: asyncio.Queue[AgentResponseEvent] = asyncio.Queue()
+        self._chat_queues: Dict[int, asyncio.Queue[PendingDelivery]] = {}
+        self._chat_workers: Dict[int, asyncio.Task[None]] = {}
         self._last_send_per_chat: dict[int, float] = {}
+        self._paused_until_per_chat: dict[int, float] = {}
+        self._global_bucket = TokenBucket(global_rate_per_second)
+        self.digest_window_seconds = digest_window_seconds
+        self._digest_buffers: Dict[int, List[AgentResponseEvent]] = {}
+        self._digest_keys: Dict[int, Set[str]] = {}
+        self._digest_tasks: Dict[int, asyncio.Task[None]] = {}
         self._running = False
         self._sender_task: Optional[asyncio.Task[None]] = None
 
@@ -43,24 +132,38 @@ class NotificationService:
         self.event_bus.subscribe(AgentResponseEvent, self.handle_response)
 
     async def start(self) -> None:
-        """Start the send queue processor."""
+        """Start the send queue processor and resume pending deliveries."""
         if self._running:
             return
         self._running = True
+        await self._restore_pending()
         self._sender_task = asyncio.create_task(self._process_send_queue())
         logger.info("Notification service started")
 
     async def stop(self) -> None:
-        """Stop the send queue processor."""
+        """Stop the send queue processor and all per-chat workers.
+
+        With an outbox, anything not yet persisted (undispatched events and
+        open digests) is written as pending so it is sent after restart.
+        """
         if not self._running:
             return
         self._running = False
+        tasks = list(self._chat_workers.values()) + list(self._digest_tasks.values())
         if self._sender_task:
-            self._sender_task.cancel()
-            try:
-                await self._sender_task
-            except asyncio.CancelledError:
-                pass
+            tasks.append(self._sender_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self.outbox:
+            await self._persist_undispatched()
+
+        self._chat_workers.clear()
+        self._chat_queues.clear()
+        self._digest_tasks.clear()
+        self._digest_buffers.clear()
+        self._digest_keys.clear()
         logger.info("Notification service stopped")
 
     async def handle_response(self, event: Event) -> None:
@@ -70,7 +173,7 @@ class NotificationService:
         await self._send_queue.put(event)
 
     async def _process_send_queue(self) -> None:
-        """Process queued messages with rate limiting."""
+        """Fan queued messages out to per-chat delivery queues."""
         while self._running:
             try:
                 event = await asyncio.wait_for(self._send_queue.get(), timeout=1.0)
@@ -80,8 +183,189 @@ class NotificationService:
                 break
 
             chat_ids = self._resolve_chat_ids(event)
-            for chat_id in chat_ids:
-                await self._rate_limited_send(chat_id, event)
+            if self.digest_window_seconds > 0:
+                for chat_id in chat_ids:
+                    self._add_to_digest(chat_id, event)
+            else:
+                await self._schedule_deliveries(
+                    [(chat_id, event) for chat_id in chat_ids]
+                )
+
+    async def _schedule_deliveries(
+        self, targets: List["tuple[int, AgentResponseEvent]"]
+    ) -> None:
+        """Persist deliveries to the outbox (if any) and queue them per chat."""
+        deliveries = [(chat_id, PendingDelivery(event)) for chat_id, event in targets]
+
+        if self.outbox and deliveries:
+            try:
+                ids = await self.outbox.enqueue(
+                    [
+                        self._to_outbox_model(chat_id, delivery.event)
+                        for chat_id, delivery in deliveries
+                    ]
+                )
+                for (_, delivery), outbox_id in zip(deliveries, ids):
+                    delivery.outbox_ids = [outbox_id]
+            except Exception:
+                logger.exception("Failed to persist notifications to outbox")
+
+        for chat_id, delivery in deliveries:
+            self._enqueue_for_chat(chat_id, delivery)
+
+    def _enqueue_for_chat(self, chat_id: int, delivery: PendingDelivery) -> None:
+        """Put a delivery on a chat's queue, starting its worker if needed."""
+        queue = self._chat_queues.get(chat_id)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._chat_queues[chat_id] = queue
+        queue.put_nowait(delivery)
+
+        if chat_id not in self._chat_workers:
+            self._chat_workers[chat_id] = asyncio.create_task(
+                self._process_chat_queue(chat_id, queue)
+            )
+
+    async def _process_chat_queue(
+        self, chat_id: int, queue: "asyncio.Queue[PendingDelivery]"
+    ) -> None:
+        """Deliver one chat's messages in order until it goes idle."""
+        carry: Optional[PendingDelivery] = None
+        try:
+            while self._running:
+                if carry is not None:
+                    delivery, carry = carry, None
+                else:
+                    try:
+                        delivery = await asyncio.wait_for(
+                            queue.get(), timeout=CHAT_WORKER_IDLE_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        if queue.empty():
+                            break
+                        continue
+
+                # Batch a backlog of short messages into as few sends as fit
+                while not queue.empty():
+                    following = queue.get_nowait()
+                    merged = self._merge_deliveries(chat_id, delivery, following)
+                    if merged is None:
+                        carry = following
+                        break
+                    delivery = merged
+
+                await self._deliver(chat_id, delivery)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # No await between the empty check and removal, so a concurrent
+            # _enqueue_for_chat either sees this worker or starts a new one.
+            if self._chat_workers.get(chat_id) is asyncio.current_task():
+                del self._chat_workers[chat_id]
+                self._chat_queues.pop(chat_id, None)
+
+    @staticmethod
+    def _merge_deliveries(
+        chat_id: int, first: PendingDelivery, second: PendingDelivery
+    ) -> Optional[PendingDelivery]:
+        """Combine two queued deliveries into one send if they fit."""
+        if not (first.is_fresh and second.is_fresh):
+            return None
+        if first.event.parse_mode != second.event.parse_mode:
+            return None
+
+        text = first.event.text + "\n\n" + second.event.text
+        if len(text) > TELEGRAM_MAX_MESSAGE_LENGTH:
+            return None
+
+        return PendingDelivery(
+            event=AgentResponseEvent(
+                chat_id=chat_id,
+                text=text,
+                parse_mode=first.event.parse_mode,
+                originating_event_id=first.event.originating_event_id,
+            ),
+            outbox_ids=first.outbox_ids + second.outbox_ids,
+            not_before=max(first.not_before, second.not_before),
+        )
+
+    def _add_to_digest(self, chat_id: int, event: AgentResponseEvent) -> None:
+        """Buffer an event for the chat's digest, dropping duplicates."""
+        keys = self._digest_keys.setdefault(chat_id, set())
+        event_keys = self._dedupe_keys(event)
+        if keys & event_keys:
+            logger.debug(
+                "Dropping duplicate notification",
+                chat_id=chat_id,
+                event_id=event.id,
+                originating_event=event.originating_event_id,
+            )
+            return
+
+        keys.update(event_keys)
+        self._digest_buffers.setdefault(chat_id, []).append(event)
+
+        if chat_id not in self._digest_tasks:
+            self._digest_tasks[chat_id] = asyncio.create_task(
+                self._flush_digest_after_window(chat_id)
+            )
+
+    async def _flush_digest_after_window(self, chat_id: int) -> None:
+        """Wait out the digest window, then queue one combined message."""
+        try:
+            await asyncio.sleep(self.digest_window_seconds)
+        except asyncio.CancelledError:
+            return
+
+        self._digest_tasks.pop(chat_id, None)
+        self._digest_keys.pop(chat_id, None)
+        events = self._digest_buffers.pop(chat_id, [])
+        if events:
+            await self._schedule_deliveries(
+                [(chat_id, self._combine_events(chat_id, events))]
+            )
+
+    @staticmethod
+    def _dedupe_keys(event: AgentResponseEvent) -> Set[str]:
+        """Keys that identify an event as a duplicate of another.
+
+        Two events are duplicates if they share an originating event or if
+        their text matches after whitespace and case normalisation.
+        """
+        normalized = " ".join(event.text.split()).casefold()
+        keys = {"text:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()}
+        if event.originating_event_id:
+            keys.add("origin:" + event.originating_event_id)
+        return keys
+
+    @staticmethod
+    def _combine_events(
+        chat_id: int, events: List[AgentResponseEvent]
+    ) -> AgentResponseEvent:
+        """Merge buffered events into a single digest event."""
+        if len(events) == 1:
+            return events[0]
+
+        # Plain-text entries are escaped so one HTML entry keeps the digest HTML
+        parse_mode = (
+            "HTML" if any(event.parse_mode == "HTML" for event in events) else None
+        )
+        texts = [
+            (
+                html.escape(event.text, quote=False)
+                if parse_mode == "HTML" and event.parse_mode != "HTML"
+                else event.text
+            )
+            for event in events
+        ]
+
+        logger.info("Sending notification digest", chat_id=chat_id, count=len(events))
+        return AgentResponseEvent(
+            chat_id=chat_id,
+            text=DIGEST_SEPARATOR.join(texts),
+            parse_mode=parse_mode,
+            originating_event_id=events[0].originating_event_id,
+        )
 
     def _resolve_chat_ids(self, event: AgentResponseEvent) -> List[int]:
         """Determine which chats to send to."""
@@ -89,47 +373,246 @@ class NotificationService:
             return [event.chat_id]
         return list(self.default_chat_ids)
 
-    async def _rate_limited_send(self, chat_id: int, event: AgentResponseEvent) -> None:
-        """Send message with per-chat rate limiting."""
-        loop = asyncio.get_event_loop()
-        now = loop.time()
-        last_send = self._last_send_per_chat.get(chat_id, 0.0)
-        wait_time = SEND_INTERVAL_SECONDS - (now - last_send)
+    async def _deliver(self, chat_id: int, delivery: PendingDelivery) -> None:
+        """Send a delivery, retrying transient errors with backoff.
 
-        if wait_time > 0:
-            await asyncio.sleep(wait_time)
+        Retries happen inline so later messages for the same chat stay
+        behind this one; other chats are unaffected.
+        """
+        event = delivery.event
+        # Split long messages (Telegram limit: 4096 chars)
+        chunks = self._split_message(event.text)
+        loop = asyncio.get_running_loop()
 
-        try:
-            # Split long messages (Telegram limit: 4096 chars)
-            text = event.text
-            chunks = self._split_message(text)
+        while True:
+            wait_time = delivery.not_before - loop.time()
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+
+            try:
+                for index in range(delivery.delivered_chunks, len(chunks)):
+                    message = await self._send_chunk(chat_id, chunks[index], event)
+                    if delivery.telegram_message_id is None:
+                        delivery.telegram_message_id = self._message_id(message)
+                    delivery.delivered_chunks = index + 1
+                    if delivery.delivered_chunks < len(chunks):
+                        await self._update_outbox(
+                            "mark_progress",
+                            delivery,
+                            delivery.delivered_chunks,
+                            delivery.telegram_message_id,
+                        )
+            except TelegramError as e:
+                delivery.attempts += 1
+                if (
+                    not self._is_transient(e)
+                    or delivery.attempts >= MAX_DELIVERY_ATTEMPTS
+                ):
+                    logger.error(
+                        "Failed to send notification",
+                        chat_id=chat_id,
+                        error=str(e),
+                        event_id=event.id,
+                        attempts=delivery.attempts,
+                    )
+                    await self._update_outbox("mark_failed", delivery, str(e))
+                    return
 
-            for chunk in chunks:
-                await self.bot.send_message(
+                delay = self._retry_delay(e, delivery.attempts)
+                delivery.not_before = loop.time() + delay
+                logger.warning(
+                    "Notification delivery failed, will retry",
                     chat_id=chat_id,
-                    text=chunk,
-                    parse_mode=(ParseMode.HTML if event.parse_mode == "HTML" else None),
+                    error=str(e),
+                    event_id=event.id,
+                    attempt=delivery.attempts,
+                    retry_in=delay,
                 )
-                self._last_send_per_chat[chat_id] = asyncio.get_event_loop().time()
-
-                # Rate limit between chunks too
-                if len(chunks) > 1:
-                    await asyncio.sleep(SEND_INTERVAL_SECONDS)
+                await self._update_outbox(
+                    "schedule_retry",
+                    delivery,
+                    delivery.attempts,
+                    datetime.utcnow() + timedelta(seconds=delay),
+                    str(e),
+                )
+                continue
 
+            await self._update_outbox(
+                "mark_delivered", delivery, delivery.telegram_message_id
+            )
             logger.info(
                 "Notification sent",
                 chat_id=chat_id,
-                text_length=len(text),
+                text_length=len(event.text),
                 chunks=len(chunks),
                 originating_event=event.originating_event_id,
+                telegram_message_id=delivery.telegram_message_id,
             )
-        except TelegramError as e:
-            logger.error(
-                "Failed to send notification",
+            return
+
+    async def _send_chunk(
+        self, chat_id: int, chunk: str, event: AgentResponseEvent
+    ) -> Any:
+        """Send a single chunk under the per-chat and global rate limits.
+
+        A RetryAfter pauses only this chat before being re-raised.
+        """
+        await self._wait_for_chat_slot(chat_id)
+        await self._global_bucket.acquire()
+
+        try:
+            message = await self.bot.send_message(
                 chat_id=chat_id,
-                error=str(e),
-                event_id=event.id,
+                text=chunk,
+                parse_mode=(ParseMode.HTML if event.parse_mode == "HTML" else None),
             )
+        except RetryAfter as e:
+            self._paused_until_per_chat[chat_id] = (
+                asyncio.get_running_loop().time() + self._retry_after_seconds(e)
+            )
+            raise
+
+        self._last_send_per_chat[chat_id] = asyncio.get_running_loop().time()
+        return message
+
+    async def _wait_for_chat_slot(self, chat_id: int) -> None:
+        """Sleep until this chat may send again (1 msg/sec or RetryAfter)."""
+        now = asyncio.get_running_loop().time()
+        last_send = self._last_send_per_chat.get(chat_id)
+        ready_at = last_send + SEND_INTERVAL_SECONDS if last_send is not None else now
+        ready_at = max(ready_at, self._paused_until_per_chat.get(chat_id, now))
+
+        wait_time = ready_at - now
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    async def _update_outbox(
+        self, method: str, delivery: PendingDelivery, *args: Any
+    ) -> None:
+        """Apply a status change to the delivery's outbox rows, if any."""
+        if not self.outbox or not delivery.outbox_ids:
+            return
+        try:
+            if method == "mark_progress":
+                # Merged deliveries are single-chunk, so there is one row
+                await self.outbox.mark_progress(delivery.outbox_ids[0], *args)
+            else:
+                await getattr(self.outbox, method)(delivery.outbox_ids, *args)
+        except Exception:
+            logger.exception(
+                "Failed to update notification outbox",
+                method=method,
+                outbox_ids=delivery.outbox_ids,
+            )
+
+    async def _restore_pending(self) -> None:
+        """Re-queue deliveries left pending by a previous run."""
+        if not self.outbox:
+            return
+        try:
+            rows = await self.outbox.get_pending()
+        except Exception:
+            logger.exception("Failed to load pending notifications")
+            return
+
+        loop = asyncio.get_running_loop()
+        now = datetime.utcnow()
+        for row in rows:
+            delay = (
+                (row.next_attempt_at - now).total_seconds()
+                if row.next_attempt_at
+                else 0.0
+            )
+            event = AgentResponseEvent(
+                chat_id=row.chat_id,
+                text=row.text,
+                parse_mode=row.parse_mode,
+                originating_event_id=row.originating_event_id,
+            )
+            if row.event_id:
+                event.id = row.event_id
+            self._enqueue_for_chat(
+                row.chat_id,
+                PendingDelivery(
+                    event=event,
+                    outbox_ids=[row.id],
+                    attempts=row.attempts,
+                    delivered_chunks=row.delivered_chunks,
+                    telegram_message_id=row.telegram_message_id,
+                    not_before=loop.time() + max(delay, 0.0),
+                ),
+            )
+
+        if rows:
+            logger.info("Restored pending notifications", count=len(rows))
+
+    async def _persist_undispatched(self) -> None:
+        """Write events that never reached the outbox as pending rows."""
+        targets = []
+        while not self._send_queue.empty():
+            event = self._send_queue.get_nowait()
+            targets.extend(
+                (chat_id, event) for chat_id in self._resolve_chat_ids(event)
+            )
+        for chat_id, events in self._digest_buffers.items():
+            if events:
+                targets.append((chat_id, self._combine_events(chat_id, events)))
+
+        if not targets:
+            return
+        try:
+            await self.outbox.enqueue(
+                [self._to_outbox_model(chat_id, event) for chat_id, event in targets]
+            )
+            logger.info("Persisted undelivered notifications", count=len(targets))
+        except Exception:
+            logger.exception("Failed to persist notifications on shutdown")
+
+    @staticmethod
+    def _to_outbox_model(chat_id: int, event: AgentResponseEvent) -> Any:
+        """Build an outbox row for one chat."""
+        from ..storage.models import NotificationOutboxModel
+
+        return NotificationOutboxModel(
+            chat_id=chat_id,
+            text=event.text,
+            parse_mode=event.parse_mode,
+            event_id=event.id,
+            originating_event_id=event.originating_event_id,
+            created_at=datetime.utcnow(),
+        )
+
+    @staticmethod
+    def _is_transient(error: TelegramError) -> bool:
+        """Whether an error is worth retrying (flood, network, 5xx)."""
+        if isinstance(error, RetryAfter):
+            return True
+        # PTB raises NetworkError for timeouts and 5xx responses;
+        # BadRequest subclasses it but is permanent.
+        return isinstance(error, NetworkError) and not isinstance(error, BadRequest)
+
+    @classmethod
+    def _retry_delay(cls, error: TelegramError, attempts: int) -> float:
+        """Exponential backoff, or Telegram's own delay for RetryAfter."""
+        if isinstance(error, RetryAfter):
+            return cls._retry_after_seconds(error)
+        return min(
+            RETRY_BASE_DELAY_SECONDS * 2 ** (attempts - 1), RETRY_MAX_DELAY_SECONDS
+        )
+
+    @staticmethod
+    def _retry_after_seconds(error: RetryAfter) -> float:
+        """Normalise RetryAfter.retry_after (int or timedelta) to seconds."""
+        retry_after = error.retry_after
+        if isinstance(retry_after, timedelta):
+            return retry_after.total_seconds()
+        return float(retry_after)
+
+    @staticmethod
+    def _message_id(message: Any) -> Optional[int]:
+        """Extract the Telegram message ID from a send_message result."""
+        message_id = getattr(message, "message_id", None)
+        return message_id if isinstance(message_id, int) else None
 
     def _split_message(self, text: str, max_length: int = 4096) -> List[str]:
         """Split long messages at paragraph boundaries."""
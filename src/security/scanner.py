@@ -0,0 +1,125 @@
+"""Precompiled multi-rule pattern scanner.
+
+Security checks used to loop over lists of regex strings and call
+``re.search(..., re.IGNORECASE)`` once per pattern, which scans the input
+once per rule. ``PatternScanner`` compiles a rule set into one alternation
+per case mode and reports every matching rule from a single pass:
+
+- Case-insensitive rules are matched against ``text.lower()`` without the
+  IGNORECASE flag, which keeps the regex engine's literal-prefix fast path.
+  Their literals must therefore be lowercase; character classes such as
+  ``[A-Za-z]`` are fine.
+- Case-sensitive rules are matched against the original text.
+
+The scan only revisits positions where some rule starts to match, checking
+each rule still unmatched there, so overlapping matches are never hidden.
+
+Rule sets remain plain data; callers own their rules and share the scanner.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Pattern, Set, Tuple
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """A single named pattern in a rule set."""
+
+    pattern: str
+    category: str = ""
+    ignore_case: bool = True
+
+
+class PatternScanner:
+    """Find every matching rule in a text with one pass per case mode."""
+
+    def __init__(self, rules: Iterable[ScanRule]):
+        self.rules: Tuple[ScanRule, ...] = tuple(rules)
+        self._groups: List[
+            Tuple[bool, Pattern[str], List[Tuple[int, Pattern[str]]]]
+        ] = []
+
+        for ignore_case in (True, False):
+            members = [
+                (index, re.compile(rule.pattern))
+                for index, rule in enumerate(self.rules)
+                if rule.ignore_case == ignore_case
+            ]
+            if members:
+                combined = re.compile(
+                    "|".join(f"(?:{regex.pattern})" for _, regex in members)
+                )
+                self._groups.append((ignore_case, combined, members))
+
+    @classmethod
+    def from_patterns(
+        cls, patterns: Iterable[str], category: str = "", ignore_case: bool = True
+    ) -> "PatternScanner":
+        """Build a scanner from bare pattern strings sharing one category."""
+        return cls(
+            ScanRule(pattern, category=category, ignore_case=ignore_case)
+            for pattern in patterns
+        )
+
+    def scan(self, text: str) -> List[ScanRule]:
+        """Return every rule that matches anywhere in text, in rule order."""
+        if not text:
+            return []
+
+        found: Set[int] = set()
+        lowered: Optional[str] = None
+        for ignore_case, combined, members in self._groups:
+            if ignore_case:
+                if lowered is None:
+                    lowered = text.lower()
+                subject = lowered
+            else:
+                subject = text
+            self._scan_group(subject, combined, members, found)
+
+        return [self.rules[index] for index in sorted(found)]
+
+    def first_match(self, text: str) -> Optional[ScanRule]:
+        """Return the first matching rule in rule order, if any."""
+        matches = self.scan(text)
+        return matches[0] if matches else None
+
+    def matches(self, text: str) -> bool:
+        """Whether any rule matches text."""
+        if not text:
+            return False
+        lowered: Optional[str] = None
+        for ignore_case, combined, _ in self._groups:
+            if ignore_case:
+                if lowered is None:
+                    lowered = text.lower()
+                if combined.search(lowered):
+                    return True
+            elif combined.search(text):
+                return True
+        return False
+
+    @staticmethod
+    def _scan_group(
+        subject: str,
+        combined: Pattern[str],
+        members: List[Tuple[int, Pattern[str]]],
+        found: Set[int],
+    ) -> None:
+        """Collect matching rules from one case-mode group."""
+        remaining = members
+        pos = 0
+        while remaining:
+            hit = combined.search(subject, pos)
+            if hit is None:
+                return
+            start = hit.start()
+            unmatched = []
+            for index, regex in remaining:
+                if regex.match(subject, start):
+                    found.add(index)
+                else:
+                    unmatched.append((index, regex))
+            remaining = unmatched
+            pos = start + 1
@@ -7,16 +7,29 @@ Features:
 - Input sanitization
 """
 
+import os
 import re
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 
+from .scanner import PatternScanner
+
 # from src.exceptions import SecurityError  # Future use
 
 logger = structlog.get_logger()
 
+# validate_path result: (is_valid, resolved_path, error_message)
+PathValidation = Tuple[bool, Optional[Path], Optional[str]]
+# Cached validation: (expires_at, (st_dev, st_ino), result)
+PathCacheEntry = Tuple[float, Tuple[int, int], PathValidation]
+
+# Characters stripped by sanitize_command_input
+UNSAFE_COMMAND_CHARS = re.compile(r"[`$;|&<>#\x00-\x1f\x7f]")
+
 
 class SecurityValidator:
     """Security validation for user inputs."""
@@ -131,9 +144,32 @@ class SecurityValidator:
         r".*\.rar$",  # Archives (potentially dangerous)
     ]
 
-    def __init__(self, approved_directory: Path):
+    # Resolved-path cache bounds
+    PATH_CACHE_SIZE = 1024
+    PATH_CACHE_TTL_SECONDS = 5.0
+
+    def __init__(
+        self,
+        approved_directory: Path,
+        path_cache_size: int = PATH_CACHE_SIZE,
+        path_cache_ttl: float = PATH_CACHE_TTL_SECONDS,
+    ):
         """Initialize validator with approved directory."""
         self.approved_directory = approved_directory.resolve()
+
+        # (user_path, current_dir) -> (expires_at, file identity, result)
+        self._path_cache: "OrderedDict[Tuple[str, str], PathCacheEntry]" = OrderedDict()
+        self.path_cache_size = path_cache_size
+        self.path_cache_ttl = path_cache_ttl
+        self.path_cache_hits = 0
+        self.path_cache_misses = 0
+        self.path_cache_evictions = 0
+        self._dangerous_scanner = PatternScanner.from_patterns(
+            self.DANGEROUS_PATTERNS, category="dangerous_pattern"
+        )
+        self._dangerous_file_scanner = PatternScanner.from_patterns(
+            self.DANGEROUS_FILE_PATTERNS, category="dangerous_file"
+        )
         logger.info(
             "Security validator initialized",
             approved_directory=str(self.approved_directory),
@@ -155,18 +191,18 @@ class SecurityValidator:
             user_path = user_path.strip()
 
             # Check for dangerous patterns
-            for pattern in self.DANGEROUS_PATTERNS:
-                if re.search(pattern, user_path, re.IGNORECASE):
-                    logger.warning(
-                        "Dangerous pattern detected in path",
-                        path=user_path,
-                        pattern=pattern,
-                    )
-                    return (
-                        False,
-                        None,
-                        f"Invalid path: contains forbidden pattern '{pattern}'",
-                    )
+            rule = self._dangerous_scanner.first_match(user_path)
+            if rule:
+                logger.warning(
+                    "Dangerous pattern detected in path",
+                    path=user_path,
+                    pattern=rule.pattern,
+                )
+                return (
+                    False,
+                    None,
+                    f"Invalid path: contains forbidden pattern '{rule.pattern}'",
+                )
 
             # Handle path resolution
             current_dir = current_dir or self.approved_directory
@@ -178,30 +214,132 @@ class SecurityValidator:
                 # Relative path
                 target = current_dir / user_path
 
+            cache_key = (user_path, str(current_dir))
+            identity = self._file_identity(target)
+            cached = self._get_cached_path(cache_key, identity)
+            if cached is not None:
+                return cached
+
             # Resolve path and check boundaries
-            target = target.resolve()
+            resolved = target.resolve()
 
             # Ensure target is within approved directory
-            if not self._is_within_directory(target, self.approved_directory):
+            if not self._is_within_directory(resolved, self.approved_directory):
                 logger.warning(
                     "Path traversal attempt detected",
                     requested_path=user_path,
-                    resolved_path=str(target),
+                    resolved_path=str(resolved),
                     approved_directory=str(self.approved_directory),
                 )
-                return False, None, "Access denied: path outside approved directory"
+                result: PathValidation = (
+                    False,
+                    None,
+                    "Access denied: path outside approved directory",
+                )
+            else:
+                logger.debug(
+                    "Path validation successful",
+                    original_path=user_path,
+                    resolved_path=str(resolved),
+                )
+                result = (True, resolved, None)
 
-            logger.debug(
-                "Path validation successful",
-                original_path=user_path,
-                resolved_path=str(target),
-            )
-            return True, target, None
+            self._cache_path(cache_key, identity, result)
+            return result
 
         except Exception as e:
             logger.error("Path validation error", path=user_path, error=str(e))
             return False, None, f"Invalid path: {str(e)}"
 
+    def _get_cached_path(
+        self, key: Tuple[str, str], identity: Optional[Tuple[int, int]]
+    ) -> Optional[PathValidation]:
+        """Return a cached result if it is fresh and still the same file.
+
+        The entry is only trusted while the unresolved path still refers to
+        the file it was validated against, so swapping in a symlink or
+        renaming a directory on the way makes it a miss. Entries are dropped
+        after the TTL so symlinked paths are re-resolved regularly.
+        """
+        entry = self._path_cache.get(key)
+        if entry is None:
+            self.path_cache_misses += 1
+            return None
+
+        expires_at, cached_identity, result = entry
+        if time.monotonic() >= expires_at or identity != cached_identity:
+            del self._path_cache[key]
+            self.path_cache_misses += 1
+            return None
+
+        self._path_cache.move_to_end(key)
+        self.path_cache_hits += 1
+        return result
+
+    def _cache_path(
+        self,
+        key: Tuple[str, str],
+        identity: Optional[Tuple[int, int]],
+        result: PathValidation,
+    ) -> None:
+        """Store a resolution result for an existing file."""
+        # Missing paths are not cached: a symlink could appear there later
+        if identity is None or self.path_cache_size <= 0:
+            return
+        self._path_cache[key] = (
+            time.monotonic() + self.path_cache_ttl,
+            identity,
+            result,
+        )
+        self._path_cache.move_to_end(key)
+        while len(self._path_cache) > self.path_cache_size:
+            self._path_cache.popitem(last=False)
+            self.path_cache_evictions += 1
+
+    @staticmethod
+    def _file_identity(path: Path) -> Optional[Tuple[int, int]]:
+        """(device, inode) the path currently points to, or None if missing."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def invalidate_path_cache(self, path: Optional[Path] = None) -> int:
+        """Drop cached path validations, e.g. after a directory is renamed.
+
+        With a path, only entries whose resolved target or working directory
+        is at or below it are dropped. Returns the number of entries removed.
+        """
+        if path is None:
+            removed = len(self._path_cache)
+            self._path_cache.clear()
+            return removed
+
+        base = Path(path).resolve()
+        stale = [
+            key
+            for key, (_, _, result) in self._path_cache.items()
+            if self._is_within_directory(Path(key[1]), base)
+            or (result[1] is not None and self._is_within_directory(result[1], base))
+        ]
+        for key in stale:
+            del self._path_cache[key]
+        return len(stale)
+
+    def get_path_cache_stats(self) -> Dict[str, Any]:
+        """Get path validation cache metrics."""
+        lookups = self.path_cache_hits + self.path_cache_misses
+        return {
+            "size": len(self._path_cache),
+            "max_size": self.path_cache_size,
+            "ttl_seconds": self.path_cache_ttl,
+            "hits": self.path_cache_hits,
+            "misses": self.path_cache_misses,
+            "evictions": self.path_cache_evictions,
+            "hit_rate": self.path_cache_hits / lookups if lookups else 0.0,
+        }
+
     def _is_within_directory(self, path: Path, directory: Path) -> bool:
         """Check if path is within directory."""
         try:
@@ -228,12 +366,12 @@ class SecurityValidator:
             return False, "Invalid filename: contains path separators"
 
         # Check for forbidden patterns
-        for pattern in self.DANGEROUS_PATTERNS:
-            if re.search(pattern, filename, re.IGNORECASE):
-                logger.warning(
-                    "Dangerous pattern in filename", filename=filename, pattern=pattern
-                )
-                return False, "Invalid filename: contains forbidden pattern"
+        rule = self._dangerous_scanner.first_match(filename)
+        if rule:
+            logger.warning(
+                "Dangerous pattern in filename", filename=filename, pattern=rule.pattern
+            )
+            return False, "Invalid filename: contains forbidden pattern"
 
         # Check for forbidden filenames
         if filename.lower() in {name.lower() for name in self.FORBIDDEN_FILENAMES}:
@@ -241,12 +379,12 @@ class SecurityValidator:
             return False, f"Forbidden filename: {filename}"
 
         # Check for dangerous file patterns
-        for pattern in self.DANGEROUS_FILE_PATTERNS:
-            if re.match(pattern, filename, re.IGNORECASE):
-                logger.warning(
-                    "Dangerous file pattern", filename=filename, pattern=pattern
-                )
-                return False, f"File type not allowed: {filename}"
+        rule = self._dangerous_file_scanner.first_match(filename)
+        if rule:
+            logger.warning(
+                "Dangerous file pattern", filename=filename, pattern=rule.pattern
+            )
+            return False, f"File type not allowed: {filename}"
 
         # Check extension
         path_obj = Path(filename)
@@ -281,7 +419,7 @@ class SecurityValidator:
 
         # Remove dangerous characters but preserve basic ones
         # Note: This is very restrictive - adjust based on actual needs
-        sanitized = re.sub(r"[`$;|&<>#\x00-\x1f\x7f]", "", text)
+        sanitized = UNSAFE_COMMAND_CHARS.sub("", text)
 
         # Limit length to prevent buffer overflow attacks
         max_length = 1000
@@ -320,12 +458,12 @@ class SecurityValidator:
 
         for arg in args:
             # Check for dangerous patterns
-            for pattern in self.DANGEROUS_PATTERNS:
-                if re.search(pattern, arg, re.IGNORECASE):
-                    logger.warning(
-                        "Dangerous pattern in command arg", arg=arg, pattern=pattern
-                    )
-                    return False, [], "Invalid argument: contains forbidden pattern"
+            rule = self._dangerous_scanner.first_match(arg)
+            if rule:
+                logger.warning(
+                    "Dangerous pattern in command arg", arg=arg, pattern=rule.pattern
+                )
+                return False, [], "Invalid argument: contains forbidden pattern"
 
             # Sanitize argument
             sanitized = self.sanitize_command_input(arg)
@@ -349,9 +487,8 @@ class SecurityValidator:
         dirname = dirname.strip()
 
         # Check for dangerous patterns
-        for pattern in self.DANGEROUS_PATTERNS:
-            if re.search(pattern, dirname, re.IGNORECASE):
-                return False
+        if self._dangerous_scanner.matches(dirname):
+            return False
 
         # Check for path separators
         if "/" in dirname or "\\" in dirname:
@@ -381,4 +518,5 @@ class SecurityValidator:
             "dangerous_file_patterns_count": len(self.DANGEROUS_FILE_PATTERNS),
             "max_filename_length": 255,
             "max_command_length": 1000,
+            "path_cache": self.get_path_cache_stats(),
         }
@@ -273,6 +273,31 @@ class DatabaseManager:
                 PRAGMA journal_mode=WAL;
                 """,
             ),
+            (
+                4,
+                """
+                -- Durable outbox for proactive Telegram notifications
+                CREATE TABLE IF NOT EXISTS notification_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    chat_id INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    parse_mode TEXT,
+                    event_id TEXT,
+                    originating_event_id TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER DEFAULT 0,
+                    next_attempt_at TIMESTAMP,
+                    last_error TEXT,
+                    telegram_message_id INTEGER,
+                    delivered_chunks INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    delivered_at TIMESTAMP
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_notification_outbox_status
+                    ON notification_outbox(status, id);
+                """,
+            ),
         ]
 
     async def _init_pool(self):
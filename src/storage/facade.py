@@ -22,6 +22,7 @@ from .repositories import (
     AuditLogRepository,
     CostTrackingRepository,
     MessageRepository,
+    NotificationOutboxRepository,
     SessionRepository,
     ToolUsageRepository,
     UserRepository,
@@ -43,6 +44,7 @@ class Storage:
         self.audit = AuditLogRepository(self.db_manager)
         self.costs = CostTrackingRepository(self.db_manager)
         self.analytics = AnalyticsRepository(self.db_manager)
+        self.notifications = NotificationOutboxRepository(self.db_manager)
 
     async def initialize(self):
         """Initialize storage system."""
@@ -321,10 +323,14 @@ class Storage:
         # Get tool stats
         tool_stats = await self.tools.get_tool_stats()
 
+        # Get notifications that exhausted their delivery attempts
+        failed_notifications = await self.notifications.get_failed(limit=20)
+
         return {
             "system_stats": system_stats,
             "users": [u.to_dict() for u in users],
             "recent_audit": [a.to_dict() for a in recent_audit],
             "total_costs": total_costs,
             "tool_stats": tool_stats,
+            "failed_notifications": [n.to_dict() for n in failed_notifications],
         }
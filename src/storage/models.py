@@ -267,3 +267,48 @@ class UserTokenModel:
         if not self.expires_at:
             return False
         return datetime.utcnow() > self.expires_at
+
+
+@dataclass
+class NotificationOutboxModel:
+    """Notification outbox data model.
+
+    One row per (notification, chat). Status is one of ``pending``,
+    ``delivered`` or ``failed``.
+    """
+
+    chat_id: int
+    text: str
+    created_at: datetime
+    id: Optional[int] = None
+    parse_mode: Optional[str] = None
+    event_id: Optional[str] = None
+    originating_event_id: Optional[str] = None
+    status: str = "pending"
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    telegram_message_id: Optional[int] = None
+    delivered_chunks: int = 0
+    delivered_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        data = asdict(self)
+        # Convert datetime to ISO format
+        for key in ["created_at", "next_attempt_at", "delivered_at"]:
+            if data[key]:
+                data[key] = data[key].isoformat()
+        return data
+
+    @classmethod
+    def from_row(cls, row: aiosqlite.Row) -> "NotificationOutboxModel":
+        """Create from database row."""
+        data = dict(row)
+
+        # Parse datetime fields
+        for field in ["created_at", "next_attempt_at", "delivered_at"]:
+            if data.get(field):
+                data[field] = datetime.fromisoformat(data[field])
+
+        return cls(**data)
@@ -17,6 +17,7 @@ from .models import (
     AuditLogModel,
     CostTrackingModel,
     MessageModel,
+    NotificationOutboxModel,
     SessionModel,
     ToolUsageModel,
     UserModel,
@@ -450,6 +451,142 @@ class AuditLogRepository:
             return [AuditLogModel.from_row(row) for row in rows]
 
 
+class NotificationOutboxRepository:
+    """Notification outbox data access."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        """Initialize repository."""
+        self.db = db_manager
+
+    async def enqueue(self, notifications: List[NotificationOutboxModel]) -> List[int]:
+        """Persist pending notifications in one transaction and return IDs."""
+        ids = []
+        async with self.db.get_connection() as conn:
+            for notification in notifications:
+                cursor = await conn.execute(
+                    """
+                    INSERT INTO notification_outbox
+                    (chat_id, text, parse_mode, event_id, originating_event_id,
+                     status, created_at)
+                    VALUES (?, ?, ?, ?, ?, 'pending', ?)
+                """,
+                    (
+                        notification.chat_id,
+                        notification.text,
+                        notification.parse_mode,
+                        notification.event_id,
+                        notification.originating_event_id,
+                        notification.created_at,
+                    ),
+                )
+                ids.append(cursor.lastrowid)
+            await conn.commit()
+        return ids
+
+    async def get_pending(self, limit: int = 1000) -> List[NotificationOutboxModel]:
+        """Get undelivered notifications in enqueue order."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT * FROM notification_outbox
+                WHERE status = 'pending'
+                ORDER BY id
+                LIMIT ?
+            """,
+                (limit,),
+            )
+            rows = await cursor.fetchall()
+            return [NotificationOutboxModel.from_row(row) for row in rows]
+
+    async def mark_progress(
+        self,
+        notification_id: int,
+        delivered_chunks: int,
+        telegram_message_id: Optional[int],
+    ):
+        """Record partially delivered multi-chunk notification."""
+        async with self.db.get_connection() as conn:
+            await conn.execute(
+                """
+                UPDATE notification_outbox
+                SET delivered_chunks = ?, telegram_message_id = ?
+                WHERE id = ?
+            """,
+                (delivered_chunks, telegram_message_id, notification_id),
+            )
+            await conn.commit()
+
+    async def mark_delivered(
+        self, notification_ids: List[int], telegram_message_id: Optional[int]
+    ):
+        """Mark notifications delivered with the Telegram message ID."""
+        async with self.db.get_connection() as conn:
+            await conn.executemany(
+                """
+                UPDATE notification_outbox
+                SET status = 'delivered', telegram_message_id = ?,
+                    delivered_at = ?, last_error = NULL
+                WHERE id = ?
+            """,
+                [
+                    (telegram_message_id, datetime.utcnow(), notification_id)
+                    for notification_id in notification_ids
+                ],
+            )
+            await conn.commit()
+
+    async def schedule_retry(
+        self,
+        notification_ids: List[int],
+        attempts: int,
+        next_attempt_at: datetime,
+        error: str,
+    ):
+        """Record a failed attempt and when to try again."""
+        async with self.db.get_connection() as conn:
+            await conn.executemany(
+                """
+                UPDATE notification_outbox
+                SET attempts = ?, next_attempt_at = ?, last_error = ?
+                WHERE id = ?
+            """,
+                [
+                    (attempts, next_attempt_at, error, notification_id)
+                    for notification_id in notification_ids
+                ],
+            )
+            await conn.commit()
+
+    async def mark_failed(self, notification_ids: List[int], error: str):
+        """Give up on notifications after a permanent error."""
+        async with self.db.get_connection() as conn:
+            await conn.executemany(
+                """
+                UPDATE notification_outbox
+                SET status = 'failed', last_error = ?,
+                    attempts = attempts + 1
+                WHERE id = ?
+            """,
+                [(error, notification_id) for notification_id in notification_ids],
+            )
+            await conn.commit()
+
+    async def get_failed(self, limit: int = 50) -> List[NotificationOutboxModel]:
+        """Get notifications that could not be delivered, newest first."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT * FROM notification_outbox
+                WHERE status = 'failed'
+                ORDER BY id DESC
+                LIMIT ?
+            """,
+                (limit,),
+            )
+            rows = await cursor.fetchall()
+            return [NotificationOutboxModel.from_row(row) for row in rows]
+
+
 class CostTrackingRepository:
     """Cost tracking data access."""
 
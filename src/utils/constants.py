@@ -6,6 +6,8 @@ APP_DESCRIPTION = "Telegram bot for remote Claude Code access"
 
 # Default limits
 DEFAULT_CLAUDE_TIMEOUT_SECONDS = 300
+DEFAULT_CLAUDE_FIRST_MESSAGE_TIMEOUT_SECONDS = 60
+DEFAULT_CLAUDE_IDLE_TIMEOUT_SECONDS = 180
 DEFAULT_CLAUDE_MAX_TURNS = 10
 DEFAULT_CLAUDE_MAX_COST_PER_USER = 10.0
 
@@ -13,6 +15,12 @@ DEFAULT_RATE_LIMIT_REQUESTS = 10
 DEFAULT_RATE_LIMIT_WINDOW = 60
 DEFAULT_RATE_LIMIT_BURST = 20
 
+DEFAULT_MAX_CONCURRENT_UPDATES = 32
+DEFAULT_MESSAGE_DEBOUNCE_MS = 0
+
+DEFAULT_RESPONSE_DOCUMENT_THRESHOLD_CHARS = 12000
+DEFAULT_RESPONSE_DOCUMENT_MAX_MESSAGES = 3
+
 DEFAULT_SESSION_TIMEOUT_HOURS = 24
 DEFAULT_MAX_SESSIONS_PER_USER = 5
 
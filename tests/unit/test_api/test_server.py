@@ -147,3 +147,19 @@ class TestWebhookAPI:
         )
 
         assert response.status_code == 401
+
+    def test_failed_notifications_requires_auth(self) -> None:
+        """The failed-deliveries view rejects requests without the secret."""
+        bus = EventBus()
+        app = create_api_app(bus, make_settings(webhook_api_secret="my-secret"))
+        client = TestClient(app)
+
+        response = client.get("/notifications/failed")
+        assert response.status_code == 401
+
+        response = client.get(
+            "/notifications/failed",
+            headers={"Authorization": "Bearer my-secret"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"failed": []}
@@ -0,0 +1,125 @@
+"""Tests for reading uploaded archives without extraction."""
+
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from src.bot.features.archive_reader import ArchiveMember, ArchiveReader
+from src.bot.features.file_handler import FileHandler
+
+FILES = {
+    "proj/src/main.py": "print('hello')\n",
+    "proj/src/util.py": "def util():\n    pass\n",
+    "proj/README.md": "# Project\n",
+    "proj/node_modules/lib/index.js": "module.exports = 1\n",
+}
+
+
+def make_zip(path, files, extra=()):
+    """Write a zip of text files plus raw (name, data) entries."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+        for name, data in extra:
+            archive.writestr(name, data)
+    return path
+
+
+def make_tar(path, files):
+    """Write a gzipped tar of text files."""
+    with tarfile.open(path, "w:gz") as archive:
+        for name, content in files.items():
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+@pytest.fixture
+def handler():
+    return FileHandler(config=None, security=None)
+
+
+async def test_zip_prompt_from_listing(handler, tmp_path):
+    """The tree comes from the listing and key files are read in place."""
+    archive = make_zip(tmp_path / "proj.zip", FILES)
+
+    processed = await handler._process_archive(archive, "Review this")
+
+    assert processed.prompt.startswith(
+        "Review this\n\nProject structure:\n"
+        "└── proj/\n"
+        "    ├── node_modules/\n"
+        "    │   └── lib/\n"
+        "    │       └── index.js (19.0B)\n"
+        "    ├── src/\n"
+        "    │   ├── main.py (15.0B)\n"
+        "    │   └── util.py (21.0B)\n"
+        "    └── README.md (10.0B)\n"
+    )
+    assert "\nFile: proj/src/main.py\n```\nprint('hello')\n...\n```\n" in (
+        processed.prompt
+    )
+    assert "File: proj/node_modules" not in processed.prompt
+    assert processed.metadata == {"file_count": 8, "code_files": 2}
+
+
+async def test_tar_gz_prompt(handler, tmp_path):
+    """Compressed tars are listed and read the same way."""
+    archive = make_tar(tmp_path / "proj.tar.gz", FILES)
+
+    processed = await handler._process_archive(archive, "")
+
+    assert "File: proj/src/util.py" in processed.prompt
+    assert processed.metadata["code_files"] == 2
+
+
+async def test_nothing_is_extracted(handler, tmp_path):
+    """Processing an archive writes nothing to the temp directory."""
+    archive = make_zip(tmp_path / "proj.zip", FILES)
+    before = set(handler.temp_dir.iterdir())
+
+    await handler._process_archive(archive, "")
+
+    assert set(handler.temp_dir.iterdir()) == before
+
+
+def test_unsafe_members_are_skipped(tmp_path):
+    """Absolute and parent-relative names never enter the listing."""
+    archive = make_zip(
+        tmp_path / "evil.zip",
+        {"../escape.py": "x", "/etc/passwd": "x", "./ok.py": "x"},
+    )
+
+    with ArchiveReader(archive) as reader:
+        assert reader.members == [ArchiveMember("ok.py", 1, False)]
+
+
+def test_reads_are_capped(tmp_path):
+    """Reads stop at max_bytes regardless of the member's size."""
+    archive = make_zip(tmp_path / "big.zip", {}, extra=[("big.py", b"a" * 1_000_000)])
+
+    with ArchiveReader(archive) as reader:
+        assert reader.read(["big.py"], max_bytes=100) == {"big.py": b"a" * 100}
+
+
+def test_declared_limits(tmp_path):
+    """Oversized or overcrowded archives are rejected before reading."""
+    archive = make_zip(tmp_path / "many.zip", {f"f{i}.py": "x" * 10 for i in range(5)})
+
+    with pytest.raises(ValueError, match="too large"):
+        ArchiveReader(archive, max_total_size=49).__enter__()
+    with pytest.raises(ValueError, match="too many"):
+        ArchiveReader(archive, max_members=4).__enter__()
+
+
+def test_not_an_archive(tmp_path):
+    """Unknown formats raise ValueError."""
+    path = tmp_path / "data.7z"
+    path.write_bytes(b"7z\xbc\xaf\x27\x1c" + b"\0" * 100)
+
+    with pytest.raises(ValueError, match="Unsupported"):
+        ArchiveReader(path).__enter__()
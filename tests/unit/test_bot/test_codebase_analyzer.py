@@ -0,0 +1,136 @@
+"""Tests for the single-walk codebase analyzer."""
+
+import os
+
+import pytest
+
+from src.bot.features.codebase_analyzer import CodebaseAnalyzer, IgnoreRules
+from src.bot.features.file_handler import FileHandler
+
+
+@pytest.fixture
+def analyzer():
+    """An analyzer with a small language table."""
+    return CodebaseAnalyzer(
+        code_extensions={".py", ".js"},
+        language_map={".py": "Python", ".js": "JavaScript"},
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A small repository with ignored and excluded paths."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("# TODO: parse args\n")
+    (tmp_path / "src" / "util.py").write_text("# fixme\n# todo\n")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "conftest.py").write_text("")
+    (tmp_path / "web").mkdir()
+    (tmp_path / "web" / "index.js").write_text("// TODO\n")
+    (tmp_path / "requirements.txt").write_text("flask==3.0\n")
+    (tmp_path / "README.md").write_text("TODO: not code\n")
+    (tmp_path / "node_modules" / "lib").mkdir(parents=True)
+    (tmp_path / "node_modules" / "lib" / "index.js").write_text("// TODO\n")
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "app.py").write_text("# TODO\n")
+    (tmp_path / ".gitignore").write_text("out/\n*.log\n")
+    (tmp_path / "debug.log").write_text("TODO")
+    return tmp_path
+
+
+def test_collects_statistics_in_one_walk(analyzer, repo):
+    """Every statistic is computed, skipping ignored and excluded paths."""
+    analysis = analyzer.analyze(repo)
+
+    assert analysis.languages == {"Python": 3, "JavaScript": 1}
+    assert analysis.file_stats == {".py": 3, ".js": 1, ".txt": 1, ".md": 1, "": 1}
+    assert analysis.entry_points == ["src/main.py", "web/index.js"]
+    assert analysis.frameworks == ["Flask"]
+    assert analysis.todo_count == 4
+    assert analysis.test_coverage is True
+
+
+def test_detects_test_files_by_name(analyzer, tmp_path):
+    """Test files outside a test directory count as tests."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "parser.py").write_text("")
+    assert analyzer.analyze(tmp_path).test_coverage is False
+
+    (tmp_path / "pkg" / "parser_test.py").write_text("")
+    assert analyzer.analyze(tmp_path).test_coverage is True
+
+
+def test_nested_gitignore_and_negation(analyzer, tmp_path):
+    """Nested .gitignore files apply below their directory; ! re-includes."""
+    (tmp_path / ".gitignore").write_text("*.js\n!keep.js\n")
+    (tmp_path / "pkg" / "gen").mkdir(parents=True)
+    (tmp_path / "pkg" / ".gitignore").write_text("/gen\n")
+    (tmp_path / "pkg" / "gen" / "a.py").write_text("")
+    (tmp_path / "pkg" / "b.py").write_text("")
+    (tmp_path / "gen").mkdir()
+    (tmp_path / "gen" / "c.py").write_text("")
+    (tmp_path / "drop.js").write_text("")
+    (tmp_path / "keep.js").write_text("")
+
+    analysis = analyzer.analyze(tmp_path)
+
+    assert analysis.languages == {"Python": 2, "JavaScript": 1}
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, ignored",
+    [
+        ("*.pyc", "a/b/x.pyc", False, True),
+        ("docs/*.md", "docs/a.md", False, True),
+        ("docs/*.md", "docs/sub/a.md", False, False),
+        ("docs/*.md", "other/docs/a.md", False, False),
+        ("**/cache", "a/b/cache", True, True),
+        ("logs/**", "logs/a/b.txt", False, True),
+        ("a/**/z", "a/b/c/z", False, True),
+        ("a/**/z", "a/z", False, True),
+        ("build/", "build", False, False),
+        ("build/", "src/build", True, True),
+        ("/root.txt", "sub/root.txt", False, False),
+        ("file[0-9].txt", "file3.txt", False, True),
+        ("# comment", "# comment", False, False),
+    ],
+)
+def test_gitignore_patterns(pattern, path, is_dir, ignored):
+    """Glob, anchoring and directory-only rules follow gitignore."""
+    rules = IgnoreRules().with_file("", pattern)
+
+    assert rules.is_ignored(path, is_dir) is ignored
+
+
+def test_unchanged_tree_is_served_from_cache(analyzer, repo):
+    """A matching fingerprint returns the cached analysis without reads."""
+    first = analyzer.analyze(repo)
+    files_read = analyzer.files_read
+
+    assert analyzer.analyze(repo) is first
+    assert (analyzer.hits, analyzer.files_read) == (1, files_read)
+
+
+def test_changed_file_is_the_only_one_reread(analyzer, repo):
+    """After an edit only the changed file is read again."""
+    analyzer.analyze(repo)
+    files_read = analyzer.files_read
+
+    main = repo / "src" / "main.py"
+    main.write_text("# TODO one\n# TODO two\n")
+    mtime_ns = main.stat().st_mtime_ns + 1
+    os.utime(main, ns=(mtime_ns, mtime_ns))
+    analysis = analyzer.analyze(repo)
+
+    assert analysis.todo_count == 5
+    assert analyzer.files_read == files_read + 1
+
+
+async def test_file_handler_analyzes_off_loop(repo):
+    """FileHandler.analyze_codebase delegates to its analyzer."""
+    handler = FileHandler(config=None, security=None)
+
+    analysis = await handler.analyze_codebase(repo)
+
+    assert analysis.languages == {"Python": 3, "JavaScript": 1}
+    assert analysis.todo_count == 4
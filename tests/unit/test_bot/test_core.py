@@ -0,0 +1,19 @@
+"""Tests for the main bot class."""
+
+from unittest.mock import MagicMock
+
+from src.bot.core import ClaudeCodeBot
+
+
+def test_dependencies_attached_to_bot_data_once() -> None:
+    """Dependencies live on bot_data, not copied per update."""
+    settings = MagicMock(message_debounce_ms=0)
+    storage = object()
+    bot = ClaudeCodeBot(settings, {"storage": storage})
+    bot.app = MagicMock()
+    bot.app.bot_data = {}
+
+    bot._inject_dependencies()
+
+    assert bot.app.bot_data["storage"] is storage
+    assert bot.app.bot_data["settings"] is settings
@@ -0,0 +1,58 @@
+"""Tests for merging rapid messages into one turn."""
+
+import asyncio
+
+from src.bot.debounce import MessageDebouncer
+
+
+class TestMessageDebouncer:
+    """Tests for MessageDebouncer."""
+
+    async def test_messages_within_window_are_merged(self) -> None:
+        """Messages sent close together become one batch for the leader."""
+        debouncer: MessageDebouncer[str] = MessageDebouncer(0.05)
+
+        leader = asyncio.create_task(debouncer.submit(1, "a"))
+        await asyncio.sleep(0.02)
+        assert await debouncer.submit(1, "b") is None
+        await asyncio.sleep(0.02)
+        assert await debouncer.submit(1, "c") is None
+        other_chat = await debouncer.submit(2, "x")
+
+        assert await leader == ["a", "b", "c"]
+        assert other_chat == ["x"]
+        assert await debouncer.next_batch(2) is None
+
+    async def test_messages_during_turn_form_next_batch(self) -> None:
+        """Messages sent while the leader's turn runs are merged afterwards."""
+        debouncer: MessageDebouncer[str] = MessageDebouncer(0.01)
+        turns = []
+
+        async def leader() -> None:
+            batch = await debouncer.submit(1, "first")
+            while batch:
+                turns.append(batch)
+                await asyncio.sleep(0.05)  # Claude run
+                batch = await debouncer.next_batch(1)
+
+        task = asyncio.create_task(leader())
+        await asyncio.sleep(0.03)
+        assert await debouncer.submit(1, "second") is None
+        assert await debouncer.submit(1, "third") is None
+        await task
+
+        assert turns == [["first"], ["second", "third"]]
+        assert not debouncer.is_active(1)
+        assert (debouncer.messages, debouncer.turns) == (3, 2)
+
+    async def test_batch_size_is_capped(self) -> None:
+        """A chatty user cannot keep extending the window forever."""
+        debouncer: MessageDebouncer[int] = MessageDebouncer(10, max_batch_messages=3)
+
+        leader = asyncio.create_task(debouncer.submit(1, 0))
+        await asyncio.sleep(0)
+        for i in range(1, 5):
+            await debouncer.submit(1, i)
+
+        assert await asyncio.wait_for(leader, 1) == [0, 1, 2]
+        assert debouncer.release(1) == [3, 4]
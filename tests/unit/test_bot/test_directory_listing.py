@@ -0,0 +1,104 @@
+"""Tests for cached, off-loop directory listings."""
+
+import os
+
+import pytest
+
+from src.bot.features.directory_listing import (
+    PAGE_SIZE,
+    DirectoryLister,
+    format_listing_page,
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A directory with subdirectories, files and hidden entries."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "docs").mkdir()
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "README.md").write_text("x" * 2048)
+    (tmp_path / "a.py").write_text("print(1)\n")
+    (tmp_path / ".env").write_text("SECRET=1")
+    return tmp_path
+
+
+async def test_lists_directories_first(project):
+    """Directories then files, each sorted, hidden entries skipped."""
+    listing = await DirectoryLister().list_directory(project)
+
+    assert [entry.name for entry in listing.entries] == [
+        "docs",
+        "src",
+        "README.md",
+        "a.py",
+    ]
+    assert listing.directories == ["docs", "src"]
+    assert listing.entries[2].size == 2048
+
+
+async def test_reuses_listing_until_directory_changes(project):
+    """An unchanged directory is not rescanned; a new entry is picked up."""
+    lister = DirectoryLister()
+    first = await lister.list_directory(project)
+    assert await lister.list_directory(project) is first
+
+    (project / "new.txt").write_text("")
+    os.utime(project, ns=(first.mtime_ns + 1, first.mtime_ns + 1))
+    listing = await lister.list_directory(project)
+
+    assert "new.txt" in [entry.name for entry in listing.entries]
+    assert (lister.hits, lister.scans) == (1, 2)
+
+
+async def test_refresh_and_age_force_rescan(project):
+    """Refresh and listings older than max_age are rescanned."""
+    lister = DirectoryLister()
+    first = await lister.list_directory(project)
+
+    assert await lister.list_directory(project, refresh=True) is not first
+
+    lister.max_age = 0
+    assert await lister.list_directory(project) is not first
+
+
+async def test_cache_is_bounded(tmp_path):
+    """Least recently listed directories are evicted."""
+    lister = DirectoryLister(max_directories=2)
+    for name in ["a", "b", "c"]:
+        (tmp_path / name).mkdir()
+        await lister.list_directory(tmp_path / name)
+
+    assert list(lister._cache) == [tmp_path / "b", tmp_path / "c"]
+
+
+async def test_missing_directory_raises(tmp_path):
+    """A directory that cannot be read raises OSError."""
+    with pytest.raises(OSError):
+        await DirectoryLister().list_directory(tmp_path / "missing")
+
+
+async def test_pages_large_directory(tmp_path):
+    """Large listings are split into pages with Prev/Next buttons."""
+    for i in range(PAGE_SIZE * 2 + 5):
+        (tmp_path / f"file{i:03d}.txt").write_text("")
+    listing = await DirectoryLister().list_directory(tmp_path)
+
+    message, markup = format_listing_page(listing, tmp_path, page=1)
+
+    assert "file030.txt" in message and "file029.txt" not in message
+    assert "Page 2 of 3 · 65 items" in message
+    assert [button.callback_data for button in markup.inline_keyboard[0]] == [
+        "ls:0",
+        "ls:2",
+    ]
+
+
+async def test_single_page_has_no_pager(project):
+    """A small listing has no page buttons or footer."""
+    listing = await DirectoryLister().list_directory(project / "src")
+
+    message, markup = format_listing_page(listing, project, page=3)
+
+    assert message == "📂 <code>src/</code>\n\n<i>(empty directory)</i>"
+    assert markup.inline_keyboard[0][0].callback_data == "cd:.."
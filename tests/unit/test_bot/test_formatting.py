@@ -19,6 +19,8 @@ def mock_settings():
     """Mock settings for testing."""
     settings = Mock(spec=Settings)
     settings.enable_quick_actions = True
+    settings.response_document_threshold_chars = 0
+    settings.response_document_max_messages = 0
     return settings
 
 
@@ -89,6 +91,39 @@ class TestResponseFormatter:
         for msg in messages:
             assert len(msg.text) <= formatter.max_message_length
 
+    def test_long_response_sent_as_document(self, formatter, mock_settings):
+        """Responses over the size threshold become one summarized document."""
+        mock_settings.response_document_threshold_chars = 1000
+        text = "**Summary** of the change.\n\n" + "More detail. " * 200
+        messages = formatter.format_claude_response(text)
+
+        assert len(messages) == 1
+        assert messages[0].filename == "response.md"
+        assert messages[0].document == text.strip().encode("utf-8")
+        assert messages[0].text.startswith("<b>Summary</b> of the change.")
+        assert "2,627 characters" in messages[0].text
+        assert messages[0].reply_markup is not None
+
+    def test_many_chunks_sent_as_document(self, formatter, mock_settings):
+        """Responses needing too many messages become a document."""
+        mock_settings.response_document_max_messages = 1
+        messages = formatter.format_claude_response("A" * 5000)
+
+        assert len(messages) == 1
+        assert messages[0].document == b"A" * 5000
+        assert len(messages[0].text) < 1024
+
+    def test_document_summary_skips_code(self, formatter, mock_settings):
+        """The summary is the first prose paragraph, cut at a word."""
+        mock_settings.response_document_threshold_chars = 10
+        text = "```python\nx = 1\n```\n\n" + "word " * 200
+        messages = formatter.format_claude_response(text)
+
+        summary = messages[0].text.split("\n\n")[0]
+        assert summary.startswith("word word")
+        assert summary.endswith("word…")
+        assert len(summary) <= formatter.max_summary_length + 1
+
     def test_format_error_message(self, formatter):
         """Test error message formatting."""
         error_msg = formatter.format_error_message("Something went wrong", "Error")
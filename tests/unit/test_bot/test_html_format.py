@@ -0,0 +1,163 @@
+"""Property tests for the markdown to Telegram HTML converter."""
+
+import random
+import re
+import time
+from typing import List, Tuple
+
+from src.bot.utils.html_format import escape_html, markdown_to_telegram_html
+
+WORDS = [
+    "the",
+    "parser",
+    "x<y",
+    "a&b",
+    "2>1",
+    "my_var_name",
+    "foo_bar",
+    "file.py",
+    "a~b",
+    "#tag",
+    "C#",
+    "e.g.",
+    "[1]",
+    "f(x)",
+    "50%",
+]
+CODE_CHARS = "xyz <>&*_~[]()#"
+URLS = ["https://example.com/a", "https://example.com/q?x=1&y=2"]
+SPANS = ["**{}**", "__{}__", "*{}*", "_{}_", "~~{}~~", "[{}]({url})"]
+TAG = re.compile(r"<(/?)(b|i|s|a|code|pre)\b[^>]*>")
+
+
+def multipass(text: str) -> str:
+    """The previous converter: one regex pass per construct, then restore."""
+    placeholders: List[Tuple[str, str]] = []
+
+    def placeholder(html: str) -> str:
+        key = f"\x00PH{len(placeholders)}\x00"
+        placeholders.append((key, html))
+        return key
+
+    def fenced(m: "re.Match[str]") -> str:
+        lang, code = m.group(1) or "", escape_html(m.group(2))
+        if lang:
+            return placeholder(
+                f'<pre><code class="language-{escape_html(lang)}">{code}</code></pre>'
+            )
+        return placeholder(f"<pre><code>{code}</code></pre>")
+
+    text = re.sub(r"```(\w+)?\n(.*?)```", fenced, text, flags=re.DOTALL)
+    text = re.sub(
+        r"`([^`\n]+)`",
+        lambda m: placeholder(f"<code>{escape_html(m.group(1))}</code>"),
+        text,
+    )
+    text = escape_html(text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+    text = re.sub(r"__(.+?)__", r"<b>\1</b>", text)
+    text = re.sub(r"\*(\S.*?\S|\S)\*", r"<i>\1</i>", text)
+    text = re.sub(r"(?<!\w)_(\S.*?\S|\S)_(?!\w)", r"<i>\1</i>", text)
+    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
+    text = re.sub(r"^#{1,6}\s+(.+)$", r"<b>\1</b>", text, flags=re.MULTILINE)
+    text = re.sub(r"~~(.+?)~~", r"<s>\1</s>", text)
+    for key, html in placeholders:
+        text = text.replace(key, html)
+    return text
+
+
+def _code(rng: random.Random) -> str:
+    return "`" + "".join(rng.choice(CODE_CHARS) for _ in range(rng.randint(1, 8))) + "`"
+
+
+def _inline(rng: random.Random, depth: int = 0, used: Tuple[str, ...] = ()) -> str:
+    """Words, code spans and well-nested spans, with stray punctuation."""
+    items = []
+    for _ in range(rng.randint(1, 5)):
+        spans = [span for span in SPANS if span not in used] if depth < 3 else []
+        kind = rng.choice(["word"] * 4 + ["code"] + spans)
+        if kind == "word":
+            item = rng.choice(WORDS)
+        elif kind == "code":
+            item = _code(rng)
+        else:
+            # Span content starts and ends with a word, like prose does
+            inner = " ".join(
+                [rng.choice(WORDS), _inline(rng, depth + 1, used + (kind,)), "end"]
+            )
+            item = kind.format(inner, url=rng.choice(URLS))
+        items.append(rng.choice(["", "", "(", '"']) + item + rng.choice(["", ",", ")"]))
+    return rng.choice([" ", "  "]).join(items)
+
+
+def well_formed_markdown(seed: int) -> str:
+    """Random response of paragraphs, headers and fenced code blocks."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(rng.randint(1, 8)):
+        roll = rng.random()
+        if roll < 0.15:
+            body = "".join(rng.choice(CODE_CHARS + "`\n") for _ in range(30))
+            lang = rng.choice(["", "python"])
+            lines.append(f"```{lang}\n{body.replace('```', '')}\n```")
+        elif roll < 0.3:
+            lines.append("#" * rng.randint(1, 6) + " " + _inline(rng))
+        else:
+            lines.append(_inline(rng))
+    return "\n".join(lines)
+
+
+def assert_well_nested(html: str) -> None:
+    """Every tag is closed, in order, and nothing is closed twice."""
+    stack = []
+    for closing, tag in TAG.findall(html):
+        if closing:
+            assert stack and stack.pop() == tag, html
+        else:
+            stack.append(tag)
+    assert not stack, html
+
+
+def test_matches_multipass_converter():
+    """Well-formed markdown renders exactly as the previous converter did."""
+    for seed in range(500):
+        text = well_formed_markdown(seed)
+        assert markdown_to_telegram_html(text) == multipass(text), seed
+
+
+def test_stray_markers_never_cross_tags():
+    """Unbalanced markers in arbitrary text still give well-nested HTML."""
+    for seed in range(200):
+        rng = random.Random(seed)
+        text = "".join(rng.choice("ab _*~`[]()#\n<&") for _ in range(200))
+        assert_well_nested(markdown_to_telegram_html(text))
+
+
+def test_overlapping_markers_stay_nested():
+    """Overlapping spans no longer produce crossed tags."""
+    text = "*a **b* c**"
+    assert multipass(text) == "<i>a <b>b</i> c</b>"
+    assert markdown_to_telegram_html(text) == "*a <b>b* c</b>"
+
+
+def test_triple_delimiters_render_bold_italic():
+    """***text*** and ___text___ nest an italic span inside a bold one."""
+    assert markdown_to_telegram_html("***both***") == "<b><i>both</i></b>"
+    assert markdown_to_telegram_html("a ___both___ b") == "a <b><i>both</i></b> b"
+    assert markdown_to_telegram_html("***a **b** c***") == "<b><i>a <b>b</b> c</i></b>"
+
+
+def test_adversarial_markers_render_in_linear_time():
+    """Runs of unpaired delimiters do not make the converter backtrack."""
+    texts = [
+        "_a __b " * 300,
+        "*a **b " * 300,
+        "***a **b " * 300,
+        "[a](b " * 300,
+        "~~a *b " * 300,
+    ]
+    for text in texts:
+        start = time.perf_counter()
+        html = markdown_to_telegram_html(text * 10)
+        assert time.perf_counter() - start < 1.0, text[:10]
+        assert_well_nested(html)
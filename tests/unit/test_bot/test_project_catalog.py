@@ -0,0 +1,109 @@
+"""Tests for the polled project catalog."""
+
+import asyncio
+import os
+
+import pytest
+
+from src.bot.features.project_catalog import ProjectCatalog, format_project_line
+
+
+@pytest.fixture
+def root(tmp_path):
+    """An approved directory with a few projects."""
+    (tmp_path / "web-app").mkdir()
+    (tmp_path / "web-app" / "package.json").write_text("{}")
+    (tmp_path / "web-app" / "tsconfig.json").write_text("{}")
+    (tmp_path / "api").mkdir()
+    (tmp_path / "api" / "pyproject.toml").write_text("")
+    (tmp_path / "api" / ".git").mkdir()
+    (tmp_path / "notes").mkdir()
+    (tmp_path / ".cache").mkdir()
+    (tmp_path / "README.md").write_text("")
+    return tmp_path
+
+
+def touch(path, mtime_ns):
+    """Set a path's mtime, so changes are seen regardless of clock tick."""
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+async def test_indexes_projects_with_metadata(root):
+    """Visible top-level directories become projects with metadata."""
+    catalog = ProjectCatalog(root, poll_interval=0)
+
+    projects = await catalog.list_projects()
+
+    assert [project.name for project in projects] == ["api", "notes", "web-app"]
+    api, notes, web = projects
+    assert (api.language, api.is_git_repo) == ("Python", True)
+    assert (notes.language, notes.is_git_repo) == (None, False)
+    assert web.language == "TypeScript"
+    assert format_project_line(api) == "• <code>api/</code> · Python · git"
+
+
+async def test_refresh_reexamines_only_changed_projects(root):
+    """Unchanged projects keep their entries; changed ones are re-read."""
+    catalog = ProjectCatalog(root, poll_interval=0)
+    api, notes, _ = await catalog.list_projects()
+
+    await catalog.refresh()
+    assert catalog.scans == 1
+
+    (root / "notes" / "go.mod").write_text("")
+    touch(root / "notes", notes.mtime_ns + 1)
+    await catalog.refresh()
+
+    assert catalog.scans == 2
+    assert await catalog.get("api") is api
+    assert (await catalog.get("notes")).language == "Go"
+
+
+async def test_new_and_removed_projects(root):
+    """Projects appear and disappear with the root directory."""
+    catalog = ProjectCatalog(root, poll_interval=0)
+    await catalog.list_projects()
+    root_mtime = root.stat().st_mtime_ns
+
+    (root / "cli").mkdir()
+    (root / "notes").rmdir()
+    touch(root, root_mtime + 1)
+    await catalog.refresh()
+
+    names = [project.name for project in await catalog.list_projects()]
+    assert names == ["api", "cli", "web-app"]
+
+
+async def test_polling_keeps_catalog_current(root):
+    """The poll loop picks up changes without a request."""
+    catalog = ProjectCatalog(root, poll_interval=0.01)
+    await catalog.list_projects()
+    root_mtime = root.stat().st_mtime_ns
+
+    (root / "cli").mkdir()
+    touch(root, root_mtime + 1)
+    for _ in range(100):
+        if await catalog.get("cli"):
+            break
+        await asyncio.sleep(0.01)
+    catalog.close()
+
+    assert await catalog.get("cli") is not None
+
+
+async def test_search_ranks_prefix_substring_fuzzy(root):
+    """Prefix matches come first, then substrings, then close spellings."""
+    (root / "app-store").mkdir()
+    catalog = ProjectCatalog(root, poll_interval=0)
+
+    assert [p.name for p in await catalog.search("ap", limit=2)] == [
+        "api",
+        "app-store",
+    ]
+    assert [p.name for p in await catalog.search("app")] == [
+        "app-store",
+        "web-app",
+        "api",
+    ]
+    assert [p.name for p in await catalog.search("nots")] == ["notes"]
+    assert await catalog.search("zzz") == []
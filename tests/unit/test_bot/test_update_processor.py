@@ -0,0 +1,175 @@
+"""Tests for the per-user ordered update processor."""
+
+import asyncio
+import time
+from typing import Any, Coroutine, List, Tuple
+
+from structlog.testing import capture_logs
+from telegram import Update
+
+from src.bot.update_processor import UserOrderedUpdateProcessor
+
+
+def make_update(update_id: int, user_id: int, text: str = "hello") -> Update:
+    return Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": user_id, "is_bot": False, "first_name": "U"},
+                "text": text,
+            },
+        },
+        None,
+    )
+
+
+async def run_all(
+    processor: UserOrderedUpdateProcessor,
+    jobs: List[Tuple[Update, Coroutine[Any, Any, None]]],
+) -> None:
+    await asyncio.gather(
+        *(processor.process_update(update, coro) for update, coro in jobs)
+    )
+
+
+class TestUserOrderedUpdateProcessor:
+    """Tests for UserOrderedUpdateProcessor."""
+
+    async def test_same_user_runs_in_order(self) -> None:
+        """A user's updates never overlap and keep arrival order."""
+        processor = UserOrderedUpdateProcessor(8)
+        events: list = []
+
+        async def handle(name: str, delay: float) -> None:
+            events.append(("start", name))
+            await asyncio.sleep(delay)
+            events.append(("end", name))
+
+        await run_all(
+            processor,
+            [
+                (make_update(1, 10), handle("a", 0.05)),
+                (make_update(2, 10), handle("b", 0.0)),
+            ],
+        )
+
+        assert events == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b")]
+        assert processor.get_stats()["lock_waits"] == 2
+        assert processor.max_lock_wait_seconds >= 0.04
+        assert processor.get_stats()["active_user_locks"] == 0
+        histogram = processor.get_stats()["lock_wait_histogram"]
+        assert sum(histogram.values()) == 2
+        assert histogram["<=0.01s"] >= 1
+
+    async def test_other_users_and_cheap_commands_run_concurrently(self) -> None:
+        """Other users and /status are not held up by a long-running update."""
+        processor = UserOrderedUpdateProcessor(8)
+        finished: list = []
+
+        async def handle(name: str, delay: float) -> None:
+            await asyncio.sleep(delay)
+            finished.append(name)
+
+        await run_all(
+            processor,
+            [
+                (make_update(1, 10), handle("slow", 0.1)),
+                (make_update(2, 20), handle("other_user", 0.0)),
+                (make_update(3, 10, "/status@bot"), handle("status", 0.0)),
+            ],
+        )
+
+        assert finished[-1] == "slow"
+        assert processor.bypassed == 1
+
+    async def test_global_cap(self) -> None:
+        """No more than max_concurrent_updates run at once."""
+        processor = UserOrderedUpdateProcessor(2)
+        running = 0
+        peak = 0
+
+        async def handle() -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        await run_all(
+            processor, [(make_update(i, 100 + i), handle()) for i in range(5)]
+        )
+
+        assert peak == 2
+
+    async def test_queued_updates_do_not_hold_slots(self) -> None:
+        """A user's backlog behind a long run leaves slots for other users."""
+        processor = UserOrderedUpdateProcessor(2)
+        release = asyncio.Event()
+        other_done = asyncio.Event()
+
+        async def long_run() -> None:
+            await release.wait()
+
+        async def other_user() -> None:
+            other_done.set()
+
+        backlog = asyncio.gather(
+            *(
+                processor.process_update(make_update(i, 10), long_run())
+                for i in range(5)
+            )
+        )
+        other = asyncio.create_task(
+            processor.process_update(make_update(9, 20), other_user())
+        )
+
+        await asyncio.wait_for(other_done.wait(), timeout=1)
+        assert processor.current_concurrent_updates == 1
+        release.set()
+        await asyncio.gather(backlog, other)
+        assert processor.current_concurrent_updates == 0
+
+    async def test_text_bypass_with_explicit_user_lock(self) -> None:
+        """Bypassed text skips the lock; user_lock still orders other updates."""
+        processor = UserOrderedUpdateProcessor(8, bypass_text_messages=True)
+        events: list = []
+
+        async def merged_turn() -> None:
+            async with processor.user_lock(10):
+                events.append("turn start")
+                await asyncio.sleep(0.05)
+                events.append("turn end")
+
+        async def handle(name: str) -> None:
+            events.append(name)
+
+        await run_all(
+            processor,
+            [
+                (make_update(1, 10), merged_turn()),
+                (make_update(2, 10, "more text"), handle("text")),
+                (make_update(3, 10, "/new"), handle("command")),
+            ],
+        )
+
+        assert events == ["turn start", "text", "turn end", "command"]
+        assert processor.get_stats()["bypassed"] == 2
+
+    async def test_stats_logged_while_updates_arrive(self) -> None:
+        """Stats are logged once per interval with updates, not when idle."""
+        processor = UserOrderedUpdateProcessor(8, stats_interval=0.02)
+        await processor.initialize()
+        try:
+            with capture_logs() as logs:
+                await run_all(processor, [(make_update(1, 10), asyncio.sleep(0))])
+                await asyncio.sleep(0.1)
+        finally:
+            await processor.shutdown()
+
+        stats = [log for log in logs if log["event"] == "Update processor stats"]
+        assert len(stats) == 1
+        assert stats[0]["processed"] == 1
+        assert sum(stats[0]["lock_wait_histogram"].values()) == 1
@@ -0,0 +1,147 @@
+"""Tests for staging uploads in the working directory."""
+
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram import File
+
+from src.bot.features.upload_staging import (
+    STAGING_ID_KEY,
+    UploadStager,
+    release_staged_uploads,
+    stage_document,
+)
+from src.bot.features.upload_stream import UploadStream
+from src.security.validators import SecurityValidator
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    """A project directory inside the approved directory."""
+    (tmp_path / "project").mkdir()
+    return tmp_path / "project"
+
+
+@pytest.fixture
+def stager(tmp_path):
+    return UploadStager(SecurityValidator(tmp_path), max_age_hours=24)
+
+
+def upload_of(path):
+    """A stream over a local file, as served by a local Bot API server."""
+    return UploadStream(File("id", "uid", file_path=str(path)))
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "incoming.md"
+    path.write_text("a,b\n1,2\n")
+    return path
+
+
+async def test_stages_into_session_directory(stager, workdir, report):
+    """The file lands in .uploads/<id>/ and the prompt names that path."""
+    async with upload_of(report) as upload:
+        staged = await stager.stage(upload, "report.md", workdir, "abc123")
+
+    assert staged.path == (workdir / ".uploads" / "abc123" / "report.md").resolve()
+    assert staged.path.read_text() == "a,b\n1,2\n"
+    assert (workdir / ".uploads" / ".gitignore").read_text() == "*\n"
+    assert staged.prompt("Summarize") == (
+        "Summarize\n\nThe file `report.md` (8 bytes) was uploaded to "
+        "`.uploads/abc123/report.md`. Read it from there as needed."
+    )
+
+
+async def test_same_name_is_not_overwritten(stager, workdir, report):
+    """A second upload with the same name gets a numbered name."""
+    for _ in range(2):
+        async with upload_of(report) as upload:
+            staged = await stager.stage(upload, "report.md", workdir, "abc123")
+
+    assert staged.relative_path == ".uploads/abc123/report-1.md"
+
+
+async def test_rejected_names_are_not_staged(stager, workdir, report):
+    """Names refused by SecurityValidator raise ValueError."""
+    with pytest.raises(ValueError):
+        async with upload_of(report) as upload:
+            await stager.stage(upload, ".env", workdir, "abc123")
+
+    assert not (workdir / ".uploads").exists()
+
+
+async def test_oversized_upload_is_not_staged(tmp_path, workdir, report):
+    """Reading past max_bytes stops the save and removes the partial file."""
+    stager = UploadStager(SecurityValidator(tmp_path), max_age_hours=24, max_bytes=4)
+
+    with pytest.raises(ValueError):
+        async with upload_of(report) as upload:
+            await stager.stage(upload, "report.md", workdir, "abc123")
+
+    assert list((workdir / ".uploads" / "abc123").iterdir()) == []
+
+
+async def test_stage_document_checks_declared_size(stager, workdir, report):
+    """Documents over the cap are left to the caller without downloading."""
+    features = MagicMock()
+    features.get_upload_stager.return_value = stager
+    context = SimpleNamespace(
+        user_data={"current_directory": workdir}, bot_data={"features": features}
+    )
+    document = MagicMock(file_name="report.md", file_size=8)
+    document.get_file = AsyncMock(return_value=File("id", "uid", file_path=str(report)))
+
+    prompt = await stage_document(document, "Summarize", context, workdir)
+    assert "`.uploads/" in prompt
+
+    document.file_size = stager.max_bytes + 1
+    document.get_file.reset_mock()
+    assert await stage_document(document, "Summarize", context, workdir) is None
+    document.get_file.assert_not_called()
+
+
+async def test_release_deletes_session_files(stager, workdir, report):
+    """Ending a session removes its staging directory only."""
+    async with upload_of(report) as upload:
+        await stager.stage(upload, "a.md", workdir, "ended")
+    async with upload_of(report) as upload:
+        await stager.stage(upload, "b.md", workdir, "active")
+
+    assert await stager.release("ended") == 1
+
+    assert not (workdir / ".uploads" / "ended").exists()
+    assert (workdir / ".uploads" / "active" / "b.md").exists()
+
+
+async def test_stale_directories_are_swept(stager, workdir, report):
+    """Directories older than the session timeout go on the next staging."""
+    stale = workdir / ".uploads" / "orphan"
+    stale.mkdir(parents=True)
+    (stale / "old.md").write_text("")
+    old = time.time() - 25 * 3600
+    os.utime(stale, (old, old))
+
+    async with upload_of(report) as upload:
+        await stager.stage(upload, "new.md", workdir, "abc123")
+
+    assert not stale.exists()
+
+
+async def test_release_staged_uploads_ends_upload_session(stager, workdir, report):
+    """The session-end helper releases and forgets the staging id."""
+    user_data = {}
+    staging_id = stager.staging_id(user_data)
+    async with upload_of(report) as upload:
+        await stager.stage(upload, "a.md", workdir, staging_id)
+    features = MagicMock()
+    features.get_upload_stager.return_value = stager
+    context = SimpleNamespace(user_data=user_data, bot_data={"features": features})
+
+    await release_staged_uploads(context)
+
+    assert STAGING_ID_KEY not in user_data
+    assert not (workdir / ".uploads" / staging_id).exists()
@@ -0,0 +1,172 @@
+"""Tests for streamed uploads."""
+
+import zipfile
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from telegram import File
+
+from src.bot.features.file_handler import FileHandler
+from src.bot.features.upload_stream import UploadStream
+
+
+def local_file(path):
+    """A Telegram File as returned by a local Bot API server."""
+    return File(file_id="id", file_unique_id="uid", file_path=str(path))
+
+
+def document(path, name=None):
+    """A document whose download resolves to path."""
+    doc = MagicMock()
+    doc.file_name = name or path.name
+    doc.file_size = path.stat().st_size
+    doc.get_file = AsyncMock(return_value=local_file(path))
+    return doc
+
+
+def serve_files(monkeypatch, serve):
+    """Route the file server's HTTP requests to serve."""
+    client = httpx.AsyncClient
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda **kwargs: client(transport=httpx.MockTransport(serve), **kwargs),
+    )
+
+
+async def test_reads_small_file_whole(tmp_path):
+    """A file within the budget is decoded completely."""
+    path = tmp_path / "notes.txt"
+    path.write_text("héllo wörld\n")
+
+    async with UploadStream(local_file(path), chunk_size=4) as upload:
+        upload_text = await upload.read_text(max_chars=100)
+
+    assert upload_text.text == "héllo wörld\n"
+    assert upload_text.truncated is False
+
+
+async def test_stops_reading_past_budget(tmp_path):
+    """Reading stops once the budget is exceeded; the rest is never read."""
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"a" * 100_000 + b"\xff")
+
+    async with UploadStream(local_file(path), chunk_size=1024) as upload:
+        upload_text = await upload.read_text(max_chars=5000)
+
+    assert upload_text.text == "a" * 5000
+    assert upload_text.truncated is True
+    assert upload_text.bytes_read == 5120
+
+
+async def test_streams_from_file_server(monkeypatch):
+    """Remote files are fetched over HTTP and the stream is closed early."""
+    served = []
+
+    def serve(request):
+        served.append(str(request.url))
+        return httpx.Response(200, content=b"line\n" * 10_000)
+
+    serve_files(monkeypatch, serve)
+    file = File("id", "uid", file_path="https://api.telegram.org/file/botT/doc.txt")
+
+    async with UploadStream(file) as upload:
+        upload_text = await upload.read_text(max_chars=10)
+
+    assert served == ["https://api.telegram.org/file/botT/doc.txt"]
+    assert (upload_text.text, upload_text.truncated) == ("line\n" * 2, True)
+
+
+def not_found(request):
+    return httpx.Response(404)
+
+
+def unreachable(request):
+    raise httpx.ConnectError("Connection refused", request=request)
+
+
+@pytest.mark.parametrize("serve", [not_found, unreachable])
+async def test_download_errors_hide_token(monkeypatch, serve):
+    """Errors from the file server never carry the URL with the bot token."""
+    serve_files(monkeypatch, serve)
+    file = File("id", "uid", file_path="https://api.telegram.org/file/bot1:SECRET/a")
+
+    with pytest.raises(RuntimeError, match="File download failed") as raised:
+        async with UploadStream(file) as upload:
+            await upload.read_text()
+
+    assert "SECRET" not in str(raised.value)
+    assert raised.value.__suppress_context__
+
+
+async def test_invalid_utf8_raises(tmp_path):
+    """Invalid bytes within the budget raise UnicodeDecodeError."""
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"ok\xff\xfe")
+
+    with pytest.raises(UnicodeDecodeError):
+        async with UploadStream(local_file(path)) as upload:
+            await upload.read_text()
+
+
+async def test_truncated_final_sequence_raises(tmp_path):
+    """A file ending inside a multi-byte character is not valid UTF-8."""
+    path = tmp_path / "cut.txt"
+    path.write_bytes("é".encode()[:1])
+
+    with pytest.raises(UnicodeDecodeError):
+        async with UploadStream(local_file(path)) as upload:
+            await upload.read_text()
+
+
+async def test_head_is_replayed(tmp_path):
+    """The sniffed first chunk is not lost when the file is saved."""
+    path = tmp_path / "src.bin"
+    path.write_bytes(bytes(range(256)) * 10)
+
+    async with UploadStream(local_file(path), chunk_size=100) as upload:
+        assert await upload.head() == bytes(range(100))
+        assert await upload.save(tmp_path / "copy.bin") == 2560
+
+    assert (tmp_path / "copy.bin").read_bytes() == path.read_bytes()
+
+
+async def test_file_handler_streams_code(tmp_path):
+    """Code uploads are capped at the prompt budget without a temp file."""
+    path = tmp_path / "big.py"
+    path.write_text("x = 1\n" * 20_000)
+    handler = FileHandler(config=None, security=None)
+    before = set(handler.temp_dir.iterdir())
+
+    processed = await handler.handle_document_upload(document(path), 1, "Review")
+
+    assert processed.type == "code"
+    assert processed.prompt.endswith("... (file truncated for processing)\n```")
+    assert processed.metadata["size"] == 120_000
+    assert set(handler.temp_dir.iterdir()) == before
+
+
+async def test_file_handler_rejects_binary_from_first_chunk(tmp_path):
+    """Binary content is detected from the first chunk."""
+    path = tmp_path / "image.dat"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0")
+    handler = FileHandler(config=None, security=None)
+
+    with pytest.raises(ValueError, match="binary"):
+        await handler.handle_document_upload(document(path), 1)
+
+
+async def test_file_handler_saves_archives(tmp_path):
+    """Archives are streamed to a temp file, processed and removed."""
+    path = tmp_path / "proj.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("proj/main.py", "print(1)\n")
+    handler = FileHandler(config=None, security=None)
+    before = set(handler.temp_dir.iterdir())
+
+    processed = await handler.handle_document_upload(document(path), 1)
+
+    assert processed.type == "archive"
+    assert "File: proj/main.py" in processed.prompt
+    assert set(handler.temp_dir.iterdir()) == before
@@ -0,0 +1,148 @@
+"""Test both Claude backends end to end against the fake CLI."""
+
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from src.claude.exceptions import (
+    ClaudeProcessError,
+    ClaudeTimeoutError,
+    ClaudeUsageLimitError,
+)
+from src.claude.fake_cli import FakeCliScenario, default_transcript, write_fake_cli
+from src.claude.integration import ClaudeProcessManager
+from src.claude.monitor import ToolCallGate, ToolMonitor
+from src.claude.sdk_integration import ClaudeSDKManager
+from src.config.loader import create_test_config
+
+BACKENDS = [ClaudeProcessManager, ClaudeSDKManager]
+
+
+@pytest.fixture
+def build_manager(tmp_path):
+    """Create a backend pointed at a fake CLI running a scenario."""
+
+    def build(manager_class, scenario=None, **settings):
+        cli = write_fake_cli(tmp_path / "claude", scenario)
+        config = create_test_config(
+            approved_directory=str(tmp_path),
+            claude_binary_path=str(cli),
+            claude_cli_path=str(cli),
+            **settings,
+        )
+        return manager_class(config)
+
+    return build
+
+
+@pytest.mark.parametrize("manager_class", BACKENDS)
+class TestBackendsWithFakeCli:
+    """Behaviour shared by the subprocess and SDK backends."""
+
+    async def test_replays_transcript(self, build_manager, manager_class, tmp_path):
+        """Text, tool calls and a fresh session come from the transcript."""
+        manager = build_manager(manager_class)
+        updates = []
+
+        async def on_stream(update):
+            updates.append(update)
+
+        response = await manager.execute_command(
+            "hello", tmp_path, stream_callback=on_stream
+        )
+
+        assert response.content == "Done."
+        assert [tool["name"] for tool in response.tools_used] == ["Read"]
+        assert response.session_id != "fake-session"
+        assert any(update.type == "assistant" for update in updates)
+
+    async def test_reports_cwd_and_tool_input(
+        self, build_manager, manager_class, tmp_path
+    ):
+        """The init cwd and each tool call's input reach the response."""
+        scenario = FakeCliScenario(
+            transcript=default_transcript(
+                tool_name="Bash", tool_input={"command": "cd src && ls"}
+            )
+        )
+        manager = build_manager(manager_class, scenario)
+
+        response = await manager.execute_command("hello", tmp_path)
+
+        assert response.cwd == str(tmp_path.resolve())
+        assert response.tools_used[0]["input"] == {"command": "cd src && ls"}
+
+    async def test_resume_keeps_session(self, build_manager, manager_class, tmp_path):
+        """A resumed run reports the session it was resumed with."""
+        manager = build_manager(manager_class)
+
+        response = await manager.execute_command(
+            "again", tmp_path, session_id="existing-session", continue_session=True
+        )
+
+        assert response.session_id == "existing-session"
+
+    async def test_usage_limit(self, build_manager, manager_class, tmp_path):
+        """An exhausted usage limit surfaces with its reset time."""
+        manager = build_manager(
+            manager_class, FakeCliScenario(usage_limit_reset_at=1748779200)
+        )
+
+        with pytest.raises(ClaudeUsageLimitError) as exc_info:
+            await manager.execute_command("hello", tmp_path)
+
+        assert exc_info.value.reset_at == datetime(
+            2025, 6, 1, 12, 0, tzinfo=timezone.utc
+        )
+
+    async def test_crash_mid_run(self, build_manager, manager_class, tmp_path):
+        """A CLI that dies part way through is reported as a process error."""
+        manager = build_manager(manager_class, FakeCliScenario(fail_after_messages=2))
+
+        with pytest.raises(ClaudeProcessError):
+            await manager.execute_command("hello", tmp_path)
+
+    async def test_first_message_latency(self, build_manager, manager_class, tmp_path):
+        """A CLI slower than the first-message limit is timed out."""
+        manager = build_manager(
+            manager_class,
+            FakeCliScenario(first_message_delay=2),
+            claude_first_message_timeout_seconds=1,
+        )
+
+        with pytest.raises(ClaudeTimeoutError) as exc_info:
+            await manager.execute_command("hello", tmp_path)
+
+        assert exc_info.value.phase == "first_message"
+
+
+async def test_token_pacing_slows_replay(build_manager, tmp_path):
+    """Assistant text takes token_delay per token to arrive."""
+    text = " ".join(["word"] * 20)
+    manager = build_manager(
+        ClaudeProcessManager,
+        FakeCliScenario(transcript=default_transcript(text=text), token_delay=0.01),
+    )
+
+    started = time.monotonic()
+    response = await manager.execute_command("hello", tmp_path)
+
+    assert response.content == text
+    assert time.monotonic() - started >= 0.2
+
+
+async def test_sdk_hook_denies_tool_call(build_manager, tmp_path):
+    """The fake runs PreToolUse hooks and ends the turn on a denial."""
+    scenario = FakeCliScenario(
+        transcript=default_transcript(
+            tool_name="Bash", tool_input={"command": "sudo ls"}
+        )
+    )
+    manager = build_manager(ClaudeSDKManager, scenario)
+    gate = ToolCallGate(ToolMonitor(manager.config), tmp_path, user_id=1)
+
+    response = await manager.execute_command("hello", tmp_path, tool_gate=gate)
+
+    assert gate.errors == ["Dangerous command pattern detected: sudo"]
+    assert response.content == ""
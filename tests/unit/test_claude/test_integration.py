@@ -0,0 +1,84 @@
+"""Test Claude subprocess integration."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.claude import integration as integration_module
+from src.claude.exceptions import ClaudeUsageLimitError
+from src.claude.fake_cli import FakeCliScenario, write_fake_cli
+from src.claude.integration import ClaudeProcessManager, StderrTail
+from src.config.loader import create_test_config
+
+
+@pytest.fixture
+def fake_cli_manager(tmp_path):
+    """Create a process manager pointed at the fake CLI."""
+
+    def build(**scenario_args):
+        cli = write_fake_cli(tmp_path / "claude", FakeCliScenario(**scenario_args))
+        config = create_test_config(
+            approved_directory=str(tmp_path),
+            claude_binary_path=str(cli),
+            claude_timeout_seconds=10,
+        )
+        return ClaudeProcessManager(config)
+
+    return build
+
+
+class TestStderrTail:
+    """Test StderrTail."""
+
+    def test_keeps_last_bytes(self):
+        """Only the newest bytes are kept once the limit is exceeded."""
+        tail = StderrTail(max_bytes=8)
+        tail.append(b"abcdef")
+        assert not tail.truncated
+        tail.append(b"ghijkl")
+        assert tail.text() == "efghijkl"
+        assert tail.total_bytes == 12
+        assert tail.truncated
+
+
+class TestClaudeProcessManager:
+    """Test ClaudeProcessManager with a stand-in CLI."""
+
+    async def test_stderr_flood_does_not_block(self, fake_cli_manager, tmp_path):
+        """Stderr far larger than a pipe buffer is drained while stdout is read."""
+        manager = fake_cli_manager(stderr_bytes=4 * 1024 * 1024)
+        updates = []
+
+        async def on_stream(update):
+            updates.append(update)
+
+        response = await manager.execute_command(
+            "hello", tmp_path, stream_callback=on_stream
+        )
+
+        assert response.content == "Done."
+        warnings = [
+            update
+            for update in updates
+            if update.metadata and update.metadata.get("subtype") == "stderr_warning"
+        ]
+        assert [update.content for update in warnings] == [
+            "warning: fake CLI stderr noise"
+        ]
+
+    async def test_error_classified_from_stderr_tail(
+        self, fake_cli_manager, tmp_path, monkeypatch
+    ):
+        """Errors are classified from the most recent stderr output."""
+        monkeypatch.setattr(integration_module, "STDERR_TAIL_BYTES", 4096)
+        manager = fake_cli_manager(
+            stderr_bytes=1024 * 1024, usage_limit_reset_at=1748779200
+        )
+
+        with pytest.raises(ClaudeUsageLimitError) as exc_info:
+            await manager.execute_command("hello", tmp_path)
+
+        assert "Usage Limit Reached" in str(exc_info.value)
+        assert exc_info.value.reset_at == datetime(
+            2025, 6, 1, 12, 0, tzinfo=timezone.utc
+        )
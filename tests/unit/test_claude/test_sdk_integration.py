@@ -10,8 +10,11 @@ from claude_agent_sdk import (
     ClaudeAgentOptions,
     ResultMessage,
     TextBlock,
+    ToolUseBlock,
+    UserMessage,
 )
 
+from src.claude.monitor import ToolCallGate, ToolMonitor
 from src.claude.sdk_integration import ClaudeResponse, ClaudeSDKManager, StreamUpdate
 from src.config.settings import Settings
 
@@ -175,15 +178,44 @@ class TestClaudeSDKManager:
     async def test_session_management(self, sdk_manager):
         """Test session management."""
         session_id = "test-session"
-        messages = [_make_assistant_message("test")]
 
         # Update session
-        sdk_manager._update_session(session_id, messages)
+        sdk_manager._update_session(session_id, 2)
+        sdk_manager._update_session(session_id, 3)
 
-        # Verify session was created
+        # Verify session was created without keeping the transcript
         assert session_id in sdk_manager.active_sessions
         session_data = sdk_manager.active_sessions[session_id]
-        assert session_data["messages"] == messages
+        assert session_data["num_turns"] == 5
+        assert "messages" not in session_data
+
+    async def test_transcript_folded_while_streaming(self, sdk_manager):
+        """Content, tools, turns and cost are accumulated per message."""
+
+        async def mock_query(prompt, options):
+            yield AssistantMessage(
+                content=[
+                    TextBlock(text="Reading"),
+                    ToolUseBlock(id="t1", name="Read", input={"file_path": "a"}),
+                ],
+                model="claude-sonnet-4-20250514",
+            )
+            yield UserMessage(content="tool output")
+            yield _make_assistant_message("Done")
+            yield _make_result_message(session_id="s1", total_cost_usd=0.2)
+            yield _make_result_message(session_id="s2", total_cost_usd=0.9)
+
+        with patch("src.claude.sdk_integration.query", side_effect=mock_query):
+            response = await sdk_manager.execute_command(
+                prompt="Test prompt", working_directory=Path("/test")
+            )
+
+        assert response.content == "Reading\nDone"
+        assert response.num_turns == 3
+        assert response.cost == 0.2
+        assert response.session_id == "s1"
+        assert [tool["name"] for tool in response.tools_used] == ["Read"]
+        assert response.tools_used[0]["input"] == {"file_path": "a"}
 
     async def test_kill_all_processes(self, sdk_manager):
         """Test killing all processes (clearing sessions)."""
@@ -267,6 +299,36 @@ class TestClaudeSDKManager:
         assert len(captured_options) == 1
         assert captured_options[0].mcp_servers == {}
 
+    async def test_tool_gate_denies_and_stops_run(self, sdk_manager, tmp_path):
+        """A PreToolUse hook backed by the gate denies calls and stops the run."""
+        gate = ToolCallGate(ToolMonitor(sdk_manager.config), tmp_path, user_id=1)
+        hook_results = []
+
+        async def mock_query(prompt, options):
+            (matcher,) = options.hooks["PreToolUse"]
+            hook = matcher.hooks[0]
+            for command in ["ls", "sudo ls", "sudo ls"]:
+                hook_results.append(
+                    await hook(
+                        {"tool_name": "Bash", "tool_input": {"command": command}},
+                        None,
+                        {"signal": None},
+                    )
+                )
+            yield _make_result_message()
+
+        with patch("src.claude.sdk_integration.query", side_effect=mock_query):
+            await sdk_manager.execute_command(
+                prompt="Test prompt", working_directory=tmp_path, tool_gate=gate
+            )
+
+        assert hook_results[0] == {}
+        assert hook_results[1]["continue_"] is False
+        assert hook_results[1]["hookSpecificOutput"]["permissionDecision"] == "deny"
+        assert hook_results[2] == hook_results[1]
+        assert gate.errors == ["Dangerous command pattern detected: sudo"]
+        assert gate.cache_hits == 1
+
 
 class TestClaudeMCPErrors:
     """Test MCP-specific error handling."""
@@ -0,0 +1,96 @@
+"""Test usage limit parking."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.claude.exceptions import ClaudeUsageLimitError
+from src.claude.usage_limit import UsageLimiter, parse_reset_time
+
+NOW = datetime(2025, 6, 1, 10, 30, tzinfo=timezone.utc)
+
+
+class TestParseResetTime:
+    """Test parse_reset_time."""
+
+    def test_clock_time_with_timezone(self):
+        """A clock time is the next occurrence in the named timezone."""
+        reset = parse_reset_time(
+            "Claude usage limit reached. Your limit will reset at 3pm "
+            "(Europe/Berlin).",
+            now=NOW,
+        )
+        assert reset == datetime(2025, 6, 1, 13, 0, tzinfo=timezone.utc)
+
+    def test_past_clock_time_rolls_to_next_day(self):
+        """A time earlier today means tomorrow."""
+        reset = parse_reset_time("usage limit reached, reset at 9am", now=NOW)
+        assert reset == datetime(2025, 6, 2, 9, 0, tzinfo=timezone.utc)
+
+    def test_epoch_and_unknown_formats(self):
+        """The CLI's epoch format is read directly; unknown text gives None."""
+        reset = parse_reset_time("Claude AI usage limit reached|1748779200")
+        assert reset == datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+        assert parse_reset_time("usage limit reached", now=NOW) is None
+
+
+class TestUsageLimiter:
+    """Test UsageLimiter."""
+
+    async def test_fail_fast_while_parked(self):
+        """Interactive requests are refused until the reset."""
+        limiter = UsageLimiter()
+        await limiter.acquire()
+
+        resume_at = datetime.now(timezone.utc) + timedelta(hours=1)
+        limiter.park(resume_at)
+
+        with pytest.raises(ClaudeUsageLimitError) as exc_info:
+            await limiter.acquire()
+        assert exc_info.value.reset_at == resume_at
+        assert limiter.get_status()["rejected"] == 1
+        assert "Paused by usage limit until" in limiter.describe()
+
+    async def test_deferred_requests_drain_at_controlled_rate(self):
+        """Deferred requests wait for the reset and are released spaced out."""
+        limiter = UsageLimiter(drain_interval=0.05)
+        limiter.park(datetime.now(timezone.utc) + timedelta(seconds=0.1))
+
+        loop = asyncio.get_running_loop()
+        released = []
+
+        async def request():
+            await limiter.acquire(defer=True)
+            released.append(loop.time())
+
+        tasks = [asyncio.create_task(request()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert limiter.get_status()["deferred"] == 3
+
+        await asyncio.gather(*tasks)
+
+        assert limiter.get_status() == {
+            "parked": False,
+            "resume_at": None,
+            "deferred": 0,
+            "rejected": 0,
+        }
+        gaps = [later - earlier for earlier, later in zip(released, released[1:])]
+        assert all(gap >= 0.04 for gap in gaps)
+
+    async def test_deferral_queue_is_bounded(self):
+        """Requests beyond the queue size fail fast."""
+        limiter = UsageLimiter(max_deferred=1)
+        limiter.park(datetime.now(timezone.utc) + timedelta(hours=1))
+
+        waiting = asyncio.create_task(limiter.acquire(defer=True))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ClaudeUsageLimitError):
+            await limiter.acquire(defer=True)
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert limiter.deferred == 0
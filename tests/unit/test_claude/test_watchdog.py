@@ -0,0 +1,61 @@
+"""Test per-phase run watchdog."""
+
+import asyncio
+
+import pytest
+
+from src.claude.exceptions import ClaudeTimeoutError
+from src.claude.watchdog import RunWatchdog, WatchdogLimits
+
+
+async def _stream(watchdog, delays):
+    """Feed the watchdog after each delay, like a stream of messages."""
+    for delay in delays:
+        await asyncio.sleep(delay)
+        watchdog.feed()
+    return "done"
+
+
+class TestRunWatchdog:
+    """Test RunWatchdog."""
+
+    async def test_first_message_timeout(self):
+        """A run with no output is stopped at the first-message limit."""
+        watchdog = RunWatchdog(WatchdogLimits(first_message=0.05, idle=5, total=5))
+
+        with pytest.raises(ClaudeTimeoutError) as exc_info:
+            await watchdog.run(_stream(watchdog, [1]))
+
+        assert exc_info.value.phase == "first_message"
+        assert exc_info.value.elapsed_seconds < 1
+        assert "no response within" in str(exc_info.value)
+
+    async def test_idle_timeout(self):
+        """A gap between messages longer than the idle limit stops the run."""
+        watchdog = RunWatchdog(WatchdogLimits(first_message=1, idle=0.1, total=5))
+
+        with pytest.raises(ClaudeTimeoutError) as exc_info:
+            await watchdog.run(_stream(watchdog, [0, 0.05, 0.05, 1]))
+
+        assert exc_info.value.phase == "idle"
+        assert watchdog.messages == 3
+
+    async def test_total_timeout(self):
+        """Steady output still stops at the total limit."""
+        watchdog = RunWatchdog(WatchdogLimits(first_message=1, idle=1, total=0.2))
+
+        with pytest.raises(ClaudeTimeoutError) as exc_info:
+            await watchdog.run(_stream(watchdog, [0.03] * 100))
+
+        assert exc_info.value.phase == "total"
+
+    async def test_result_and_errors_pass_through(self):
+        """Runs inside the limits return their result or raise their error."""
+        watchdog = RunWatchdog(WatchdogLimits(first_message=1, idle=1, total=5))
+        assert await watchdog.run(_stream(watchdog, [0.01, 0.01])) == "done"
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await RunWatchdog(watchdog.limits).run(fail())
@@ -0,0 +1,84 @@
+"""Test working directory tracking from Bash tool calls."""
+
+from pathlib import Path
+
+import pytest
+
+from src.claude.working_directory import final_working_directory
+
+START = Path("/work/project")
+
+
+def bash(*commands):
+    """Tool uses for a run of Bash commands."""
+    return [{"name": "Bash", "input": {"command": command}} for command in commands]
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        ("cd src && ls", "/work/project/src"),
+        ("ls; cd 'my dir' 2>/dev/null", "/work/project/my dir"),
+        ("cd src 2>&1 && pytest", "/work/project/src"),
+        ("cd ../other", "/work/other"),
+        ("cd /tmp/build", "/tmp/build"),
+        ("cd a\ncd b", "/work/project/a/b"),
+        ("ls &\ncd src", "/work/project/src"),
+        ("git log | head & cd docs", "/work/project/docs"),
+        ("cd src || exit 1", "/work/project/src"),
+        ("{ cd src; make; }", "/work/project/src"),
+        ("if cd src; then make; fi", "/work/project/src"),
+        ("if true; then ls; fi; cd src", "/work/project/src"),
+    ],
+)
+def test_cd_moves_directory(command, expected):
+    """A cd run by the tool's own shell moves the tracked directory."""
+    assert final_working_directory(START, bash(command)) == Path(expected)
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "echo cd src",
+        "(cd src && make)",
+        "cd src | cat",
+        "cd src &",
+        "grep -r 'cd src' .",
+        'cd "unbalanced',
+    ],
+)
+def test_cd_outside_shell_ignored(command):
+    """Subshells, pipelines, background jobs and mentions of cd are ignored."""
+    assert final_working_directory(START, bash(command)) == START
+
+
+def test_cd_persists_across_calls():
+    """Each Bash call starts where the previous one left off."""
+    tools = bash("cd src", "ls") + [{"name": "Read", "input": {"file_path": "x"}}]
+    tools += bash("cd ../tests")
+
+    assert final_working_directory(START, tools) == Path("/work/project/tests")
+
+
+@pytest.mark.parametrize("command", ["cd $HOME", "cd -", "cd `git rev-parse`"])
+def test_unknown_target_stops_tracking(command):
+    """A target only the shell can resolve makes the directory unknown."""
+    assert final_working_directory(START, bash(command)) is None
+    assert final_working_directory(START, bash(command, "cd /srv")) == Path("/srv")
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "make || cd src",
+        "cd a || cd /tmp",
+        "if [ -d src ]; then cd src; fi",
+        "if make; then ls; else cd src; fi",
+        "while true; do cd ..; done",
+        "case $x in a) cd a;; esac",
+    ],
+)
+def test_conditional_cd_stops_tracking(command):
+    """A cd that may or may not run makes the directory unknown."""
+    assert final_working_directory(START, bash(command)) is None
+    assert final_working_directory(START, bash(command, "cd /srv")) == Path("/srv")
@@ -301,6 +301,7 @@ def test_feature_flags():
     assert features.mcp_enabled is True
     assert features.git_enabled is True
     assert features.file_uploads_enabled is False
+    assert features.upload_staging_enabled is False
     assert features.token_auth_enabled is True
 
     enabled_features = features.get_enabled_features()
@@ -1,11 +1,13 @@
 """Tests for event handlers."""
 
 import asyncio
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.claude.usage_limit import UsageLimiter
 from src.events.bus import EventBus
 from src.events.handlers import AgentHandler
 from src.events.types import AgentResponseEvent, ScheduledEvent, WebhookEvent
@@ -20,6 +22,7 @@ def event_bus() -> EventBus:
 def mock_claude() -> AsyncMock:
     mock = AsyncMock()
     mock.run_command = AsyncMock()
+    mock.usage_limiter = UsageLimiter()
     return mock
 
 
@@ -141,6 +144,40 @@ class TestAgentHandler:
         # Should not raise
         await agent_handler.handle_webhook(event)
 
+    async def test_deferred_run_does_not_block_the_bus(
+        self, event_bus: EventBus, mock_claude: AsyncMock, agent_handler: AgentHandler
+    ) -> None:
+        """A run waiting for the usage limit reset leaves the bus dispatching."""
+        limiter = mock_claude.usage_limiter
+        limiter.park(datetime.now(timezone.utc) + timedelta(seconds=0.5))
+
+        async def run_command(**kwargs):  # type: ignore[no-untyped-def]
+            await limiter.acquire(defer=kwargs["defer_if_limited"])
+            return MagicMock(content="")
+
+        mock_claude.run_command.side_effect = run_command
+        delivered = asyncio.Event()
+
+        async def on_response(event):  # type: ignore[no-untyped-def]
+            delivered.set()
+
+        event_bus.subscribe(AgentResponseEvent, on_response)
+        await event_bus.start()
+        try:
+            await event_bus.publish(
+                WebhookEvent(provider="github", event_type_name="push", payload={})
+            )
+            await event_bus.publish(AgentResponseEvent(chat_id=1, text="done"))
+
+            await asyncio.wait_for(delivered.wait(), timeout=0.3)
+            assert limiter.deferred == 1
+
+            await asyncio.wait_for(asyncio.gather(*agent_handler._deferred), 2)
+            mock_claude.run_command.assert_awaited_once()
+            assert limiter.deferred == 0
+        finally:
+            await event_bus.stop()
+
     def test_build_webhook_prompt(self, agent_handler: AgentHandler) -> None:
         """Webhook prompt includes provider and event info."""
         event = WebhookEvent(
@@ -1,13 +1,25 @@
 """Tests for the notification service."""
 
 import asyncio
+import tempfile
+from datetime import datetime
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from telegram.error import BadRequest, NetworkError, RetryAfter
 
 from src.events.bus import EventBus
 from src.events.types import AgentResponseEvent
-from src.notifications.service import NotificationService
+from src.notifications import service as service_module
+from src.notifications.service import (
+    NotificationService,
+    PendingDelivery,
+    TokenBucket,
+)
+from src.storage.database import DatabaseManager
+from src.storage.models import NotificationOutboxModel
+from src.storage.repositories import NotificationOutboxRepository
 
 
 @pytest.fixture
@@ -86,7 +98,7 @@ class TestNotificationService:
     ) -> None:
         """Messages are sent via the Telegram bot."""
         event = AgentResponseEvent(chat_id=123, text="hello world")
-        await service._rate_limited_send(123, event)
+        await service._deliver(123, PendingDelivery(event))
 
         mock_bot.send_message.assert_called_once()
         call_kwargs = mock_bot.send_message.call_args.kwargs
@@ -102,3 +114,286 @@ class TestNotificationService:
         event = Event(source="test")
         await service.handle_response(event)
         assert service._send_queue.qsize() == 0
+
+    async def test_slow_chat_does_not_block_other_chats(
+        self,
+        service: NotificationService,
+        mock_bot: AsyncMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A multi-chunk message to one chat does not delay other chats."""
+        monkeypatch.setattr(service_module, "SEND_INTERVAL_SECONDS", 0.2)
+        sent: list = []
+
+        async def record(chat_id: int, text: str, parse_mode: object) -> None:
+            sent.append(chat_id)
+
+        mock_bot.send_message.side_effect = record
+
+        await service.start()
+        try:
+            long_text = "\n\n".join(["A" * 4000] * 4)
+            await service.handle_response(AgentResponseEvent(chat_id=1, text=long_text))
+            await service.handle_response(AgentResponseEvent(chat_id=2, text="hi"))
+            await asyncio.sleep(0.3)
+        finally:
+            await service.stop()
+
+        # Chat 2 was served while chat 1 was still spacing out its chunks
+        assert 2 in sent
+        assert sent.count(1) < 4
+
+    async def test_retry_after_pauses_only_affected_chat(
+        self,
+        service: NotificationService,
+        mock_bot: AsyncMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """RetryAfter delays the flooded chat and the chunk is retried."""
+        monkeypatch.setattr(service_module, "SEND_INTERVAL_SECONDS", 0.0)
+        calls: list = []
+
+        async def flaky(chat_id: int, text: str, parse_mode: object) -> None:
+            calls.append(chat_id)
+            if chat_id == 1 and calls.count(1) == 1:
+                raise RetryAfter(1)
+
+        mock_bot.send_message.side_effect = flaky
+
+        await service.start()
+        try:
+            await service.handle_response(AgentResponseEvent(chat_id=1, text="a"))
+            await service.handle_response(AgentResponseEvent(chat_id=2, text="b"))
+            await asyncio.sleep(0.2)
+            # Chat 2 delivered; chat 1 is paused after the flood error
+            assert calls == [1, 2] or calls == [2, 1]
+            await asyncio.sleep(1.0)
+        finally:
+            await service.stop()
+
+        assert calls.count(1) == 2
+        assert service._paused_until_per_chat[1] > 0
+
+    async def test_idle_chat_worker_exits(
+        self, service: NotificationService, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Per-chat workers are torn down once their queue stays empty."""
+        monkeypatch.setattr(service_module, "CHAT_WORKER_IDLE_SECONDS", 0.05)
+        await service.start()
+        try:
+            await service.handle_response(AgentResponseEvent(chat_id=7, text="x"))
+            await asyncio.sleep(0.02)
+            assert 7 in service._chat_workers
+            await asyncio.sleep(0.2)
+            assert 7 not in service._chat_workers
+            assert 7 not in service._chat_queues
+        finally:
+            await service.stop()
+
+
+class TestTokenBucket:
+    """Tests for the global send token bucket."""
+
+    async def test_burst_then_throttle(self) -> None:
+        """Capacity is available immediately, then refills at the set rate."""
+        bucket = TokenBucket(rate=20.0, capacity=2)
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        await bucket.acquire()
+        await bucket.acquire()
+        assert loop.time() - start < 0.02
+
+        await bucket.acquire()
+        assert loop.time() - start >= 0.04
+
+
+class TestNotificationDigest:
+    """Tests for digest mode."""
+
+    @pytest.fixture
+    def digest_service(
+        self, event_bus: EventBus, mock_bot: AsyncMock
+    ) -> NotificationService:
+        return NotificationService(
+            event_bus=event_bus,
+            bot=mock_bot,
+            default_chat_ids=[100],
+            digest_window_seconds=0.1,
+        )
+
+    async def test_digest_combines_and_dedupes(
+        self,
+        digest_service: NotificationService,
+        mock_bot: AsyncMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Events in one window become one message without duplicates."""
+        monkeypatch.setattr(service_module, "SEND_INTERVAL_SECONDS", 0.0)
+        await digest_service.start()
+        try:
+            for event in [
+                AgentResponseEvent(chat_id=5, text="build failed"),
+                AgentResponseEvent(chat_id=5, text="Build   FAILED"),
+                AgentResponseEvent(
+                    chat_id=5, text="deploy ok", originating_event_id="evt-1"
+                ),
+                AgentResponseEvent(
+                    chat_id=5, text="deploy ok (retry)", originating_event_id="evt-1"
+                ),
+            ]:
+                await digest_service.handle_response(event)
+            await asyncio.sleep(0.3)
+        finally:
+            await digest_service.stop()
+
+        mock_bot.send_message.assert_called_once()
+        text = mock_bot.send_message.call_args.kwargs["text"]
+        assert text.count("build failed") == 1
+        assert "deploy ok" in text
+        assert "retry" not in text
+        assert service_module.DIGEST_SEPARATOR in text
+
+    def test_combine_escapes_plain_entries_when_mixed(self) -> None:
+        """Plain-text entries are HTML-escaped when mixed with HTML ones."""
+        combined = NotificationService._combine_events(
+            1,
+            [
+                AgentResponseEvent(chat_id=1, text="<b>ok</b>"),
+                AgentResponseEvent(chat_id=1, text="a < b", parse_mode=None),
+            ],
+        )
+        assert combined.parse_mode == "HTML"
+        assert "<b>ok</b>" in combined.text
+        assert "a &lt; b" in combined.text
+
+
+class TestNotificationOutbox:
+    """Tests for persistent delivery through the outbox."""
+
+    @pytest.fixture
+    async def outbox(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = DatabaseManager(f"sqlite:///{Path(temp_dir) / 'test.db'}")
+            await manager.initialize()
+            yield NotificationOutboxRepository(manager)
+            await manager.close()
+
+    @pytest.fixture
+    def outbox_service(
+        self,
+        event_bus: EventBus,
+        mock_bot: AsyncMock,
+        outbox: NotificationOutboxRepository,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> NotificationService:
+        monkeypatch.setattr(service_module, "SEND_INTERVAL_SECONDS", 0.0)
+        monkeypatch.setattr(service_module, "RETRY_BASE_DELAY_SECONDS", 0.05)
+        return NotificationService(event_bus=event_bus, bot=mock_bot, outbox=outbox)
+
+    async def test_transient_error_is_retried_then_delivered(
+        self,
+        outbox_service: NotificationService,
+        mock_bot: AsyncMock,
+        outbox: NotificationOutboxRepository,
+    ) -> None:
+        """Network errors are retried with backoff and the receipt stored."""
+        mock_bot.send_message.side_effect = [
+            NetworkError("Bad Gateway"),
+            MagicMock(message_id=42),
+        ]
+
+        await outbox_service.start()
+        try:
+            await outbox_service.handle_response(
+                AgentResponseEvent(chat_id=5, text="hello")
+            )
+            await asyncio.sleep(0.3)
+        finally:
+            await outbox_service.stop()
+
+        assert mock_bot.send_message.call_count == 2
+        assert await outbox.get_pending() == []
+        async with outbox.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT status, attempts, telegram_message_id FROM notification_outbox"
+            )
+            row = await cursor.fetchone()
+        assert tuple(row) == ("delivered", 1, 42)
+
+    async def test_permanent_error_marks_failed(
+        self,
+        outbox_service: NotificationService,
+        mock_bot: AsyncMock,
+        outbox: NotificationOutboxRepository,
+    ) -> None:
+        """BadRequest is not retried and shows up in the failed list."""
+        mock_bot.send_message.side_effect = BadRequest("Chat not found")
+
+        await outbox_service.start()
+        try:
+            await outbox_service.handle_response(
+                AgentResponseEvent(chat_id=5, text="hello")
+            )
+            await asyncio.sleep(0.1)
+        finally:
+            await outbox_service.stop()
+
+        mock_bot.send_message.assert_called_once()
+        failed = await outbox.get_failed()
+        assert len(failed) == 1
+        assert failed[0].chat_id == 5
+        assert "Chat not found" in failed[0].last_error
+
+    async def test_pending_rows_are_resumed_on_start(
+        self,
+        outbox_service: NotificationService,
+        mock_bot: AsyncMock,
+        outbox: NotificationOutboxRepository,
+    ) -> None:
+        """Notifications left pending by a previous run are sent on start."""
+        await outbox.enqueue(
+            [
+                NotificationOutboxModel(
+                    chat_id=9, text="left over", created_at=datetime.utcnow()
+                )
+            ]
+        )
+
+        await outbox_service.start()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await outbox_service.stop()
+
+        mock_bot.send_message.assert_called_once()
+        assert mock_bot.send_message.call_args.kwargs["text"] == "left over"
+        assert await outbox.get_pending() == []
+
+    async def test_backlog_is_batched_into_one_send(
+        self,
+        outbox_service: NotificationService,
+        mock_bot: AsyncMock,
+        outbox: NotificationOutboxRepository,
+    ) -> None:
+        """Queued short messages for one chat go out as a single message."""
+        await outbox.enqueue(
+            [
+                NotificationOutboxModel(
+                    chat_id=9, text=f"line {i}", created_at=datetime.utcnow()
+                )
+                for i in range(3)
+            ]
+        )
+
+        await outbox_service.start()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await outbox_service.stop()
+
+        mock_bot.send_message.assert_called_once()
+        assert mock_bot.send_message.call_args.kwargs["text"] == (
+            "line 0\n\nline 1\n\nline 2"
+        )
+        assert await outbox.get_pending() == []
@@ -1,5 +1,6 @@
 """Tests for the MessageOrchestrator."""
 
+import asyncio
 import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
@@ -7,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from src.bot.orchestrator import MessageOrchestrator
+from src.claude.facade import ClaudeIntegration
 from src.config import create_test_config
 
 
@@ -191,6 +193,30 @@ async def test_agentic_status_compact(agentic_settings, deps):
     assert "Session: none" in text
 
 
+async def test_agentic_status_shows_timeouts(agentic_settings, deps):
+    """Agentic /status lists run timeouts by watchdog phase."""
+    orchestrator = MessageOrchestrator(agentic_settings, deps)
+    claude_integration = ClaudeIntegration(agentic_settings)
+    claude_integration.timeouts_by_phase.update(["idle", "first_message", "idle"])
+
+    update = MagicMock()
+    update.effective_user.id = 123
+    update.message.reply_text = AsyncMock()
+
+    context = MagicMock()
+    context.user_data = {}
+    context.bot_data = {
+        "rate_limiter": None,
+        "claude_integration": claude_integration,
+    }
+
+    await orchestrator.agentic_status(update, context)
+
+    text = update.message.reply_text.call_args.args[0]
+    assert "⏱ Run timeouts: idle 2 · first_message 1" in text
+    assert claude_integration.get_timeout_stats() == {"idle": 2, "first_message": 1}
+
+
 async def test_agentic_text_calls_claude(agentic_settings, deps):
     """Agentic text handler calls Claude and returns response without keyboard."""
     orchestrator = MessageOrchestrator(agentic_settings, deps)
@@ -247,6 +273,196 @@ async def test_agentic_text_calls_claude(agentic_settings, deps):
         assert call.kwargs.get("reply_markup") is None
 
 
+async def test_agentic_text_sends_long_response_as_document(tmp_dir, deps):
+    """A response over the threshold is sent as one summarized document."""
+    settings = create_test_config(
+        approved_directory=str(tmp_dir),
+        agentic_mode=True,
+        response_document_threshold_chars=100,
+    )
+    orchestrator = MessageOrchestrator(settings, deps)
+
+    mock_response = MagicMock()
+    mock_response.session_id = "session-abc"
+    mock_response.content = "Refactored the parser.\n\n" + "Details. " * 50
+    mock_response.tools_used = []
+
+    claude_integration = AsyncMock()
+    claude_integration.run_command = AsyncMock(return_value=mock_response)
+
+    update = MagicMock()
+    update.effective_user.id = 123
+    update.message.text = "Refactor the parser"
+    update.message.message_id = 1
+    update.message.chat.send_action = AsyncMock()
+    update.message.reply_text = AsyncMock(return_value=AsyncMock())
+    update.message.reply_document = AsyncMock()
+
+    context = MagicMock()
+    context.user_data = {}
+    context.bot_data = {
+        "settings": settings,
+        "claude_integration": claude_integration,
+        "storage": None,
+        "rate_limiter": None,
+        "audit_logger": None,
+    }
+
+    await orchestrator.agentic_text(update, context)
+
+    # Only the progress message goes out as text
+    update.message.reply_text.assert_called_once()
+    update.message.reply_document.assert_called_once()
+    call = update.message.reply_document.call_args
+    assert call.args[0].filename == "response.md"
+    assert call.kwargs["caption"].startswith("Refactored the parser.")
+    assert call.kwargs["reply_to_message_id"] == 1
+
+
+async def test_agentic_text_follows_bash_cd(agentic_settings, deps, tmp_dir):
+    """The working directory follows Bash cd calls, not prose about cd."""
+    (tmp_dir / "src").mkdir()
+    (tmp_dir / "docs").mkdir()
+    orchestrator = MessageOrchestrator(agentic_settings, deps)
+
+    mock_response = MagicMock()
+    mock_response.session_id = "session-abc"
+    mock_response.content = "Done. You can run `cd docs` to read them."
+    mock_response.cwd = str(tmp_dir)
+    mock_response.tools_used = [
+        {"name": "Bash", "input": {"command": "cd src && pytest -q"}}
+    ]
+
+    claude_integration = AsyncMock()
+    claude_integration.run_command = AsyncMock(return_value=mock_response)
+
+    update = MagicMock()
+    update.effective_user.id = 123
+    update.message.text = "Run the tests"
+    update.message.message_id = 1
+    update.message.chat.send_action = AsyncMock()
+    update.message.reply_text = AsyncMock(return_value=AsyncMock())
+
+    context = MagicMock()
+    context.user_data = {}
+    context.bot_data = {
+        "settings": agentic_settings,
+        "claude_integration": claude_integration,
+        "storage": None,
+        "rate_limiter": None,
+        "audit_logger": None,
+    }
+
+    await orchestrator.agentic_text(update, context)
+
+    assert context.user_data["current_directory"] == (tmp_dir / "src").resolve()
+
+
+def debounced_context(tmp_dir, deps, run_command):
+    """An agentic orchestrator with a 50ms debounce window, and its context."""
+    settings = create_test_config(
+        approved_directory=str(tmp_dir), agentic_mode=True, message_debounce_ms=50
+    )
+    orchestrator = MessageOrchestrator(settings, deps)
+
+    claude_integration = AsyncMock()
+    claude_integration.run_command = run_command
+
+    context = MagicMock()
+    context.user_data = {}
+    context.application.update_processor = None
+    context.bot_data = {
+        "settings": settings,
+        "claude_integration": claude_integration,
+        "storage": None,
+        "rate_limiter": None,
+        "audit_logger": None,
+    }
+    return orchestrator, context
+
+
+def text_update(message_id, text, user_id=123, chat_id=123):
+    """A text message update whose replies and reactions are recorded."""
+    update = MagicMock()
+    update.effective_user.id = user_id
+    update.effective_chat.id = chat_id
+    update.message.text = text
+    update.message.message_id = message_id
+    update.message.chat.send_action = AsyncMock()
+    update.message.reply_text = AsyncMock(return_value=AsyncMock())
+    update.message.set_reaction = AsyncMock()
+    return update
+
+
+def done_response():
+    response = MagicMock()
+    response.session_id = "session-abc"
+    response.content = "Done"
+    response.tools_used = []
+    return response
+
+
+async def test_agentic_text_merges_rapid_messages(tmp_dir, deps):
+    """With a debounce window, quick messages become one Claude turn."""
+    run_command = AsyncMock(return_value=done_response())
+    orchestrator, context = debounced_context(tmp_dir, deps, run_command)
+
+    first = text_update(1, "Refactor the parser")
+    second = text_update(2, "and add tests")
+    await asyncio.gather(
+        orchestrator.agentic_text(first, context),
+        orchestrator.agentic_text(second, context),
+    )
+
+    run_command.assert_called_once()
+    assert (
+        run_command.call_args.kwargs["prompt"] == "Refactor the parser\n\nand add tests"
+    )
+    second.message.set_reaction.assert_called_once()
+    first.message.set_reaction.assert_not_called()
+    # The reply goes to the last merged message
+    second.message.reply_text.assert_called()
+
+
+async def test_agentic_text_keeps_group_members_apart(tmp_dir, deps):
+    """Messages from different users in one chat are never merged."""
+    run_command = AsyncMock(return_value=done_response())
+    orchestrator, context = debounced_context(tmp_dir, deps, run_command)
+
+    await asyncio.gather(
+        orchestrator.agentic_text(text_update(1, "from alice", user_id=1), context),
+        orchestrator.agentic_text(text_update(2, "from bob", user_id=2), context),
+    )
+
+    prompts = sorted(call.kwargs["prompt"] for call in run_command.call_args_list)
+    assert prompts == ["from alice", "from bob"]
+
+
+async def test_agentic_text_reports_messages_dropped_by_failed_turn(tmp_dir, deps):
+    """Messages merged into a turn that fails get a reply, not silence."""
+    run_command = AsyncMock(return_value=done_response())
+    orchestrator, context = debounced_context(tmp_dir, deps, run_command)
+
+    async def fail_slowly(action):  # type: ignore[no-untyped-def]
+        await asyncio.sleep(0.1)
+        raise RuntimeError("Telegram unavailable")
+
+    first = text_update(1, "Refactor the parser")
+    first.message.chat.send_action = AsyncMock(side_effect=fail_slowly)
+    second = text_update(2, "and add tests")
+
+    leader = asyncio.create_task(orchestrator.agentic_text(first, context))
+    await asyncio.sleep(0.07)
+    await orchestrator.agentic_text(second, context)
+    with pytest.raises(RuntimeError):
+        await leader
+
+    second.message.set_reaction.assert_called_once()
+    reply = second.message.reply_text.call_args.args[0]
+    assert "not processed" in reply
+    assert not orchestrator.debouncer.is_active((123, 123))
+
+
 async def test_agentic_callback_scoped_to_cd_pattern(agentic_settings, deps):
     """Agentic callback handler is registered with cd: pattern filter."""
     orchestrator = MessageOrchestrator(agentic_settings, deps)
@@ -288,6 +504,62 @@ async def test_agentic_document_rejects_large_files(agentic_settings, deps):
     assert "too large" in call_args.args[0].lower()
 
 
+async def test_agentic_document_stages_upload(tmp_dir, deps):
+    """With staging enabled, Claude gets a path instead of the contents."""
+    from telegram import File
+
+    from src.bot.features.upload_staging import UploadStager
+    from src.security.validators import SecurityValidator
+
+    settings = create_test_config(
+        approved_directory=str(tmp_dir), agentic_mode=True, enable_upload_staging=True
+    )
+    orchestrator = MessageOrchestrator(settings, deps)
+    source = tmp_dir / "incoming.md"
+    source.write_text("# Notes\n" * 100)
+
+    mock_response = MagicMock()
+    mock_response.session_id = "session-abc"
+    mock_response.content = "Read it."
+    mock_response.tools_used = []
+    mock_response.cwd = None
+    claude_integration = AsyncMock()
+    claude_integration.run_command = AsyncMock(return_value=mock_response)
+
+    features = MagicMock()
+    features.get_upload_stager.return_value = UploadStager(
+        SecurityValidator(tmp_dir), max_age_hours=24
+    )
+
+    update = MagicMock()
+    update.effective_user.id = 123
+    update.message.document.file_name = "notes.md"
+    update.message.document.file_size = source.stat().st_size
+    update.message.document.get_file = AsyncMock(
+        return_value=File("id", "uid", file_path=str(source))
+    )
+    update.message.caption = "Summarize"
+    update.message.message_id = 1
+    update.message.reply_text = AsyncMock(return_value=AsyncMock())
+
+    context = MagicMock()
+    context.user_data = {}
+    context.bot_data = {
+        "security_validator": None,
+        "features": features,
+        "claude_integration": claude_integration,
+    }
+
+    await orchestrator.agentic_document(update, context)
+
+    prompt = claude_integration.run_command.call_args.kwargs["prompt"]
+    staging_id = context.user_data["upload_staging_id"]
+    assert f"`.uploads/{staging_id}/notes.md`" in prompt
+    assert "# Notes" not in prompt
+    features.get_file_handler().handle_document_upload.assert_not_called()
+    assert (tmp_dir / ".uploads" / staging_id / "notes.md").exists()
+
+
 async def test_agentic_start_escapes_html_in_name(agentic_settings, deps):
     """Names with HTML-special characters are escaped safely."""
     orchestrator = MessageOrchestrator(agentic_settings, deps)
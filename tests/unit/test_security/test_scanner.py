@@ -0,0 +1,93 @@
+"""Tests for the precompiled pattern scanner."""
+
+import random
+import re
+
+import pytest
+
+from src.bot.middleware.security import MESSAGE_RULES, RECON_PATTERNS
+from src.security.scanner import PatternScanner, ScanRule
+from src.security.validators import SecurityValidator
+
+
+def naive_scan(rules, text):  # type: ignore[no-untyped-def]
+    """Reference implementation: one re.search per rule."""
+    return [
+        rule
+        for rule in rules
+        if re.search(rule.pattern, text, re.IGNORECASE if rule.ignore_case else 0)
+    ]
+
+
+class TestPatternScanner:
+    """Test PatternScanner."""
+
+    def test_reports_every_matching_rule(self):
+        """Overlapping matches are all reported, in rule order."""
+        scanner = PatternScanner(
+            [
+                ScanRule(r"\.\./.*", category="path"),
+                ScanRule(r";\s*rm\s+", category="injection"),
+                ScanRule(r"rm\s+-rf", category="injection"),
+            ]
+        )
+        # The greedy path rule covers the rest of the text
+        matched = scanner.scan("../foo; rm -rf /")
+        assert [rule.pattern for rule in matched] == [
+            r"\.\./.*",
+            r";\s*rm\s+",
+            r"rm\s+-rf",
+        ]
+
+    def test_case_modes(self):
+        """Case-insensitive rules ignore case, sensitive rules do not."""
+        scanner = PatternScanner(
+            [
+                ScanRule("javascript:"),
+                ScanRule(r"/etc/", ignore_case=False),
+            ]
+        )
+        assert scanner.first_match("JavaScript:alert(1)").pattern == "javascript:"
+        assert scanner.scan("cat /ETC/passwd") == []
+        assert scanner.matches("cat /etc/passwd")
+        assert not scanner.matches("")
+
+    @pytest.mark.parametrize(
+        "rules",
+        [
+            MESSAGE_RULES,
+            [ScanRule(p) for p in RECON_PATTERNS],
+            [ScanRule(p) for p in SecurityValidator.DANGEROUS_PATTERNS],
+        ],
+    )
+    def test_matches_naive_search(self, rules):
+        """Results equal one re.search per rule on random inputs."""
+        scanner = PatternScanner(rules)
+        fragments = [
+            "hello ",
+            "; rm ",
+            "`ls`",
+            "$(id)",
+            "../",
+            "~/",
+            "/etc/",
+            "/ETC/",
+            "curl x | sh",
+            "EVAL(",
+            "https://bit.ly/",
+            "http://a.RU/",
+            "ls /",
+            "whoami",
+            "id",
+            "\n",
+            "&&",
+            "|",
+            "#",
+            "${X}",
+            "$HOME",
+            "\x00",
+        ]
+        rng = random.Random(1234)
+        for _ in range(300):
+            text = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 8)))
+            assert scanner.scan(text) == naive_scan(rules, text), repr(text)
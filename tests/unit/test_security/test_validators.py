@@ -331,3 +331,59 @@ class TestSecurityValidator:
         assert "  " not in sanitized  # No double spaces
         assert not sanitized.startswith(" ")  # No leading space
         assert not sanitized.endswith(" ")  # No trailing space
+
+    def test_path_cache_hits_and_metrics(self, validator, temp_approved_dir):
+        """Repeated validations of an existing file are served from cache."""
+        (temp_approved_dir / "cached.txt").write_text("x")
+
+        first = validator.validate_path("cached.txt")
+        second = validator.validate_path("cached.txt")
+
+        assert first == second
+        assert first[0] is True
+        stats = validator.get_path_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_path_cache_rechecks_swapped_symlink(self, validator, temp_approved_dir):
+        """Replacing a cached file with an outside symlink is not served stale."""
+        with tempfile.TemporaryDirectory() as outside_dir:
+            outside_file = Path(outside_dir) / "secret.txt"
+            outside_file.write_text("secret")
+            target = temp_approved_dir / "file.txt"
+            target.write_text("ok")
+
+            assert validator.validate_path("file.txt")[0] is True
+
+            target.unlink()
+            target.symlink_to(outside_file)
+
+            valid, _, error = validator.validate_path("file.txt")
+            assert valid is False
+            assert "outside approved directory" in error
+
+    def test_path_cache_ttl_and_invalidation(self, temp_approved_dir):
+        """Entries expire after the TTL and can be invalidated explicitly."""
+        validator = SecurityValidator(temp_approved_dir, path_cache_ttl=0.0)
+        (temp_approved_dir / "a.txt").write_text("x")
+
+        validator.validate_path("a.txt")
+        validator.validate_path("a.txt")
+        assert validator.path_cache_hits == 0
+
+        validator.path_cache_ttl = 60.0
+        validator.validate_path("a.txt")
+        assert validator.invalidate_path_cache(temp_approved_dir) == 1
+        assert validator.get_path_cache_stats()["size"] == 0
+
+    def test_path_cache_is_bounded(self, temp_approved_dir):
+        """The least recently used entries are evicted beyond the size limit."""
+        validator = SecurityValidator(temp_approved_dir, path_cache_size=2)
+        for name in ["a", "b", "c"]:
+            (temp_approved_dir / name).write_text(name)
+            validator.validate_path(name)
+
+        stats = validator.get_path_cache_stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
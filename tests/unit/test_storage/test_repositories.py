@@ -10,6 +10,7 @@ from src.storage.database import DatabaseManager
 from src.storage.models import (
     AuditLogModel,
     MessageModel,
+    NotificationOutboxModel,
     SessionModel,
     ToolUsageModel,
     UserModel,
@@ -18,6 +19,7 @@ from src.storage.repositories import (
     AnalyticsRepository,
     AuditLogRepository,
     MessageRepository,
+    NotificationOutboxRepository,
     SessionRepository,
     ToolUsageRepository,
     UserRepository,
@@ -71,6 +73,12 @@ async def analytics_repo(db_manager):
     return AnalyticsRepository(db_manager)
 
 
+@pytest.fixture
+async def outbox_repo(db_manager):
+    """Create notification outbox repository."""
+    return NotificationOutboxRepository(db_manager)
+
+
 class TestUserRepository:
     """Test user repository."""
 
@@ -427,3 +435,47 @@ class TestAnalyticsRepository:
         assert stats["overall"]["total_sessions"] >= 1
         assert stats["overall"]["total_messages"] >= 3
         assert stats["overall"]["total_cost"] >= 0.3
+
+
+class TestNotificationOutboxRepository:
+    """Test notification outbox repository."""
+
+    async def test_enqueue_and_deliver(self, outbox_repo):
+        """Test pending notifications until they are delivered."""
+        ids = await outbox_repo.enqueue(
+            [
+                NotificationOutboxModel(
+                    chat_id=chat_id, text="hello", created_at=datetime.utcnow()
+                )
+                for chat_id in (1, 2)
+            ]
+        )
+        assert len(ids) == 2
+
+        pending = await outbox_repo.get_pending()
+        assert [item.chat_id for item in pending] == [1, 2]
+        assert all(item.status == "pending" for item in pending)
+
+        await outbox_repo.mark_delivered(ids[:1], telegram_message_id=77)
+        pending = await outbox_repo.get_pending()
+        assert [item.id for item in pending] == ids[1:]
+
+    async def test_retry_and_fail(self, outbox_repo):
+        """Test retry scheduling and giving up."""
+        [notification_id] = await outbox_repo.enqueue(
+            [NotificationOutboxModel(chat_id=1, text="x", created_at=datetime.utcnow())]
+        )
+
+        retry_at = datetime.utcnow() + timedelta(seconds=30)
+        await outbox_repo.schedule_retry([notification_id], 1, retry_at, "timeout")
+        [pending] = await outbox_repo.get_pending()
+        assert pending.attempts == 1
+        assert pending.next_attempt_at == retry_at
+        assert pending.last_error == "timeout"
+
+        await outbox_repo.mark_failed([notification_id], "Forbidden")
+        assert await outbox_repo.get_pending() == []
+        [failed] = await outbox_repo.get_failed()
+        assert failed.status == "failed"
+        assert failed.attempts == 2
+        assert failed.last_error == "Forbidden"